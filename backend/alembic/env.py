@@ -0,0 +1,48 @@
+import os
+from logging.config import fileConfig
+
+from alembic import context
+
+# Keep local script execution resilient if .env contains non-boolean DEBUG values.
+os.environ.setdefault("DEBUG", "false")
+
+from app.core.config import get_settings
+from app.db.database import Base, engine
+from app.db import models  # noqa: F401  register every table on Base.metadata
+
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+VERSION_TABLE_SCHEMA = "dbo"
+
+
+def run_migrations_offline() -> None:
+    """Write the migration SQL to stdout (alembic upgrade head --sql)."""
+    context.configure(
+        url=get_settings().sqlalchemy_database_uri,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        version_table_schema=VERSION_TABLE_SCHEMA,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            version_table_schema=VERSION_TABLE_SCHEMA,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,237 @@
+"""Baseline: the schema as it stood before Alembic
+
+A frozen snapshot of the tables created by db/init/09-mssql-createtable.sql, new_createIdea.sql
+and db/new_projectsubmission.sql. Existing databases already have them, so each table is created
+only when it is missing; a fresh database gets exactly this schema and every later change comes
+from the revisions after this one. Never edit this file to follow the models.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.mssql import TINYINT
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+IDEA_SOURCES = [
+    "CoPs", "LR", "Research", "Experience", "StudyVisit", "KnowledgeExchange",
+    "InnovationDatabase", "MarketStudy", "VOS", "Other",
+]
+
+
+def _flag(name: str) -> sa.Column:
+    return sa.Column(name, sa.Boolean, nullable=False, server_default=sa.text("0"))
+
+
+def _now(name: str, function: str = "GETDATE()") -> sa.Column:
+    return sa.Column(name, sa.DateTime, nullable=False, server_default=sa.text(function))
+
+
+def _idea_source_columns() -> list:
+    columns = []
+    for source in IDEA_SOURCES:
+        columns += [_flag(f"IdeaSource{source}"), sa.Column(f"IdeaSource{source}Detail", sa.String(1000))]
+    return columns
+
+
+def _member_table(metadata: sa.MetaData, name: str, project_table: str) -> sa.Table:
+    return sa.Table(
+        name, metadata,
+        sa.Column("ProjectMemberId", sa.BigInteger, primary_key=True, autoincrement=True),
+        sa.Column(
+            "ProjectId", sa.BigInteger,
+            sa.ForeignKey(f"dbo.{project_table}.ProjectId", ondelete="CASCADE"), nullable=False,
+        ),
+        sa.Column("MemberSeq", TINYINT, nullable=False),
+        sa.Column("EmpCode", sa.String(20), nullable=False),
+        sa.Column("FullNameTh", sa.String(200), nullable=False),
+        sa.Column("PositionName", sa.String(200)),
+        sa.Column("OrgName", sa.String(300)),
+        sa.Column("MobileNo", sa.String(50)),
+        _flag("IsTeamLeader"),
+        _flag("IsMainContact"),
+        _now("CreatedAt", "SYSDATETIME()"),
+        sa.Column("UpdatedAt", sa.DateTime),
+        schema="dbo",
+    )
+
+
+def baseline_metadata() -> sa.MetaData:
+    # sa.Text renders as VARCHAR(max) on SQL Server: the legacy type 0003 and 0004 move to NVARCHAR(MAX)
+    metadata = sa.MetaData()
+    sa.Table(
+        "Question", metadata,
+        sa.Column("question_id", sa.String(100), primary_key=True),
+        sa.Column("question_title", sa.String(500), nullable=False),
+        sa.Column("question_description", sa.Text),
+        sa.Column("question_categories", sa.UnicodeText),
+        sa.Column("qrcode_url", sa.String(500)),
+        _now("created_at"),
+        schema="dbo",
+    )
+    sa.Table(
+        "Answer", metadata,
+        sa.Column("answer_id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("question_id", sa.String(255), nullable=False),
+        sa.Column("answer_title", sa.Text),
+        sa.Column("answer_painpoint", sa.Text),
+        sa.Column("answer_text", sa.Text, nullable=False),
+        sa.Column("answer_outcome", sa.Text),
+        sa.Column("category", sa.String(255), nullable=False),
+        sa.Column("create_user_name", sa.String(255)),
+        sa.Column("create_user_code", sa.String(100)),
+        sa.Column("create_user_department", sa.String(255)),
+        sa.Column("answer_keywords", sa.Text),
+        sa.Column("model_scores_criterion", sa.String(1000)),
+        sa.Column("model_overall_score", sa.Integer),
+        sa.Column("model_overall_feedback", sa.Text),
+        _now("created_at"),
+        schema="dbo",
+    )
+    sa.Table(
+        "idea_tank", metadata,
+        sa.Column("idea_seq", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("idea_code", sa.String(10)),
+        sa.Column("category_idea_type1", sa.String(100)),
+        sa.Column("idea_name", sa.String(500)),
+        sa.Column("idea_subject", sa.Text),
+        sa.Column("idea_source", sa.Text),
+        sa.Column("customer_target", sa.Text),
+        sa.Column("idea_inno_type", sa.Text),
+        sa.Column("idea_detail", sa.Text),
+        sa.Column("idea_finance_impact", sa.Text),
+        sa.Column("idea_nonfinance_impact", sa.Text),
+        sa.Column("idea_status", sa.Text),
+        sa.Column("idea_status_md", sa.String(50)),
+        sa.Column("idea_status_md_remark", sa.Text),
+        sa.Column("idea_owner_empcode", sa.String(50)),
+        sa.Column("idea_owner_empname", sa.String(200)),
+        sa.Column("idea_owner_deposit", sa.String(100)),
+        sa.Column("idea_owner_contacts", sa.String(200)),
+        sa.Column("idea_keywords", sa.Text),
+        sa.Column("idea_comment", sa.Text),
+        sa.Column("idea_summary_byai", sa.Text),
+        sa.Column("idea_score", sa.Integer),
+        sa.Column("idea_score_comment", sa.Text),
+        _now("create_datetime"),
+        _now("update_datetime"),
+        schema="dbo",
+    )
+    sa.Table(
+        "idea_users", metadata,
+        sa.Column("user_code", sa.String(50), primary_key=True),
+        sa.Column("user_fname", sa.String(100), nullable=False),
+        sa.Column("user_lname", sa.String(100), nullable=False),
+        sa.Column("user_login", sa.String(50), unique=True, nullable=False),
+        sa.Column("user_password", sa.String(255), nullable=False),
+        _now("user_createdate"),
+        _now("user_updatedate"),
+        sa.Column("user_role", sa.String(50)),
+        schema="dbo",
+    )
+    sa.Table(
+        "ProjectSubmission", metadata,
+        sa.Column("ProjectId", sa.BigInteger, primary_key=True, autoincrement=True),
+        sa.Column("EventYear", sa.SmallInteger, nullable=False, server_default=sa.text("2026")),
+        sa.Column("SubmissionTypeCode", sa.String(20), nullable=False),
+        sa.Column("SubmissionTypeNameTh", sa.String(100), nullable=False),
+        sa.Column("TeamName", sa.String(200), nullable=False),
+        sa.Column("ChallengeNo", TINYINT),
+        sa.Column("ChallengeText", sa.String(1000)),
+        *_idea_source_columns(),
+        sa.Column("TargetCustomerHtml", sa.UnicodeText),
+        sa.Column("InnovationTypeNo", TINYINT),
+        sa.Column("InnovationTypeText", sa.String(500)),
+        sa.Column("IdeaConceptHtml", sa.UnicodeText),
+        sa.Column("ExpectedBenefitHtml", sa.UnicodeText),
+        *[_flag(f"GenCap{name}") for name in [
+            "ProjectManagement", "Communications", "Marketing", "FinancialBusinessAnalysis",
+            "CustomerManagement", "StakeholderPartnership", "Other",
+        ]],
+        sa.Column("GenCapOtherDetail", sa.String(1000)),
+        *[_flag(f"DigitalCap{name}") for name in [
+            "ProductDevelopment", "CodingProgramming", "DataAnalysis", "UiUxGraphicDesign",
+            "SoftwareTooling", "Other",
+        ]],
+        sa.Column("DigitalCapOtherDetail", sa.String(1000)),
+        sa.Column("HackathonMotivationHtml", sa.UnicodeText),
+        sa.Column("StatusCode", sa.String(20), nullable=False, server_default=sa.text("'DRAFT'")),
+        sa.Column("SubmittedAt", sa.DateTime),
+        sa.Column("CreatedByEmpCode", sa.String(20)),
+        _now("CreatedAt", "SYSDATETIME()"),
+        sa.Column("UpdatedByEmpCode", sa.String(20)),
+        sa.Column("UpdatedAt", sa.DateTime),
+        schema="dbo",
+    )
+    _member_table(metadata, "ProjectSubmissionMember", "ProjectSubmission")
+    sa.Table(
+        "ProjectSubmissionNew", metadata,
+        sa.Column("ProjectId", sa.BigInteger, primary_key=True, autoincrement=True),
+        sa.Column("EventYear", sa.SmallInteger, nullable=False, server_default=sa.text("2026")),
+        sa.Column("SubmissionTypeCode", sa.String(20), nullable=False),
+        sa.Column("SubmissionTypeNameTh", sa.String(100), nullable=False),
+        sa.Column("TeamName", sa.String(200)),
+        sa.Column("CreativeIdeaName", sa.String(300), nullable=False),
+        sa.Column("ChallengeNo", TINYINT),
+        sa.Column("ChallengeText", sa.String(1000)),
+        sa.Column("ChallengeCategoryNo", TINYINT),
+        sa.Column("ChallengeCategoryText", sa.String(500)),
+        *[_flag(f"StrategicObjectiveSO{number}") for number in range(1, 7)],
+        *_idea_source_columns(),
+        sa.Column("TargetCustomerTypeNo", TINYINT),
+        sa.Column("TargetCustomerTypeText", sa.String(100)),
+        sa.Column("TargetCustomerProblemHtml", sa.UnicodeText),
+        sa.Column("InnovationTypeNo", TINYINT),
+        sa.Column("InnovationTypeText", sa.String(500)),
+        sa.Column("IdeaConceptHtml", sa.UnicodeText),
+        sa.Column("DigitalInnovationNo", TINYINT),
+        sa.Column("DigitalInnovationText", sa.String(300)),
+        sa.Column("NoveltyLevelNo", TINYINT),
+        sa.Column("NoveltyLevelText", sa.String(1000)),
+        _flag("InnovationValueFinancial"),
+        _flag("FinancialValueRevenue"),
+        _flag("FinancialValueCostSaving"),
+        sa.Column("FinancialValueDetailHtml", sa.UnicodeText),
+        _flag("InnovationValueNonFinancial"),
+        _flag("NonFinancialValueCustomerSatisfaction"),
+        _flag("NonFinancialValueWorkEfficiency"),
+        _flag("NonFinancialValueCustomerQuality"),
+        _flag("NonFinancialValueEnvironment"),
+        sa.Column("NonFinancialValueDetailHtml", sa.UnicodeText),
+        sa.Column("StatusCode", sa.String(20), nullable=False, server_default=sa.text("'DRAFT'")),
+        sa.Column("SubmittedAt", sa.DateTime),
+        sa.Column("CreatedByEmpCode", sa.String(20)),
+        _now("CreatedAt", "SYSDATETIME()"),
+        sa.Column("UpdatedByEmpCode", sa.String(20)),
+        sa.Column("UpdatedAt", sa.DateTime),
+        schema="dbo",
+    )
+    _member_table(metadata, "ProjectSubmissionNewMember", "ProjectSubmissionNew")
+    sa.Table(
+        "tb_setting", metadata,
+        sa.Column("set_code", sa.String(50), primary_key=True),
+        sa.Column("set_name", sa.String(255)),
+        sa.Column("set_value", sa.Text, nullable=False),
+        sa.Column("set_description", sa.Text),
+        _now("create_datetime"),
+        _now("update_datetime"),
+        schema="dbo",
+    )
+    return metadata
+
+
+def upgrade() -> None:
+    baseline_metadata().create_all(bind=op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    # Never drop the application tables
+    pass
@@ -0,0 +1,90 @@
+"""Secondary indexes for the hot list, filter and lookup queries
+
+Each index is created only when it does not exist yet.
+Measure with backend/benchmark_indexes.py before and after upgrading.
+
+- Answer: per-question listing and the answers export (question_id, created_at DESC),
+  and the unfiltered newest-first listing (created_at DESC)
+- idea_tank: idea_code for the bulk-import upsert MERGE and code lookups. idea_score range
+  filters and the leaderboard seek on IX_idea_tank_score_rank (revision 0005). idea_keywords is a
+  text column searched with LIKE '%...%', which no B-tree index can serve.
+- ProjectSubmission / ProjectSubmissionNew: the list and export queries filter on
+  StatusCode and optionally ChallengeNo/InnovationTypeNo, ordered by CreatedAt DESC. The
+  filter is sent as a bound parameter, so a filtered index on StatusCode = 'SUBMITTED'
+  would not be matched; a keyed index is used instead.
+- idea_users.user_login: login lookups; the UNIQUE constraint from 09-mssql-createtable.sql
+  already provides this index, so one is only added when no index leads with user_login
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+SECONDARY_INDEXES = [
+    ("dbo.Answer", "IX_Answer_question_id_created_at", "(question_id, created_at DESC)", ""),
+    ("dbo.Answer", "IX_Answer_created_at", "(created_at DESC)", ""),
+    ("dbo.idea_tank", "IX_idea_tank_idea_code", "(idea_code)", "WHERE idea_code IS NOT NULL"),
+    (
+        "dbo.ProjectSubmission", "IX_ProjectSubmission_StatusCode_CreatedAt",
+        "(StatusCode, CreatedAt DESC)", "INCLUDE (ChallengeNo, InnovationTypeNo)",
+    ),
+    (
+        "dbo.ProjectSubmission", "IX_ProjectSubmission_ChallengeNo_InnovationTypeNo",
+        "(ChallengeNo, InnovationTypeNo)", "INCLUDE (StatusCode, CreatedAt)",
+    ),
+    (
+        "dbo.ProjectSubmissionNew", "IX_ProjectSubmissionNew_StatusCode_CreatedAt",
+        "(StatusCode, CreatedAt DESC)", "INCLUDE (ChallengeNo, InnovationTypeNo)",
+    ),
+    (
+        "dbo.ProjectSubmissionNew", "IX_ProjectSubmissionNew_ChallengeNo_InnovationTypeNo",
+        "(ChallengeNo, InnovationTypeNo)", "INCLUDE (StatusCode, CreatedAt)",
+    ),
+]
+
+
+def upgrade() -> None:
+    for table, name, columns, options in SECONDARY_INDEXES:
+        op.execute(f"""
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes WHERE name = '{name}' AND object_id = OBJECT_ID('{table}')
+)
+BEGIN
+    CREATE NONCLUSTERED INDEX {name} ON {table} {columns} {options};
+END
+""")
+
+    op.execute("""
+IF NOT EXISTS (
+    SELECT 1
+    FROM sys.index_columns ic
+    JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+    WHERE ic.object_id = OBJECT_ID('dbo.idea_users') AND ic.key_ordinal = 1 AND c.name = 'user_login'
+)
+BEGIN
+    CREATE UNIQUE NONCLUSTERED INDEX UX_idea_users_user_login ON dbo.idea_users (user_login);
+END
+""")
+
+
+def downgrade() -> None:
+    for table, name, _columns, _options in reversed(SECONDARY_INDEXES + [
+        ("dbo.idea_users", "UX_idea_users_user_login", "", ""),
+    ]):
+        op.execute(f"""
+IF EXISTS (
+    SELECT 1 FROM sys.indexes WHERE name = '{name}' AND object_id = OBJECT_ID('{table}')
+)
+BEGIN
+    DROP INDEX {name} ON {table};
+END
+""")
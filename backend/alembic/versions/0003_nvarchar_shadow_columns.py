@@ -0,0 +1,68 @@
+"""Add NVARCHAR shadow columns for the legacy text columns
+
+First step of moving text / varchar(max) columns to NVARCHAR without rewriting the tables
+under a schema lock. Long-form text becomes NVARCHAR(MAX); the short label columns listed in
+LegacyTable.lengths (idea_status, idea_inno_type, idea_source) get a bounded NVARCHAR(n), so
+they can be used as index keys:
+
+    alembic upgrade 0003
+    python backfill_nvarchar_columns.py     # batched copy while the app keeps running
+    alembic upgrade head                    # 0004 copies what changed since, then swaps
+
+Upgrading straight to head also works; 0004 then copies every row while the tables are locked.
+
+Change tracking is switched on for the database and the four tables so 0004 knows which rows the
+app wrote during the backfill (ALTER DATABASE needs the ALTER permission on the database). 0004
+switches it off again. A trigger would do the same job, but SQL Server rejects the app's
+INSERT/UPDATE/MERGE ... OUTPUT statements on tables that have one.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+from app.db.legacy_text_columns import (
+    LEGACY_TEXT_COLUMNS,
+    SHADOW_SUFFIX,
+    add_shadow_column_sql,
+    create_backfill_state_sql,
+    disable_change_tracking_sql,
+    disable_database_change_tracking_sql,
+    drop_backfill_state_sql,
+    enable_change_tracking_sql,
+    enable_database_change_tracking_sql,
+)
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(enable_database_change_tracking_sql())
+    op.execute(create_backfill_state_sql())
+    for table, legacy in LEGACY_TEXT_COLUMNS.items():
+        op.execute(enable_change_tracking_sql(table))
+        for column in legacy.columns:
+            op.execute(add_shadow_column_sql(table, column, legacy.column_type(column)))
+
+
+def downgrade() -> None:
+    op.execute(drop_backfill_state_sql())
+    for table, legacy in LEGACY_TEXT_COLUMNS.items():
+        op.execute(disable_change_tracking_sql(table))
+        for column in legacy.columns:
+            shadow = column + SHADOW_SUFFIX
+            op.execute(f"""
+IF COL_LENGTH('{table}', '{shadow}') IS NOT NULL
+BEGIN
+    ALTER TABLE {table} DROP COLUMN {shadow};
+END
+""")
+    with op.get_context().autocommit_block():
+        op.execute(disable_database_change_tracking_sql())
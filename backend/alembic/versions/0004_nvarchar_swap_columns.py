@@ -0,0 +1,60 @@
+"""Swap the NVARCHAR shadow columns in for the legacy text columns
+
+Locks each table and copies, in one UPDATE, the rows change tracking saw the app write since
+backfill_nvarchar_columns.py started (every row if the backfill did not finish), then drops each
+legacy column and renames its shadow into place. Change tracking is switched off again.
+Stops before touching a table whose short columns hold values longer than their new bound.
+
+NVARCHAR(MAX) values up to 8000 bytes are stored in-row, so short texts no longer cost a LOB
+lookup, and the columns can be compared, grouped and used in CONCAT/HASHBYTES without casts.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+from app.db.legacy_text_columns import (
+    LEGACY_TEXT_COLUMNS,
+    catch_up_sql,
+    disable_change_tracking_sql,
+    disable_database_change_tracking_sql,
+    drop_backfill_state_sql,
+    overlong_columns,
+    shadowed_columns,
+    swap_column_sql,
+)
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table, legacy in LEGACY_TEXT_COLUMNS.items():
+        columns = shadowed_columns(op.get_bind(), table, legacy.columns)
+        overlong = overlong_columns(op.get_bind(), table, legacy, columns)
+        if overlong:
+            raise RuntimeError(
+                f"{table} has values longer than their new column length: "
+                + ", ".join(f"{col} ({count} rows)" for col, count in overlong.items())
+            )
+        if columns:
+            op.execute(catch_up_sql(table, columns, legacy.primary_key))
+        for column in columns:
+            op.execute(swap_column_sql(table, column, column in legacy.not_null, legacy.column_type(column)))
+        op.execute(disable_change_tracking_sql(table))
+    op.execute(drop_backfill_state_sql())
+    with op.get_context().autocommit_block():
+        op.execute(disable_database_change_tracking_sql())
+
+
+def downgrade() -> None:
+    # The legacy columns are dropped, and text / varchar(max) cannot hold what the app has
+    # written since (Thai text outside the code page); restore a backup to go below 0004
+    raise NotImplementedError(
+        "Revision 0004 cannot be downgraded: the legacy text columns were dropped by the swap"
+    )
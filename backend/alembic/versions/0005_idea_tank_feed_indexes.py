@@ -0,0 +1,78 @@
+"""Leaderboard index, change-feed index and the idea_tank tombstone table
+
+- IX_idea_tank_score_rank backs GET /ideas/leaderboard (ROW_NUMBER over idea_score DESC,
+  idea_seq ASC) and idea_score range filters; filtered to scored ideas so unscored rows do
+  not bloat it
+- IX_idea_tank_update_datetime backs GET /ideas/changes
+- dbo.idea_tank_tombstone records deleted ideas so change-feed clients can drop them
+
+Everything is created only when missing, so databases that already ran the old db/init
+scripts upgrade cleanly.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    (
+        "dbo.idea_tank", "IX_idea_tank_score_rank", "(idea_score DESC, idea_seq ASC)",
+        "INCLUDE (idea_code, category_idea_type1, idea_name) WHERE idea_score IS NOT NULL",
+    ),
+    ("dbo.idea_tank", "IX_idea_tank_update_datetime", "(update_datetime)", ""),
+    ("dbo.idea_tank_tombstone", "IX_idea_tank_tombstone_deleted_datetime", "(deleted_datetime)", ""),
+]
+
+
+def upgrade() -> None:
+    op.execute("""
+IF OBJECT_ID('dbo.idea_tank_tombstone', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.idea_tank_tombstone (
+        tombstone_id BIGINT IDENTITY(1,1) NOT NULL
+            CONSTRAINT PK_idea_tank_tombstone PRIMARY KEY CLUSTERED,
+        idea_seq INT NOT NULL,
+        idea_code VARCHAR(10) NULL,
+        deleted_datetime DATETIME2(6) NOT NULL
+            CONSTRAINT DF_idea_tank_tombstone_deleted_datetime DEFAULT (GETDATE())
+    );
+END
+""")
+
+    for table, name, columns, options in INDEXES:
+        op.execute(f"""
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes WHERE name = '{name}' AND object_id = OBJECT_ID('{table}')
+)
+BEGIN
+    CREATE NONCLUSTERED INDEX {name} ON {table} {columns} {options};
+END
+""")
+
+
+def downgrade() -> None:
+    for table, name, _columns, _options in reversed(INDEXES):
+        op.execute(f"""
+IF EXISTS (
+    SELECT 1 FROM sys.indexes WHERE name = '{name}' AND object_id = OBJECT_ID('{table}')
+)
+BEGIN
+    DROP INDEX {name} ON {table};
+END
+""")
+
+    op.execute("""
+IF OBJECT_ID('dbo.idea_tank_tombstone', 'U') IS NOT NULL
+BEGIN
+    DROP TABLE dbo.idea_tank_tombstone;
+END
+""")
@@ -1,15 +1,18 @@
 import uuid
 import logging
 import json
-import re
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, UploadFile, File
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, text, or_, case, literal, select, tuple_, DateTime
 
-from app.db.database import get_db
+from app.db.bulk import bulk_update
+from app.db.database import get_async_db, get_async_read_db, get_db, get_read_db, records_write
+from app.db.pool_metrics import pool_metrics
+from app.db.returning import insert_returning, update_returning
 from app.db import models
 from app.db.schemas import (
     QuestionCreate,
@@ -19,6 +22,8 @@ from app.db.schemas import (
     AnswerModelEvaluationUpdate,
     IdeaCreate,
     IdeaOut,
+    IdeaLeaderboardResponse,
+    IdeaChangesResponse,
     UserCreate,
     UserOut,
     UserLogin,
@@ -26,20 +31,47 @@ from app.db.schemas import (
     UserUpdate,
     ProjectSubmissionStep1In,
     ProjectSubmissionStep2In,
+    ProjectSubmissionMemberOut,
     ProjectSubmissionOut,
     ProjectSubmissionListResponse,
     ProjectSubmissionNewStep1In,
     ProjectSubmissionNewStep2In,
+    ProjectSubmissionNewMemberOut,
     ProjectSubmissionNewOut,
     ProjectSubmissionNewListResponse,
 )
-from sqlalchemy.orm import joinedload
-from fastapi.responses import StreamingResponse
-from io import BytesIO
-import pandas as pd
+from sqlalchemy.orm import joinedload, undefer_group
+from fastapi.responses import FileResponse, StreamingResponse, Response
 from pydantic import BaseModel
 from app.services.classifier import classify_category, extract_keywords
 from app.services.openai_service import openai_service
+from app.services.dedup_service import idea_dedup_index
+from app.services.idea_cache import (
+    IDEA_OUT_COLUMNS, SNAPSHOT_WATERMARK_OVERLAP, idea_facet_cache, idea_snapshot, invalidate_idea_caches,
+)
+from app.services.idea_import import (
+    IMPORT_MODES,
+    IMPORT_READERS,
+    IdeaImportError,
+    UploadTooLargeError,
+    get_import_reader,
+    import_ideas_from_file,
+    remove_spooled_file,
+    spool_upload,
+)
+from app.services.import_jobs import import_job_manager
+from app.services.cpu_pool import TaskTimeout, cpu_task_pool
+from app.services.submission_export import (
+    EXPORT_OFFLOAD_MIN_ROWS,
+    count_submission_export,
+    iter_submission_export,
+    render_submission_export,
+)
+from app.services.export_stream import EXPORT_FLUSH_ROWS, EXPORT_FORMATS, EXPORT_MEDIA_TYPES, iter_export, iter_gzip
+from app.services.export_cache import export_artifact_cache
+from app.services.html_text import plain_text_values
+from app.services.row_json import rows_to_json, schema_columns
+from starlette.concurrency import run_in_threadpool
 from app.services.auth_service import verify_password, get_password_hash, create_access_token, verify_token, validate_password_hash
 from app.services.authorization_service import require_permission, require_role, verify_api_key_dependency, AuthorizationService
 from sqlalchemy import desc
@@ -74,7 +106,7 @@ def to_question_out(question: models.Question) -> QuestionOut:
 
 
 def to_answer_out(answer: models.Answer) -> AnswerOut:
-    """Convert ORM Answer to response schema with safety fallback for bad historical rows."""
+    """Convert an Answer (ORM object or returned row) to response schema with safety fallback for bad historical rows."""
     created_at = answer.created_at
     if created_at is None:
         logger.error(
@@ -102,8 +134,57 @@ def to_answer_out(answer: models.Answer) -> AnswerOut:
     )
 
 
+# List endpoints select these columns with Core and serialize the rows with orjson
+ANSWER_OUT_COLUMNS = schema_columns(models.Answer.__table__, AnswerOut)
+ANSWER_OUT_KEYS = [column.name for column in ANSWER_OUT_COLUMNS]
+USER_OUT_COLUMNS = schema_columns(models.User.__table__, UserOut)
+USER_OUT_KEYS = [column.name for column in USER_OUT_COLUMNS]
+
+# Write routes return the rows their INSERT / UPDATE ... OUTPUT hands back, limited to these columns
+SUBMISSION_OUT_COLUMNS = [
+    column for column in models.ProjectSubmission.__table__.c if column.name in ProjectSubmissionOut.model_fields
+]
+SUBMISSION_MEMBER_OUT_COLUMNS = schema_columns(models.ProjectSubmissionMember.__table__, ProjectSubmissionMemberOut)
+SUBMISSION_NEW_OUT_COLUMNS = [
+    column for column in models.ProjectSubmissionNew.__table__.c if column.name in ProjectSubmissionNewOut.model_fields
+]
+SUBMISSION_NEW_MEMBER_OUT_COLUMNS = schema_columns(
+    models.ProjectSubmissionNewMember.__table__, ProjectSubmissionNewMemberOut
+)
+
+
+def submission_response(submission, members) -> dict:
+    """Submission row plus its member rows, in the shape ProjectSubmissionOut / ProjectSubmissionNewOut read."""
+    return {**submission._mapping, "members": [dict(member._mapping) for member in members]}
+
+
+# Large text columns are deferred in the models; routes returning a whole row load them up front
+ANSWER_CONTENT = (undefer_group("answer_text"), undefer_group("answer_model"))
+IDEA_CONTENT = (undefer_group("idea_text"), undefer_group("idea_ai"))
+
+
+def refresh_with_content(db: Session, instance) -> None:
+    """db.refresh() that also reloads the deferred columns, in the same SELECT."""
+    db.refresh(instance, [attr.key for attr in instance.__mapper__.column_attrs])
+
+
+def answers_json_response(rows) -> Response:
+    """to_answer_out for lists without an ORM object or AnswerOut per row; same created_at fallback."""
+    created_at_index = ANSWER_OUT_KEYS.index("created_at")
+    checked_rows = []
+    for row in rows:
+        if row[created_at_index] is None:
+            logger.error(
+                "Answer record has NULL created_at; applying fallback datetime. answer_id=%s",
+                row[ANSWER_OUT_KEYS.index("answer_id")],
+            )
+            row = tuple(row[:created_at_index]) + (datetime.utcnow(),) + tuple(row[created_at_index + 1:])
+        checked_rows.append(row)
+    return Response(content=rows_to_json(ANSWER_OUT_KEYS, checked_rows), media_type="application/json")
+
+
 # Authentication dependency
-def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
+def _login_from_credentials(credentials: HTTPAuthorizationCredentials) -> str:
     token = credentials.credentials
     payload = verify_token(token)
     if payload is None:
@@ -120,24 +201,50 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Security(securi
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    user = db.query(models.User).filter(models.User.user_login == user_login).first()
+    return user_login
+
+
+def _require_user(user: Optional[models.User]) -> models.User:
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
     return user
 
 
+def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
+    user_login = _login_from_credentials(credentials)
+    user = db.query(models.User).filter(models.User.user_login == user_login).first()
+    return _require_user(user)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """get_current_user for async routes, so authentication does not take a threadpool thread"""
+    user_login = _login_from_credentials(credentials)
+    result = await db.execute(select(models.User).where(models.User.user_login == user_login))
+    return _require_user(result.scalars().first())
+
+
 @router.get("/health")
 def health_check():
     return {"status": "ok"}
 
 
-@router.post("/questions", response_model=QuestionOut, status_code=status.HTTP_201_CREATED)
+@router.get("/health/db-pool")
+def db_pool_metrics(current_user: dict = Depends(require_permission("manage:system"))):
+    """Connection pool saturation and latency per engine, for sizing the pool against event peaks"""
+    return {"engines": [metrics.snapshot() for metrics in pool_metrics.values()]}
+
+
+@router.post(
+    "/questions", response_model=QuestionOut, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(records_write)],
+)
 def create_question(
     payload: QuestionCreate,
     db: Session = Depends(get_db),
@@ -161,13 +268,12 @@ def create_question(
 
 
 @router.get("/questions", response_model=list[QuestionOut])
-def list_questions(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    items = (
-        db.query(models.Question)
-        .order_by(desc(models.Question.created_at))
-        .all()
-    )
-    return [to_question_out(item) for item in items]
+async def list_questions(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(get_current_user_async),
+):
+    result = await db.execute(select(models.Question).order_by(desc(models.Question.created_at)))
+    return [to_question_out(item) for item in result.scalars().all()]
 
 
 @router.get("/questions/{question_id}", response_model=QuestionOut)
@@ -178,44 +284,72 @@ def get_question(question_id: str, db: Session = Depends(get_db)):
     return to_question_out(item)
 
 
-@router.post("/answers", response_model=AnswerOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/answers", response_model=AnswerOut, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(records_write)],
+)
 def create_answer(payload: AnswerCreate, db: Session = Depends(get_db)):
     print("payload: ", payload)    
     category = classify_category(payload.answer_text)
     keywords = extract_keywords(payload.answer_text)
     print("Return category: ", category)
-    new_answer = models.Answer(
-        question_id=payload.question_id,
-        answer_title=payload.answer_title,
-        answer_painpoint=payload.answer_painpoint,
-        answer_text=payload.answer_text,
-        answer_outcome=payload.answer_outcome,
-        category=category,
-        create_user_name=payload.create_user_name,
-        create_user_code=payload.create_user_code,
-        create_user_department=payload.create_user_department,
-        answer_keywords=keywords,
-        created_at=datetime.utcnow(),
-    )
-    db.add(new_answer)
     try:
+        (new_answer,) = insert_returning(db, models.Answer.__table__, [{
+            "question_id": payload.question_id,
+            "answer_title": payload.answer_title,
+            "answer_painpoint": payload.answer_painpoint,
+            "answer_text": payload.answer_text,
+            "answer_outcome": payload.answer_outcome,
+            "category": category,
+            "create_user_name": payload.create_user_name,
+            "create_user_code": payload.create_user_code,
+            "create_user_department": payload.create_user_department,
+            "answer_keywords": keywords,
+            "created_at": datetime.utcnow(),
+        }], ANSWER_OUT_COLUMNS)
         db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to create answer")
-    db.refresh(new_answer)
     return to_answer_out(new_answer)
 
 
+@router.get("/answers/export")
+def export_answers(
+    request: Request,
+    question_id: Optional[str] = None,
+    export_format: str = Query("csv", alias="format"),
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Stream all answers (optionally of one question) as csv (default), ndjson or xlsx"""
+    _check_export_format(export_format)
+    keys = [column.name for column in models.Answer.__table__.columns]
+    query = db.query(*models.Answer.__table__.columns)
+    if question_id:
+        query = query.filter(models.Answer.question_id == question_id)
+    rows = (tuple(row) for row in query.order_by(desc(models.Answer.created_at)).yield_per(EXPORT_FLUSH_ROWS))
+    chunks = iter_export(export_format, "answers", keys, keys, rows)
+    return _export_response(request, export_format, chunks, "answers_export")
+
+
 @router.get("/answers/{answer_id}", response_model=AnswerOut)
 def get_answer(answer_id: int, db: Session = Depends(get_db)):
-    item = db.query(models.Answer).filter(models.Answer.answer_id == answer_id).first()
+    item = (
+        db.query(models.Answer)
+        .options(*ANSWER_CONTENT)
+        .filter(models.Answer.answer_id == answer_id)
+        .first()
+    )
     if not item:
         raise HTTPException(status_code=404, detail="Answer not found")
     return to_answer_out(item)
 
 
-@router.put("/answers/{answer_id}/model-evaluation", response_model=AnswerOut)
+@router.put(
+    "/answers/{answer_id}/model-evaluation", response_model=AnswerOut,
+    dependencies=[Depends(records_write)],
+)
 def update_answer_model_evaluation(
     answer_id: int,
     payload: AnswerModelEvaluationUpdate,
@@ -260,32 +394,30 @@ def update_answer_model_evaluation(
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to update model evaluation")
 
-    db.refresh(answer)
+    refresh_with_content(db, answer)
     return to_answer_out(answer)
 
 
 @router.get("/questions/{question_id}/answers", response_model=list[AnswerOut])
-def list_answers_for_question(question_id: str, db: Session = Depends(get_db)):
-    items = (
-        db.query(models.Answer)
-        .filter(models.Answer.question_id == question_id)
+async def list_answers_for_question(question_id: str, db: AsyncSession = Depends(get_async_read_db)):
+    result = await db.execute(
+        select(*ANSWER_OUT_COLUMNS)
+        .where(models.Answer.question_id == question_id)
         .order_by(desc(models.Answer.created_at))
-       .all()
     )
-    return [to_answer_out(item) for item in items]
+    return answers_json_response(result.all())
 
 
 @router.get("/answers", response_model=list[AnswerOut])
-def list_all_answers(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    items = (
-        db.query(models.Answer)
-        .order_by(desc(models.Answer.created_at))
-        .all()
-    )
-    return [to_answer_out(item) for item in items]
+async def list_all_answers(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(get_current_user_async),
+):
+    result = await db.execute(select(*ANSWER_OUT_COLUMNS).order_by(desc(models.Answer.created_at)))
+    return answers_json_response(result.all())
 
 
-@router.delete("/questions/{question_id}")
+@router.delete("/questions/{question_id}", dependencies=[Depends(records_write)])
 def delete_question_and_answers(
     question_id: str,
     db: Session = Depends(get_db),
@@ -319,47 +451,51 @@ def delete_question_and_answers(
 
 
 # Idea Tank API Routes
-@router.post("/ideas", response_model=IdeaOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/ideas", response_model=IdeaOut, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(records_write)],
+)
 def create_idea(payload: IdeaCreate, db: Session = Depends(get_db)):
-    new_idea = models.IdeaTank(
-        idea_code=payload.idea_code,
-        category_idea_type1=payload.category_idea_type1,
-        idea_name=payload.idea_name,
-        idea_subject=payload.idea_subject,
-        idea_source=payload.idea_source,
-        customer_target=payload.customer_target,
-        idea_inno_type=payload.idea_inno_type,
-        idea_detail=payload.idea_detail,
-        idea_finance_impact=payload.idea_finance_impact,
-        idea_nonfinance_impact=payload.idea_nonfinance_impact,
-        idea_status=payload.idea_status,
-        idea_owner_empcode=payload.idea_owner_empcode,
-        idea_owner_empname=payload.idea_owner_empname,
-        idea_owner_deposit=payload.idea_owner_deposit,
-        idea_owner_contacts=payload.idea_owner_contacts,
-        idea_keywords=payload.idea_keywords,
-        idea_comment=payload.idea_comment,
-        idea_summary_byai=payload.idea_summary_byai,
-    )
-    db.add(new_idea)
     try:
+        (new_idea,) = insert_returning(db, models.IdeaTank.__table__, [{
+            "idea_code": payload.idea_code,
+            "category_idea_type1": payload.category_idea_type1,
+            "idea_name": payload.idea_name,
+            "idea_subject": payload.idea_subject,
+            "idea_source": payload.idea_source,
+            "customer_target": payload.customer_target,
+            "idea_inno_type": payload.idea_inno_type,
+            "idea_detail": payload.idea_detail,
+            "idea_finance_impact": payload.idea_finance_impact,
+            "idea_nonfinance_impact": payload.idea_nonfinance_impact,
+            "idea_status": payload.idea_status,
+            "idea_owner_empcode": payload.idea_owner_empcode,
+            "idea_owner_empname": payload.idea_owner_empname,
+            "idea_owner_deposit": payload.idea_owner_deposit,
+            "idea_owner_contacts": payload.idea_owner_contacts,
+            "idea_keywords": payload.idea_keywords,
+            "idea_comment": payload.idea_comment,
+            "idea_summary_byai": payload.idea_summary_byai,
+        }], IDEA_OUT_COLUMNS)
         db.commit()
+        invalidate_idea_caches()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to create idea")
-    db.refresh(new_idea)
+    idea_dedup_index.index_idea(
+        new_idea.idea_seq, new_idea.idea_name, new_idea.idea_detail, new_idea.update_datetime
+    )
     return new_idea
 
 
-@router.get("/ideas", response_model=list[IdeaOut])
-def list_all_ideas(
+def _filter_ideas(
+    query,
     keyword: Optional[str] = None,
     min_score: Optional[int] = None,
     max_score: Optional[int] = None,
-    db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)
+    category_idea_type1: Optional[str] = None,
+    idea_status_md: Optional[str] = None,
 ):
-    query = db.query(models.IdeaTank)
-    
     # Add keyword search filter if provided
     if keyword:
         keyword_lower = keyword.lower()
@@ -376,13 +512,246 @@ def list_all_ideas(
     
     if max_score is not None:
         query = query.filter(models.IdeaTank.idea_score <= max_score)
-    
-    items = (
-        query
-        .order_by(models.IdeaTank.idea_seq)
-        .all()
+
+    if category_idea_type1:
+        query = query.filter(models.IdeaTank.category_idea_type1 == category_idea_type1)
+
+    if idea_status_md:
+        query = query.filter(models.IdeaTank.idea_status_md == idea_status_md)
+
+    return query
+
+
+@router.get("/ideas", response_model=list[IdeaOut])
+async def list_all_ideas(
+    keyword: Optional[str] = None,
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    category_idea_type1: Optional[str] = None,
+    idea_status_md: Optional[str] = None,
+    current_user: models.User = Depends(get_current_user_async),
+):
+    # Served from the in-process snapshot; rows are already serialized as IdeaOut JSON.
+    # Only a due refresh touches the database. Both the refresh and the filtering/joining
+    # of the snapshot scale with the tank, so they run in the threadpool, off the event loop
+    if idea_snapshot.needs_refresh():
+        await run_in_threadpool(idea_snapshot.refresh)
+    content = await run_in_threadpool(
+        idea_snapshot.list_json, keyword, min_score, max_score, category_idea_type1, idea_status_md
+    )
+    return Response(content=content, media_type="application/json")
+
+
+IDEA_SCORE_BUCKETS = [
+    (90, "90-100"),
+    (80, "80-89"),
+    (70, "70-79"),
+    (60, "60-69"),
+    (50, "50-59"),
+]
+IDEA_SCORE_BUCKET_LOW = "0-49"
+IDEA_SCORE_BUCKET_NONE = "unscored"
+IDEA_FACET_NAMES = ["category_idea_type1", "idea_status", "idea_status_md", "score_bucket"]
+
+
+@router.get("/ideas/export")
+def export_ideas(
+    request: Request,
+    keyword: Optional[str] = None,
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    category_idea_type1: Optional[str] = None,
+    idea_status_md: Optional[str] = None,
+    export_format: str = Query("csv", alias="format"),
+    db: Session = Depends(get_read_db), current_user: models.User = Depends(get_current_user)
+):
+    """Stream the idea tank with the GET /ideas filters as csv (default), ndjson or xlsx"""
+    _check_export_format(export_format)
+    keys = [column.name for column in models.IdeaTank.__table__.columns]
+    query = _filter_ideas(
+        db.query(*models.IdeaTank.__table__.columns),
+        keyword, min_score, max_score, category_idea_type1, idea_status_md,
+    )
+    rows = (tuple(row) for row in query.order_by(models.IdeaTank.idea_seq).yield_per(EXPORT_FLUSH_ROWS))
+    chunks = iter_export(export_format, "idea_tank", keys, keys, rows)
+    return _export_response(request, export_format, chunks, "ideas_export")
+
+
+@router.get("/ideas/facets")
+def get_idea_facets(
+    keyword: Optional[str] = None,
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    category_idea_type1: Optional[str] = None,
+    idea_status_md: Optional[str] = None,
+    db: Session = Depends(get_read_db), current_user: models.User = Depends(get_current_user)
+):
+    """
+    Count ideas per category_idea_type1, idea_status, idea_status_md and score bucket
+    for the same filters as GET /ideas, computed in one GROUPING SETS query
+    """
+    cache_key = idea_facet_cache.make_key(keyword, min_score, max_score, category_idea_type1, idea_status_md)
+    cached = idea_facet_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    score_bucket = case(
+        (models.IdeaTank.idea_score.is_(None), IDEA_SCORE_BUCKET_NONE),
+        *[(models.IdeaTank.idea_score >= low, label) for low, label in IDEA_SCORE_BUCKETS],
+        else_=IDEA_SCORE_BUCKET_LOW,
+    )
+    # Label the facet expressions in a subquery so GROUP BY references plain columns
+    filtered = _filter_ideas(
+        db.query(
+            models.IdeaTank.category_idea_type1.label("category_idea_type1"),
+            models.IdeaTank.idea_status.label("idea_status"),
+            models.IdeaTank.idea_status_md.label("idea_status_md"),
+            score_bucket.label("score_bucket"),
+        ),
+        keyword, min_score, max_score, category_idea_type1, idea_status_md,
+    ).subquery()
+
+    facet_columns = [filtered.c[name] for name in IDEA_FACET_NAMES]
+    if db.get_bind().dialect.name == "mssql":
+        rows = (
+            db.query(
+                *[func.grouping(column) for column in facet_columns],
+                *facet_columns,
+                func.count(),
+            )
+            .group_by(func.grouping_sets(*[tuple_(column) for column in facet_columns], tuple_()))
+            .all()
+        )
+    else:
+        # SQLite (local runs) has no GROUPING SETS: one GROUP BY per set, rows shaped the same
+        rows = []
+        for position in range(len(facet_columns) + 1):
+            flags = [int(index != position) for index in range(len(facet_columns))]
+            query = db.query(
+                *[literal(None) if flag else column for flag, column in zip(flags, facet_columns)],
+                func.count(),
+            ).select_from(filtered)
+            rows += [(*flags, *row) for row in query.group_by(*facet_columns[position:position + 1]).all()]
+
+    total = 0
+    facets = {name: [] for name in IDEA_FACET_NAMES}
+    facet_count = len(IDEA_FACET_NAMES)
+    for row in rows:
+        grouping_flags = row[:facet_count]
+        values = row[facet_count:facet_count * 2]
+        count = row[-1]
+        if all(grouping_flags):
+            total = count
+            continue
+        position = list(grouping_flags).index(0)
+        facets[IDEA_FACET_NAMES[position]].append({"value": values[position], "count": count})
+
+    for entries in facets.values():
+        entries.sort(key=lambda entry: (-entry["count"], str(entry["value"])))
+
+    result = {"total": total, "facets": facets}
+    idea_facet_cache.set(cache_key, result)
+    return result
+
+
+@router.get("/ideas/leaderboard", response_model=IdeaLeaderboardResponse)
+def get_idea_leaderboard(
+    limit: int = 10,
+    after_rank: int = 0,
+    category_idea_type1: Optional[str] = None,
+    per_category: bool = False,
+    db: Session = Depends(get_read_db), current_user: models.User = Depends(get_current_user)
+):
+    """
+    Top-K scored ideas ranked by idea_score DESC with ties broken by idea_seq ASC
+    - Page with after_rank (the last rank already received); ranks are stable between pages
+    - per_category=true returns the top `limit` ideas of every category_idea_type1 instead
+    """
+    if limit < 1 or limit > 500:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 500")
+
+    partition_by = models.IdeaTank.category_idea_type1 if per_category else None
+    ranked = (
+        db.query(
+            models.IdeaTank.idea_seq,
+            models.IdeaTank.idea_code,
+            models.IdeaTank.category_idea_type1,
+            models.IdeaTank.idea_name,
+            models.IdeaTank.idea_score,
+            func.row_number().over(
+                partition_by=partition_by,
+                order_by=(models.IdeaTank.idea_score.desc(), models.IdeaTank.idea_seq.asc()),
+            ).label("rank"),
+        )
+        .filter(models.IdeaTank.idea_score.isnot(None))
+    )
+    if category_idea_type1:
+        ranked = ranked.filter(models.IdeaTank.category_idea_type1 == category_idea_type1)
+    ranked = ranked.subquery()
+
+    query = db.query(ranked)
+    if per_category:
+        query = query.filter(ranked.c.rank <= limit).order_by(ranked.c.category_idea_type1, ranked.c.rank)
+        items = query.all()
+        next_after_rank = None
+    else:
+        # Fetch one extra row to learn whether another page exists
+        items = (
+            query.filter(ranked.c.rank > after_rank)
+            .order_by(ranked.c.rank)
+            .limit(limit + 1)
+            .all()
+        )
+        next_after_rank = items[limit - 1].rank if len(items) > limit else None
+        items = items[:limit]
+
+    return IdeaLeaderboardResponse(items=items, limit=limit, next_after_rank=next_after_rank)
+
+
+@router.get("/ideas/changes", response_model=IdeaChangesResponse)
+def list_idea_changes(
+    since: Optional[datetime] = None,
+    limit: int = 1000,
+    after_seq: int = 0,
+    db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)
+):
+    """
+    Ideas created, updated or deleted at or after `since`, in pages of `limit` ideas
+    - Without `since` every idea is returned as an upsert (initial sync)
+    - Page with after_seq (next_after_seq of the previous page) and the same `since`; deletes
+      come with the first page. When next_after_seq is null, send the first page's watermark
+      as `since` on the next sync
+    - The watermark is the database clock minus a safety margin, so rows stamped by a lagging
+      application clock or committed late by an import are sent again instead of missed;
+      apply upserts and deletes idempotently by idea_seq
+    """
+    if limit < 1 or limit > 5000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 5000")
+
+    # Read the clock before the rows: anything committed after this is stamped at or after it
+    watermark = db.query(func.getdate(type_=DateTime)).scalar() - SNAPSHOT_WATERMARK_OVERLAP
+
+    upsert_query = db.query(models.IdeaTank).options(*IDEA_CONTENT).filter(models.IdeaTank.idea_seq > after_seq)
+    if since is not None:
+        upsert_query = upsert_query.filter(models.IdeaTank.update_datetime >= since)
+    # Fetch one extra row to learn whether another page exists
+    upserts = upsert_query.order_by(models.IdeaTank.idea_seq).limit(limit + 1).all()
+    next_after_seq = upserts[limit - 1].idea_seq if len(upserts) > limit else None
+    upserts = upserts[:limit]
+
+    deleted = []
+    if since is not None and after_seq == 0:
+        deleted = (
+            db.query(models.IdeaTankTombstone)
+            .filter(models.IdeaTankTombstone.deleted_datetime >= since)
+            .order_by(models.IdeaTankTombstone.deleted_datetime)
+            .all()
+        )
+
+    return IdeaChangesResponse(
+        since=since, watermark=watermark, limit=limit, next_after_seq=next_after_seq,
+        upserts=upserts, deleted=deleted,
     )
-    return items
 
 
 @router.get("/ideas/random", response_model=IdeaOut)
@@ -391,7 +760,7 @@ def get_random_idea(db: Session = Depends(get_db), current_user: models.User = D
     Get a random idea from the idea tank
     """
     # Get a random idea using SQLAlchemy's random function
-    idea = db.query(models.IdeaTank).filter(
+    idea = db.query(models.IdeaTank).options(*IDEA_CONTENT).filter(
         models.IdeaTank.idea_detail.isnot(None),
         models.IdeaTank.idea_detail != "",
         models.IdeaTank.idea_detail != "-"
@@ -403,6 +772,44 @@ def get_random_idea(db: Session = Depends(get_db), current_user: models.User = D
     return idea
 
 
+@router.get("/ideas/duplicates")
+def list_duplicate_ideas(
+    threshold: Optional[float] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Report groups of near-duplicate ideas in the idea tank (MinHash/LSH over idea_name + idea_detail)
+    """
+    idea_dedup_index.ensure_fresh(db)
+    groups = idea_dedup_index.duplicate_groups()
+    if threshold is not None:
+        groups = [
+            [member for member in group if member[1] >= threshold]
+            for group in groups
+        ]
+        groups = [group for group in groups if len(group) > 1]
+
+    seqs = {seq for group in groups for seq, _ in group}
+    names = dict(
+        db.query(models.IdeaTank.idea_seq, models.IdeaTank.idea_name)
+        .filter(models.IdeaTank.idea_seq.in_(seqs))
+        .all()
+    ) if seqs else {}
+
+    return {
+        "group_count": len(groups),
+        "duplicate_count": sum(len(group) - 1 for group in groups),
+        "groups": [
+            [
+                {"idea_seq": seq, "idea_name": names.get(seq), "similarity": round(similarity, 3)}
+                for seq, similarity in group
+            ]
+            for group in groups
+        ],
+    }
+
+
 class ScoreIdeaRequest(BaseModel):
     system_prompt: str
     idea_name: Optional[str] = None
@@ -450,7 +857,7 @@ async def score_idea(request: ScoreIdeaRequest):
         )
 
 
-@router.post("/ideas/batch-score", response_model=BatchScoreResponse)
+@router.post("/ideas/batch-score", response_model=BatchScoreResponse, dependencies=[Depends(records_write)])
 async def batch_score_ideas(request: BatchScoreRequest, db: Session = Depends(get_db)):
     """
     Batch score ideas using AI based on the provided system prompt
@@ -470,7 +877,7 @@ async def batch_score_ideas(request: BatchScoreRequest, db: Session = Depends(ge
                 )
         
         # Build query to get ideas that need scoring
-        query = db.query(models.IdeaTank).filter(
+        query = db.query(models.IdeaTank.idea_seq, models.IdeaTank.idea_name, models.IdeaTank.idea_detail).filter(
             models.IdeaTank.idea_detail.isnot(None),
             models.IdeaTank.idea_detail != "",
             models.IdeaTank.idea_detail != "-"
@@ -498,6 +905,8 @@ async def batch_score_ideas(request: BatchScoreRequest, db: Session = Depends(ge
         success_count = 0
         error_count = 0
         errors = []
+        # Scores are written together at the end: one UPDATE joined to a VALUES list per batch
+        score_updates = []
         
         for idea in ideas:
             try:
@@ -537,9 +946,12 @@ async def batch_score_ideas(request: BatchScoreRequest, db: Session = Depends(ge
                 formatted_result += f"ข้อเสนอแนะโดยรวม:\n{result.get('overall_feedback', '')}"
                 
                 # Update the idea with score and comment
-                idea.idea_score = numeric_score
-                idea.idea_score_comment = formatted_result
-                idea.update_datetime = datetime.now()
+                score_updates.append({
+                    "idea_seq": idea.idea_seq,
+                    "idea_score": numeric_score,
+                    "idea_score_comment": formatted_result,
+                    "update_datetime": datetime.now(),
+                })
                 
                 processed_count += 1
                 success_count += 1
@@ -553,7 +965,9 @@ async def batch_score_ideas(request: BatchScoreRequest, db: Session = Depends(ge
         
         # Commit all changes
         try:
+            bulk_update(db, models.IdeaTank.__table__, "idea_seq", score_updates)
             db.commit()
+            invalidate_idea_caches()
         except Exception as e:
             db.rollback()
             raise HTTPException(
@@ -576,7 +990,7 @@ async def batch_score_ideas(request: BatchScoreRequest, db: Session = Depends(ge
         )
 
 
-@router.post("/ideas/clear-scores")
+@router.post("/ideas/clear-scores", dependencies=[Depends(records_write)])
 async def clear_idea_scores(db: Session = Depends(get_db)):
     """
     Clear all idea scores by setting idea_score to null
@@ -588,6 +1002,7 @@ async def clear_idea_scores(db: Session = Depends(get_db)):
         )
         
         db.commit()
+        invalidate_idea_caches()
         
         return {
             "success": True,
@@ -606,10 +1021,11 @@ async def clear_idea_scores(db: Session = Depends(get_db)):
 
 @router.get("/ideas/{idea_seq}", response_model=IdeaOut)
 def get_idea(idea_seq: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    item = db.query(models.IdeaTank).filter(models.IdeaTank.idea_seq == idea_seq).first()
-    if not item:
+    idea_snapshot.ensure_fresh(db)
+    content = idea_snapshot.get_json(idea_seq)
+    if content is None:
         raise HTTPException(status_code=404, detail="Idea not found")
-    return item
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/ideas/code/{idea_code}", response_model=IdeaOut)
@@ -617,13 +1033,14 @@ def get_idea_by_code(idea_code: str, db: Session = Depends(get_db), current_user
     """
     Get an idea by its idea_code
     """
-    item = db.query(models.IdeaTank).filter(models.IdeaTank.idea_code == idea_code).first()
-    if not item:
+    idea_snapshot.ensure_fresh(db)
+    content = idea_snapshot.get_json_by_code(idea_code)
+    if content is None:
         raise HTTPException(status_code=404, detail="Idea not found")
-    return item
+    return Response(content=content, media_type="application/json")
 
 
-@router.put("/ideas/{idea_seq}", response_model=IdeaOut)
+@router.put("/ideas/{idea_seq}", response_model=IdeaOut, dependencies=[Depends(records_write)])
 def update_idea(idea_seq: int, payload: IdeaCreate, db: Session = Depends(get_db)):
     idea = db.query(models.IdeaTank).filter(models.IdeaTank.idea_seq == idea_seq).first()
     if not idea:
@@ -641,12 +1058,14 @@ def update_idea(idea_seq: int, payload: IdeaCreate, db: Session = Depends(get_db
     
     try:
         db.commit()
+        invalidate_idea_caches()
         print(f"Successfully updated idea {idea_seq}")
     except Exception as e:
         db.rollback()
         print(f"Failed to update idea {idea_seq}. Error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update idea")
-    db.refresh(idea)
+    refresh_with_content(db, idea)
+    idea_dedup_index.index_idea(idea.idea_seq, idea.idea_name, idea.idea_detail, idea.update_datetime)
     return idea
 
 
@@ -655,7 +1074,10 @@ class CommitteeEvaluationRequest(BaseModel):
     committee_reason: Optional[str] = None
 
 
-@router.put("/ideas/{idea_seq}/committee-evaluation", response_model=IdeaOut)
+@router.put(
+    "/ideas/{idea_seq}/committee-evaluation", response_model=IdeaOut,
+    dependencies=[Depends(records_write)],
+)
 def update_committee_evaluation(idea_seq: int, payload: CommitteeEvaluationRequest, db: Session = Depends(get_db)):
     """
     Update committee evaluation for an idea
@@ -679,12 +1101,14 @@ def update_committee_evaluation(idea_seq: int, payload: CommitteeEvaluationReque
     
     try:
         db.commit()
+        invalidate_idea_caches()
         print(f"Successfully updated committee evaluation for idea {idea_seq}")
     except Exception as e:
         db.rollback()
         print(f"Failed to update committee evaluation for idea {idea_seq}. Error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update committee evaluation")
-    db.refresh(idea)
+    refresh_with_content(db, idea)
+    idea_dedup_index.index_idea(idea.idea_seq, idea.idea_name, idea.idea_detail, idea.update_datetime)
     return idea
 
 
@@ -692,7 +1116,7 @@ class IdeaUpdate(BaseModel):
     idea_keywords: Optional[str] = None
     # Add other fields that can be partially updated
 
-@router.patch("/ideas/{idea_seq}", response_model=IdeaOut)
+@router.patch("/ideas/{idea_seq}", response_model=IdeaOut, dependencies=[Depends(records_write)])
 def partial_update_idea(idea_seq: int, payload: IdeaUpdate, db: Session = Depends(get_db)):
     idea = db.query(models.IdeaTank).filter(models.IdeaTank.idea_seq == idea_seq).first()
     if not idea:
@@ -710,149 +1134,174 @@ def partial_update_idea(idea_seq: int, payload: IdeaUpdate, db: Session = Depend
     
     try:
         db.commit()
+        invalidate_idea_caches()
         print(f"Successfully updated idea {idea_seq}")
     except Exception as e:
         db.rollback()
         print(f"Failed to update idea {idea_seq}. Error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update idea")
-    db.refresh(idea)
+    refresh_with_content(db, idea)
+    idea_dedup_index.index_idea(idea.idea_seq, idea.idea_name, idea.idea_detail, idea.update_datetime)
     return idea
 
-@router.delete("/ideas/{idea_seq}")
+@router.delete("/ideas/{idea_seq}", dependencies=[Depends(records_write)])
 def delete_idea(idea_seq: int, db: Session = Depends(get_db)):
     idea = db.query(models.IdeaTank).filter(models.IdeaTank.idea_seq == idea_seq).first()
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
     
     try:
+        db.add(models.IdeaTankTombstone(idea_seq=idea.idea_seq, idea_code=idea.idea_code))
         db.delete(idea)
         db.commit()
+        invalidate_idea_caches()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to delete idea")
     
+    idea_snapshot.discard(idea_seq)
+    idea_dedup_index.remove_idea(idea_seq)
     return {"deleted_idea_seq": idea_seq}
 
 
-@router.post("/ideas/bulk-import", status_code=status.HTTP_201_CREATED)
+def _validate_import_request(file: UploadFile, dedup_mode: str, mode: str) -> None:
+    if get_import_reader(file.filename) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Supported file types: {', '.join(IMPORT_READERS)}"
+        )
+    if dedup_mode not in ("report", "skip", "off"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="dedup_mode must be one of: report, skip, off"
+        )
+    if mode not in IMPORT_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"mode must be one of: {', '.join(IMPORT_MODES)}"
+        )
+
+
+async def _spool_import_upload(file: UploadFile) -> str:
+    try:
+        return await spool_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+
+
+@router.post("/ideas/bulk-import", status_code=status.HTTP_201_CREATED, dependencies=[Depends(records_write)])
 async def bulk_import_ideas(
     file: UploadFile = File(...),
+    dedup_mode: str = "report",
+    mode: str = "insert",
     db: Session = Depends(get_db)
 ):
     """
-    Bulk import ideas from Excel file
-    Expected columns: idea_code, category_idea_type1, idea_name, idea_subject, idea_source,
+    Bulk import ideas from an Excel (.xlsx, .xls), CSV, Parquet or NDJSON (.ndjson, .jsonl) file
+    Expected columns (or NDJSON keys): idea_code, category_idea_type1, idea_name, idea_subject, idea_source,
     customer_target, idea_inno_type, idea_detail, idea_finance_impact, idea_nonfinance_impact,
     idea_status, idea_owner_empcode, idea_owner_empname, idea_owner_deposit, idea_owner_contacts,
     idea_keywords, idea_comment, idea_summary_byai
+    dedup_mode: "report" (default) lists near-duplicates but imports them, "skip" leaves them out,
+    "off" disables the check. Duplicates within the file are only caught against its first
+    IMPORT_DEDUP_IN_FILE_MAX_ROWS rows, which the check keeps in memory
+    mode: "insert" (default) always adds rows, "upsert" merges on idea_code, updating only rows
+    whose content changed, and reports inserted/updated/unchanged counts
+    The upload is spooled to disk (at most IMPORT_MAX_UPLOAD_MB), parsed (in a worker process
+    when larger than IMPORT_OFFLOAD_MIN_KB) and inserted in committed chunks
+    For large files use POST /ideas/bulk-import/jobs instead
     """
-    if not file.filename.endswith(('.xlsx', '.xls')):
+    _validate_import_request(file, dedup_mode, mode)
+
+    path = await _spool_import_upload(file)
+    try:
+        result = await run_in_threadpool(import_ideas_from_file, db, path, dedup_mode, mode)
+    except TaskTimeout:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only Excel files (.xlsx, .xls) are supported"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Parsing the file took too long; use POST /ideas/bulk-import/jobs for large files"
         )
-    
-    try:
-        # Import pandas only when needed
-        import pandas as pd
-        
-        # Read Excel file
-        contents = await file.read()
-        df = pd.read_excel(contents)
-        
-        # Validate required columns
-        required_columns = [
-            "idea_code", "category_idea_type1", "idea_name", "idea_subject", "idea_source",
-            "customer_target", "idea_inno_type", "idea_detail", "idea_finance_impact",
-            "idea_nonfinance_impact", "idea_status", "idea_owner_empcode", "idea_owner_empname",
-            "idea_owner_deposit", "idea_owner_contacts", "idea_keywords", "idea_comment",
-            "idea_summary_byai"
-        ]
-        
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Missing required columns: {', '.join(missing_columns)}"
-            )
-        
-        # Get current timestamp for create_datetime and update_datetime
-        current_time = datetime.now()
-        
-        # Process each row
-        imported_count = 0
-        errors = []
-        print('Process each row')
-        for index, row in df.iterrows():
-            try:
-                # Create new idea
-                new_idea = models.IdeaTank(
-                    idea_code=str(row.get("idea_code", "")) if pd.notna(row.get("idea_code")) else None,
-                    category_idea_type1=str(row.get("category_idea_type1", "")) if pd.notna(row.get("category_idea_type1")) else None,
-                    idea_name=str(row.get("idea_name", "")) if pd.notna(row.get("idea_name")) else None,
-                    idea_subject=str(row.get("idea_subject", "")) if pd.notna(row.get("idea_subject")) else None,
-                    idea_source=str(row.get("idea_source", "")) if pd.notna(row.get("idea_source")) else None,
-                    customer_target=str(row.get("customer_target", "")) if pd.notna(row.get("customer_target")) else None,
-                    idea_inno_type=str(row.get("idea_inno_type", "")) if pd.notna(row.get("idea_inno_type")) else None,
-                    idea_detail=str(row.get("idea_detail", "")) if pd.notna(row.get("idea_detail")) else None,
-                    idea_finance_impact=str(row.get("idea_finance_impact", "")) if pd.notna(row.get("idea_finance_impact")) else None,
-                    idea_nonfinance_impact=str(row.get("idea_nonfinance_impact", "")) if pd.notna(row.get("idea_nonfinance_impact")) else None,
-                    idea_status=str(row.get("idea_status", "")) if pd.notna(row.get("idea_status")) else None,
-                    idea_owner_empcode=str(row.get("idea_owner_empcode", "")) if pd.notna(row.get("idea_owner_empcode")) else None,
-                    idea_owner_empname=str(row.get("idea_owner_empname", "")) if pd.notna(row.get("idea_owner_empname")) else None,
-                    idea_owner_deposit=str(row.get("idea_owner_deposit", "")) if pd.notna(row.get("idea_owner_deposit")) else None,
-                    idea_owner_contacts=str(row.get("idea_owner_contacts", "")) if pd.notna(row.get("idea_owner_contacts")) else None,
-                    idea_keywords=str(row.get("idea_keywords", "")) if pd.notna(row.get("idea_keywords")) else None,
-                    idea_comment=str(row.get("idea_comment", "")) if pd.notna(row.get("idea_comment")) else None,
-                    idea_summary_byai=str(row.get("idea_summary_byai", "")) if pd.notna(row.get("idea_summary_byai")) else None,
-                    create_datetime=current_time,
-                    update_datetime=current_time
-                )
-                
-                db.add(new_idea)
-                imported_count += 1
-                print('Create new idea row_no: ', index + 2)  # +2 because Excel rows are 1-indexed and header is row 1
-                
-            except Exception as e:
-                errors.append(f"Row {index + 2}: {str(e)}")  # +2 because Excel rows are 1-indexed and header is row 1
-        
-        # Commit all changes
-        try:
-            print('Commit all changes')
-            db.commit()
-        except Exception as e:
-            db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Database error: {str(e)}"
-            )
-        
-        return {
-            "message": f"Successfully imported {imported_count} ideas",
-            "total_rows": len(df),
-            "imported_count": imported_count,
-            "errors": errors
-        }
-        
-    except pd.errors.EmptyDataError:
+    except IdeaImportError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Excel file is empty"
+            detail=str(e)
         )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing file: {str(e)}"
         )
+    finally:
+        remove_spooled_file(path)
+        invalidate_idea_caches()
+
+    return result
 
 
-@router.post("/ideas/{idea_seq}/summarize", response_model=IdeaOut)
+@router.post("/ideas/bulk-import/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_idea_import_job(
+    file: UploadFile = File(...),
+    dedup_mode: str = "report",
+    mode: str = "insert"
+):
+    """
+    Start a background bulk import; same file types and options as POST /ideas/bulk-import
+    Returns the job right away; poll GET /ideas/bulk-import/jobs/{job_id} for progress
+    """
+    _validate_import_request(file, dedup_mode, mode)
+    path = await _spool_import_upload(file)
+    job = import_job_manager.submit(path, file.filename, dedup_mode, mode)
+    return job.to_dict()
+
+
+@router.get("/ideas/bulk-import/jobs/{job_id}")
+def get_idea_import_job(job_id: str):
+    """Progress of a background import: rows parsed, validated, inserted and rejected"""
+    job = import_job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.to_dict()
+
+
+@router.post("/ideas/bulk-import/jobs/{job_id}/cancel")
+def cancel_idea_import_job(job_id: str):
+    """Stop a queued or running import; chunks that were already committed are kept"""
+    job = import_job_manager.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.to_dict()
+
+
+@router.get("/ideas/bulk-import/jobs/{job_id}/errors")
+def download_idea_import_errors(job_id: str):
+    """Download the rejected rows of a finished import job as CSV, with the reason per row"""
+    job = import_job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    if not job.to_dict()["has_error_file"]:
+        raise HTTPException(status_code=404, detail="No rejected rows for this import job")
+    return FileResponse(
+        job.error_file_path,
+        media_type="text/csv",
+        filename=f"import_errors_{job_id}.csv"
+    )
+
+
+@router.post("/ideas/{idea_seq}/summarize", response_model=IdeaOut, dependencies=[Depends(records_write)])
 async def summarize_idea(idea_seq: int, db: Session = Depends(get_db)):
     """
     Use AI to summarize and format the idea detail, then update the idea_summary_byai field
     """
     # Get the idea
-    idea = db.query(models.IdeaTank).filter(models.IdeaTank.idea_seq == idea_seq).first()
+    idea = (
+        db.query(models.IdeaTank)
+        .options(undefer_group("idea_text"))
+        .filter(models.IdeaTank.idea_seq == idea_seq)
+        .first()
+    )
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
     
@@ -870,7 +1319,9 @@ async def summarize_idea(idea_seq: int, db: Session = Depends(get_db)):
         
         # Save to database
         db.commit()
-        db.refresh(idea)
+        invalidate_idea_caches()
+        refresh_with_content(db, idea)
+        idea_dedup_index.index_idea(idea.idea_seq, idea.idea_name, idea.idea_detail, idea.update_datetime)
         
         return idea
         
@@ -900,7 +1351,7 @@ def extract_keywords_endpoint(request: ExtractKeywordsRequest, current_user: mod
         )
 
 
-@router.post("/ideas/generate-keywords")
+@router.post("/ideas/generate-keywords", dependencies=[Depends(records_write)])
 async def generate_keywords_for_ideas(db: Session = Depends(get_db)):
     """
     Generate keywords for ideas that don't have them
@@ -911,7 +1362,7 @@ async def generate_keywords_for_ideas(db: Session = Depends(get_db)):
     """
     try:
         # Find ideas without keywords
-        target_ideas = db.query(models.IdeaTank).filter(
+        target_ideas = db.query(models.IdeaTank.idea_seq, models.IdeaTank.idea_detail).filter(
             (models.IdeaTank.idea_keywords.is_(None)) |
             (models.IdeaTank.idea_keywords == "") |
             (models.IdeaTank.idea_keywords == "-")
@@ -923,6 +1374,7 @@ async def generate_keywords_for_ideas(db: Session = Depends(get_db)):
         processed_count = 0
         skipped_count = 0
         errors = []
+        keyword_updates = []
         
         for idea in target_ideas:
             try:
@@ -935,8 +1387,11 @@ async def generate_keywords_for_ideas(db: Session = Depends(get_db)):
                 keywords = extract_keywords(idea.idea_detail)
                 
                 # Update the idea with new keywords
-                idea.idea_keywords = keywords
-                idea.update_datetime = datetime.now()
+                keyword_updates.append({
+                    "idea_seq": idea.idea_seq,
+                    "idea_keywords": keywords,
+                    "update_datetime": datetime.now(),
+                })
                 
                 processed_count += 1
                 
@@ -948,7 +1403,9 @@ async def generate_keywords_for_ideas(db: Session = Depends(get_db)):
         
         # Commit all changes
         try:
+            bulk_update(db, models.IdeaTank.__table__, "idea_seq", keyword_updates)
             db.commit()
+            invalidate_idea_caches()
         except Exception as e:
             db.rollback()
             raise HTTPException(
@@ -1057,7 +1514,10 @@ def generate_user_code_endpoint(db: Session = Depends(get_db), current_user: mod
     return {"user_code": user_code}
 
 
-@router.post("/auth/register", response_model=UserOut, status_code=status.HTTP_201_CREATED, tags=["auth"])
+@router.post(
+    "/auth/register", response_model=UserOut, status_code=status.HTTP_201_CREATED, tags=["auth"],
+    dependencies=[Depends(records_write)],
+)
 def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     # Check if user_login already exists
     print('# Check if user_login already exists')
@@ -1115,11 +1575,11 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
 # User Management Routes
 @router.get("/users", response_model=list[UserOut])
 def list_users(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(require_permission("read:users"))
 ):
-    users = db.query(models.User).order_by(desc(models.User.user_createdate)).all()
-    return users
+    rows = db.execute(select(*USER_OUT_COLUMNS).order_by(desc(models.User.user_createdate))).all()
+    return Response(content=rows_to_json(USER_OUT_KEYS, rows), media_type="application/json")
 
 
 @router.get("/users/{user_code}", response_model=UserOut)
@@ -1130,38 +1590,40 @@ def get_user(user_code: str, db: Session = Depends(get_db), current_user: models
     return user
 
 
-@router.put("/users/{user_code}", response_model=UserOut)
+@router.put("/users/{user_code}", response_model=UserOut, dependencies=[Depends(records_write)])
 def update_user(
     user_code: str,
     user_data: UserUpdate,
     db: Session = Depends(get_db),
     current_user: dict = Depends(require_permission("update:users"))
 ):
-    user = db.query(models.User).filter(models.User.user_code == user_code).first()
+    # One read covers both the user itself and another user already holding the new login
+    matches = db.query(models.User.user_code, models.User.user_login).filter(
+        or_(models.User.user_code == user_code, models.User.user_login == user_data.user_login)
+    ).all()
+    user = next((match for match in matches if match.user_code == user_code), None)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Check if new user_login already exists (excluding current user)
     if user_data.user_login != user.user_login:
-        existing_user = db.query(models.User).filter(
-            models.User.user_login == user_data.user_login,
-            models.User.user_code != user_code
-        ).first()
-        if existing_user:
+        if any(match.user_code != user_code for match in matches):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already registered"
             )
     
     # Update user fields
-    user.user_fname = user_data.user_fname
-    user.user_lname = user_data.user_lname
-    user.user_login = user_data.user_login
+    values = {
+        "user_fname": user_data.user_fname,
+        "user_lname": user_data.user_lname,
+        "user_login": user_data.user_login,
+    }
     
     # Only admin can change user roles
     current_user_role = current_user.get("payload", {}).get("role", "user")
     if current_user_role == "admin" and user_data.user_role:
-        user.user_role = user_data.user_role
+        values["user_role"] = user_data.user_role
     
     # Only update password if provided and not empty
     if user_data.user_password is not None and user_data.user_password.strip() != "":
@@ -1172,19 +1634,23 @@ def update_user(
                 detail="Password cannot be empty"
             )
         
-        user.user_password = user_data.user_password  # Store plain text password
+        values["user_password"] = user_data.user_password  # Store plain text password
     
     try:
+        updated = update_returning(
+            db, models.User.__table__, models.User.user_code == user_code, values, USER_OUT_COLUMNS
+        )
         db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to update user")
     
-    db.refresh(user)
-    return user
+    if updated is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return updated
 
 
-@router.delete("/users/{user_code}")
+@router.delete("/users/{user_code}", dependencies=[Depends(records_write)])
 def delete_user(
     user_code: str,
     db: Session = Depends(get_db),
@@ -1211,7 +1677,7 @@ def delete_user(
     return {"deleted_user_code": user_code}
 
 
-@router.post("/users/create-admin")
+@router.post("/users/create-admin", dependencies=[Depends(records_write)])
 def create_admin_user(
     db: Session = Depends(get_db),
     api_key: str = None,
@@ -1255,8 +1721,8 @@ def create_admin_user(
     return {"message": "Admin user created successfully", "login": admin_login, "password": "admin123"}
 
 
-@router.post("/users/fix-admin-role")
-@router.post("/users/fix-admin-role-alt")  # Alternative endpoint in case the first one doesn't work
+@router.post("/users/fix-admin-role", dependencies=[Depends(records_write)])
+@router.post("/users/fix-admin-role-alt", dependencies=[Depends(records_write)])  # Alternative endpoint in case the first one doesn't work
 def fix_admin_role(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
@@ -1351,112 +1817,149 @@ def _validate_members(submission_type: str, members: list) -> None:
         raise HTTPException(status_code=400, detail="ประเภททีมต้องมีสมาชิก 3-5 คน")
 
 
-def _replace_members(db: Session, project_id: int, members: list) -> None:
+def _member_values(project_id: int, members: list) -> list:
+    return [
+        {
+            "ProjectId": project_id,
+            "MemberSeq": seq,
+            "EmpCode": member.EmpCode,
+            "FullNameTh": member.FullNameTh,
+            "PositionName": member.PositionName,
+            "OrgName": member.OrgName,
+            "MobileNo": member.MobileNo,
+            "IsTeamLeader": member.IsTeamLeader,
+            "IsMainContact": member.IsMainContact,
+        }
+        for seq, member in enumerate(members, start=1)
+    ]
+
+
+def _replace_members(db: Session, project_id: int, members: list) -> list:
     db.query(models.ProjectSubmissionMember).filter(
         models.ProjectSubmissionMember.ProjectId == project_id
     ).delete(synchronize_session=False)
-    for seq, member in enumerate(members, start=1):
-        db.add(
-            models.ProjectSubmissionMember(
-                ProjectId=project_id,
-                MemberSeq=seq,
-                EmpCode=member.EmpCode,
-                FullNameTh=member.FullNameTh,
-                PositionName=member.PositionName,
-                OrgName=member.OrgName,
-                MobileNo=member.MobileNo,
-                IsTeamLeader=member.IsTeamLeader,
-                IsMainContact=member.IsMainContact,
-            )
-        )
+    return insert_returning(
+        db, models.ProjectSubmissionMember.__table__, _member_values(project_id, members), SUBMISSION_MEMBER_OUT_COLUMNS
+    )
 
 
-def _get_submission_or_404(db: Session, project_id: int) -> models.ProjectSubmission:
-    submission = (
-        db.query(models.ProjectSubmission)
-        .options(joinedload(models.ProjectSubmission.members))
-        .filter(models.ProjectSubmission.ProjectId == project_id)
-        .first()
-    )
+def _get_submission_or_404(db: Session, project_id: int, with_content: bool = True) -> models.ProjectSubmission:
+    # with_content=False is for the pre-write status checks: no members join, no HTML columns
+    query = db.query(models.ProjectSubmission).filter(models.ProjectSubmission.ProjectId == project_id)
+    if with_content:
+        query = query.options(joinedload(models.ProjectSubmission.members), undefer_group("submission_html"))
+    submission = query.first()
     if not submission:
         raise HTTPException(status_code=404, detail="Project submission not found")
     return submission
 
 
-@router.post("/project-submissions", response_model=ProjectSubmissionOut, status_code=status.HTTP_201_CREATED)
+def _submission_members(db: Session, project_id: int) -> list:
+    return db.execute(
+        select(*SUBMISSION_MEMBER_OUT_COLUMNS)
+        .where(models.ProjectSubmissionMember.ProjectId == project_id)
+        .order_by(models.ProjectSubmissionMember.MemberSeq)
+    ).all()
+
+
+def _update_draft_submission(db: Session, project_id: int, values: dict):
+    """UPDATE ... OUTPUT of a submission that is still a draft; None if it is missing or already submitted."""
+    table = models.ProjectSubmission.__table__
+    return update_returning(
+        db, table, (table.c.ProjectId == project_id) & (table.c.StatusCode == "DRAFT"), values, SUBMISSION_OUT_COLUMNS
+    )
+
+
+def _draft_write_error(db: Session, project_id: int, detail: str) -> HTTPException:
+    # A draft-only write matched no row: 404 when the submission is missing, otherwise 409
+    _get_submission_or_404(db, project_id, with_content=False)
+    return HTTPException(status_code=409, detail=detail)
+
+
+@router.post(
+    "/project-submissions", response_model=ProjectSubmissionOut, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(records_write)],
+)
 def create_project_submission(payload: ProjectSubmissionStep1In, db: Session = Depends(get_db)):
     _validate_members(payload.SubmissionTypeCode, payload.Members)
 
-    new_submission = models.ProjectSubmission(
-        SubmissionTypeCode=payload.SubmissionTypeCode,
-        SubmissionTypeNameTh=SUBMISSION_TYPE_NAME_TH[payload.SubmissionTypeCode],
-        TeamName=payload.TeamName,
-        CreatedByEmpCode=payload.Members[0].EmpCode,
-    )
-    db.add(new_submission)
     try:
-        db.flush()
-        _replace_members(db, new_submission.ProjectId, payload.Members)
+        (submission,) = insert_returning(db, models.ProjectSubmission.__table__, [{
+            "SubmissionTypeCode": payload.SubmissionTypeCode,
+            "SubmissionTypeNameTh": SUBMISSION_TYPE_NAME_TH[payload.SubmissionTypeCode],
+            "TeamName": payload.TeamName,
+            "CreatedByEmpCode": payload.Members[0].EmpCode,
+        }], SUBMISSION_OUT_COLUMNS)
+        members = insert_returning(
+            db,
+            models.ProjectSubmissionMember.__table__,
+            _member_values(submission.ProjectId, payload.Members),
+            SUBMISSION_MEMBER_OUT_COLUMNS,
+        )
         db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to create project submission")
 
-    return _get_submission_or_404(db, new_submission.ProjectId)
+    return submission_response(submission, members)
 
 
-@router.put("/project-submissions/{project_id}/step1", response_model=ProjectSubmissionOut)
+@router.put(
+    "/project-submissions/{project_id}/step1", response_model=ProjectSubmissionOut,
+    dependencies=[Depends(records_write)],
+)
 def update_project_submission_step1(project_id: int, payload: ProjectSubmissionStep1In, db: Session = Depends(get_db)):
     _validate_members(payload.SubmissionTypeCode, payload.Members)
-    submission = _get_submission_or_404(db, project_id)
-    if submission.StatusCode != "DRAFT":
-        raise HTTPException(status_code=409, detail="ไม่สามารถแก้ไขผลงานที่ส่งแล้วได้")
-
-    submission.SubmissionTypeCode = payload.SubmissionTypeCode
-    submission.SubmissionTypeNameTh = SUBMISSION_TYPE_NAME_TH[payload.SubmissionTypeCode]
-    submission.TeamName = payload.TeamName
-    submission.CreatedByEmpCode = payload.Members[0].EmpCode
-    submission.UpdatedAt = datetime.now()
 
     try:
-        _replace_members(db, project_id, payload.Members)
-        db.commit()
+        submission = _update_draft_submission(db, project_id, {
+            "SubmissionTypeCode": payload.SubmissionTypeCode,
+            "SubmissionTypeNameTh": SUBMISSION_TYPE_NAME_TH[payload.SubmissionTypeCode],
+            "TeamName": payload.TeamName,
+            "CreatedByEmpCode": payload.Members[0].EmpCode,
+            "UpdatedAt": datetime.now(),
+        })
+        if submission is not None:
+            members = _replace_members(db, project_id, payload.Members)
+            db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to update project submission")
 
-    return _get_submission_or_404(db, project_id)
+    if submission is None:
+        raise _draft_write_error(db, project_id, "ไม่สามารถแก้ไขผลงานที่ส่งแล้วได้")
+    return submission_response(submission, members)
 
 
-def _apply_step2_fields(submission: models.ProjectSubmission, payload: ProjectSubmissionStep2In) -> None:
-    for field, value in payload.model_dump().items():
-        setattr(submission, field, value)
+def _step2_values(payload: ProjectSubmissionStep2In) -> dict:
+    values = payload.model_dump()
+    values.update(plain_text_values(values, models.PROJECT_SUBMISSION_PLAIN_TEXT_COLUMNS))
+    return values
 
 
-@router.put("/project-submissions/{project_id}/step2", response_model=ProjectSubmissionOut)
+@router.put(
+    "/project-submissions/{project_id}/step2", response_model=ProjectSubmissionOut,
+    dependencies=[Depends(records_write)],
+)
 def save_project_submission_step2(project_id: int, payload: ProjectSubmissionStep2In, db: Session = Depends(get_db)):
-    submission = _get_submission_or_404(db, project_id)
-    if submission.StatusCode != "DRAFT":
-        raise HTTPException(status_code=409, detail="ไม่สามารถแก้ไขผลงานที่ส่งแล้วได้")
-
-    _apply_step2_fields(submission, payload)
-    submission.UpdatedAt = datetime.now()
+    values = _step2_values(payload)
+    values["UpdatedAt"] = datetime.now()
 
     try:
-        db.commit()
+        submission = _update_draft_submission(db, project_id, values)
+        if submission is not None:
+            members = _submission_members(db, project_id)
+            db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to save project submission draft")
 
-    return _get_submission_or_404(db, project_id)
-
+    if submission is None:
+        raise _draft_write_error(db, project_id, "ไม่สามารถแก้ไขผลงานที่ส่งแล้วได้")
+    return submission_response(submission, members)
 
-@router.post("/project-submissions/{project_id}/submit", response_model=ProjectSubmissionOut)
-def submit_project_submission(project_id: int, payload: ProjectSubmissionStep2In, db: Session = Depends(get_db)):
-    submission = _get_submission_or_404(db, project_id)
-    if submission.StatusCode != "DRAFT":
-        raise HTTPException(status_code=409, detail="ผลงานนี้ถูกส่งไปแล้ว")
 
+def _validate_submission_payload(payload: ProjectSubmissionStep2In) -> None:
     if not payload.ChallengeNo:
         raise HTTPException(status_code=400, detail="กรุณาเลือกโจทย์นวัตกรรม")
     if not payload.InnovationTypeNo:
@@ -1476,170 +1979,127 @@ def submit_project_submission(project_id: int, payload: ProjectSubmissionStep2In
     if not payload.ExpectedBenefitHtml or not payload.ExpectedBenefitHtml.strip():
         raise HTTPException(status_code=400, detail="กรุณาระบุประโยชน์ที่คาดว่าจะได้รับ")
 
-    _apply_step2_fields(submission, payload)
-    submission.StatusCode = "SUBMITTED"
-    submission.SubmittedAt = datetime.now()
-    submission.UpdatedAt = datetime.now()
 
+@router.post(
+    "/project-submissions/{project_id}/submit", response_model=ProjectSubmissionOut,
+    dependencies=[Depends(records_write)],
+)
+def submit_project_submission(project_id: int, payload: ProjectSubmissionStep2In, db: Session = Depends(get_db)):
     try:
-        db.commit()
+        _validate_submission_payload(payload)
+    except HTTPException:
+        # A missing or already submitted project is reported ahead of problems in the payload
+        submission = _get_submission_or_404(db, project_id, with_content=False)
+        if submission.StatusCode != "DRAFT":
+            raise HTTPException(status_code=409, detail="ผลงานนี้ถูกส่งไปแล้ว")
+        raise
+
+    values = _step2_values(payload)
+    values.update(StatusCode="SUBMITTED", SubmittedAt=datetime.now(), UpdatedAt=datetime.now())
+
+    try:
+        submission = _update_draft_submission(db, project_id, values)
+        if submission is not None:
+            members = _submission_members(db, project_id)
+            db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to submit project submission")
 
-    return _get_submission_or_404(db, project_id)
+    if submission is None:
+        raise _draft_write_error(db, project_id, "ผลงานนี้ถูกส่งไปแล้ว")
+    return submission_response(submission, members)
 
 
-PROJECT_SUBMISSION_EXPORT_COLUMNS_TH = {
-    "ProjectId": "รหัสโครงการ",
-    "EventYear": "ปีของโครงการ",
-    "SubmissionTypeCode": "รหัสประเภทการส่งประกวด",
-    "SubmissionTypeNameTh": "ประเภทการส่งประกวด",
-    "TeamName": "ชื่อทีม / ชื่อผลงาน",
-
-    "ChallengeNo": "ลำดับโจทย์นวัตกรรม",
-    "ChallengeText": "โจทย์นวัตกรรมที่เลือก",
-
-    "IdeaSourceCoPs": "แหล่งที่มา: ชุมชนนักปฏิบัติ (CoPs)",
-    "IdeaSourceCoPsDetail": "รายละเอียด: ชุมชนนักปฏิบัติ (CoPs)",
-    "IdeaSourceLR": "แหล่งที่มา: คลังความรู้ (LR)",
-    "IdeaSourceLRDetail": "รายละเอียด: คลังความรู้ (LR)",
-    "IdeaSourceResearch": "แหล่งที่มา: ผลงานวิจัย",
-    "IdeaSourceResearchDetail": "รายละเอียด: ผลงานวิจัย",
-    "IdeaSourceExperience": "แหล่งที่มา: ประสบการณ์",
-    "IdeaSourceExperienceDetail": "รายละเอียด: ประสบการณ์",
-    "IdeaSourceStudyVisit": "แหล่งที่มา: ศึกษาดูงาน",
-    "IdeaSourceStudyVisitDetail": "รายละเอียด: ศึกษาดูงาน",
-    "IdeaSourceKnowledgeExchange": "แหล่งที่มา: การแลกเปลี่ยนเรียนรู้",
-    "IdeaSourceKnowledgeExchangeDetail": "รายละเอียด: การแลกเปลี่ยนเรียนรู้",
-    "IdeaSourceInnovationDatabase": "แหล่งที่มา: ฐานข้อมูลนวัตกรรม",
-    "IdeaSourceInnovationDatabaseDetail": "รายละเอียด: ฐานข้อมูลนวัตกรรม",
-    "IdeaSourceMarketStudy": "แหล่งที่มา: ผลการศึกษาความต้องการของตลาด",
-    "IdeaSourceMarketStudyDetail": "รายละเอียด: ผลการศึกษาความต้องการของตลาด",
-    "IdeaSourceVOS": "แหล่งที่มา: Voice of Stakeholder (VOS)",
-    "IdeaSourceVOSDetail": "รายละเอียด: Voice of Stakeholder (VOS)",
-    "IdeaSourceOther": "แหล่งที่มา: อื่นๆ",
-    "IdeaSourceOtherDetail": "รายละเอียด: อื่นๆ",
-
-    "TargetCustomerHtml": "กลุ่มลูกค้าเป้าหมาย",
-
-    "InnovationTypeNo": "ลำดับประเภทนวัตกรรม",
-    "InnovationTypeText": "ประเภทนวัตกรรม",
-
-    "IdeaConceptHtml": "แนวคิดนวัตกรรมโดยสังเขป",
-    "ExpectedBenefitHtml": "ประโยชน์ที่คาดว่าจะได้รับ",
-
-    "GenCapProjectManagement": "ทักษะทั่วไป: การบริหารโครงการ",
-    "GenCapCommunications": "ทักษะทั่วไป: การสื่อสาร",
-    "GenCapMarketing": "ทักษะทั่วไป: การตลาด",
-    "GenCapFinancialBusinessAnalysis": "ทักษะทั่วไป: การวิเคราะห์การเงินและธุรกิจ",
-    "GenCapCustomerManagement": "ทักษะทั่วไป: การดูแลลูกค้า",
-    "GenCapStakeholderPartnership": "ทักษะทั่วไป: การดูแลผู้มีส่วนได้เสียและพันธมิตร",
-    "GenCapOther": "ทักษะทั่วไป: อื่นๆ",
-    "GenCapOtherDetail": "รายละเอียดทักษะทั่วไปอื่นๆ",
-
-    "DigitalCapProductDevelopment": "ทักษะดิจิทัล: การพัฒนาผลิตภัณฑ์",
-    "DigitalCapCodingProgramming": "ทักษะดิจิทัล: การเขียนโค้ด/โปรแกรม",
-    "DigitalCapDataAnalysis": "ทักษะดิจิทัล: การวิเคราะห์ข้อมูล",
-    "DigitalCapUiUxGraphicDesign": "ทักษะดิจิทัล: UI/UX & Graphic Design",
-    "DigitalCapSoftwareTooling": "ทักษะดิจิทัล: การพัฒนาซอฟต์แวร์และเครื่องมือ",
-    "DigitalCapOther": "ทักษะดิจิทัล: อื่นๆ",
-    "DigitalCapOtherDetail": "รายละเอียดทักษะดิจิทัลอื่นๆ",
-
-    "HackathonMotivationHtml": "แรงจูงใจในการเข้าร่วมโครงการ",
-
-    "StatusCode": "สถานะ",
-    "SubmittedAt": "วันที่ส่งผลงาน",
-    "CreatedByEmpCode": "ผู้สร้างรายการ (รหัสพนักงาน)",
-    "CreatedAt": "วันที่สร้างรายการ",
-    "UpdatedByEmpCode": "ผู้แก้ไขล่าสุด (รหัสพนักงาน)",
-    "UpdatedAt": "วันที่แก้ไขล่าสุด",
-}
-
-for _seq in range(1, 6):
-    PROJECT_SUBMISSION_EXPORT_COLUMNS_TH[f"Member{_seq}EmpCode"] = f"สมาชิกคนที่ {_seq}: รหัสพนักงาน"
-    PROJECT_SUBMISSION_EXPORT_COLUMNS_TH[f"Member{_seq}FullNameTh"] = f"สมาชิกคนที่ {_seq}: ชื่อ-นามสกุล"
-    PROJECT_SUBMISSION_EXPORT_COLUMNS_TH[f"Member{_seq}PositionName"] = f"สมาชิกคนที่ {_seq}: ตำแหน่งงาน"
-    PROJECT_SUBMISSION_EXPORT_COLUMNS_TH[f"Member{_seq}OrgName"] = f"สมาชิกคนที่ {_seq}: สังกัด/ฝ่าย"
-    PROJECT_SUBMISSION_EXPORT_COLUMNS_TH[f"Member{_seq}MobileNo"] = f"สมาชิกคนที่ {_seq}: เบอร์ติดต่อ"
-
-PROJECT_SUBMISSION_EXPORT_BIT_COLUMNS = [
-    "IdeaSourceCoPs", "IdeaSourceLR", "IdeaSourceResearch", "IdeaSourceExperience",
-    "IdeaSourceStudyVisit", "IdeaSourceKnowledgeExchange", "IdeaSourceInnovationDatabase",
-    "IdeaSourceMarketStudy", "IdeaSourceVOS", "IdeaSourceOther",
-    "GenCapProjectManagement", "GenCapCommunications", "GenCapMarketing",
-    "GenCapFinancialBusinessAnalysis", "GenCapCustomerManagement", "GenCapStakeholderPartnership",
-    "GenCapOther",
-    "DigitalCapProductDevelopment", "DigitalCapCodingProgramming", "DigitalCapDataAnalysis",
-    "DigitalCapUiUxGraphicDesign", "DigitalCapSoftwareTooling", "DigitalCapOther",
-]
-
-PROJECT_SUBMISSION_EXPORT_HTML_COLUMNS = [
-    "TargetCustomerHtml", "IdeaConceptHtml", "ExpectedBenefitHtml", "HackathonMotivationHtml",
-]
+def _check_export_format(export_format: str) -> None:
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+        )
 
-PROJECT_SUBMISSION_EXPORT_SUBMISSION_TYPE_TH = {"INDIVIDUAL": "บุคคล", "TEAM": "ทีม"}
-PROJECT_SUBMISSION_EXPORT_STATUS_TH = {
-    "DRAFT": "ร่าง", "SUBMITTED": "ส่งแล้ว", "CANCELLED": "ยกเลิก",
-    "APPROVED": "ผ่าน", "REJECTED": "ไม่ผ่าน",
-}
 
+def _export_response(
+    request: Request,
+    export_format: str,
+    chunks,
+    basename: str,
+    cache_status: Optional[str] = None,
+) -> StreamingResponse:
+    """Stream rendered export bytes; csv/ndjson are gzipped when the client accepts it."""
+    headers = {"Content-Disposition": f"attachment; filename={basename}.{export_format}"}
+    if cache_status:
+        headers["X-Export-Cache"] = cache_status
+    # xlsx is already a deflated zip, so only the text formats are worth compressing
+    if export_format != "xlsx" and "gzip" in request.headers.get("accept-encoding", ""):
+        chunks = iter_gzip(chunks)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return StreamingResponse(chunks, media_type=EXPORT_MEDIA_TYPES[export_format], headers=headers)
+
+
+def _submission_export_watermark(db: Session, model) -> list:
+    # Any save, submit, status change or delete moves one of these; member edits always
+    # go with an UpdatedAt bump on the submission
+    row_count, max_updated_at, max_submitted_at = db.query(
+        func.count(model.ProjectId), func.max(model.UpdatedAt), func.max(model.SubmittedAt)
+    ).one()
+    return [row_count, max_updated_at, max_submitted_at]
+
+
+def _project_submission_export(
+    request: Request,
+    db: Session,
+    model,
+    export_name: str,
+    filters: dict,
+    export_format: str,
+) -> StreamingResponse:
+    _check_export_format(export_format)
+    basename = f"{export_name.replace('-', '_')}_export"
+    watermark = _submission_export_watermark(db, model)
+    cache_key = export_artifact_cache.make_key(
+        f"{export_name}/export", {**filters, "format": export_format}, watermark
+    )
+    cached_path = export_artifact_cache.get(cache_key, export_format)
+    if cached_path:
+        return _export_response(request, export_format, export_artifact_cache.read(cached_path), basename, "hit")
+
+    # The table's row count bounds the export, so the filtered count is only run when it could
+    # reach the threshold
+    if (
+        watermark[0] >= EXPORT_OFFLOAD_MIN_ROWS
+        and count_submission_export(db, export_name, filters) >= EXPORT_OFFLOAD_MIN_ROWS
+    ):
+        # Rendered in the CPU task pool; its output file streams to the client while it is
+        # written, so a timeout there ends the download early instead of returning 503
+        chunks = export_artifact_cache.render_streaming(
+            cache_key, export_format,
+            lambda part_path: cpu_task_pool.run(
+                render_submission_export, export_name, export_format, filters, part_path
+            ),
+        )
+        return _export_response(request, export_format, chunks, basename, "miss")
 
-def _strip_html_to_text(value):
-    if value is None or (isinstance(value, float) and pd.isna(value)):
-        return None
-    text_value = re.sub(r"<[^>]+>", " ", str(value))
-    text_value = re.sub(r"\s+", " ", text_value).strip()
-    return text_value or None
+    chunks = iter_submission_export(db, export_name, export_format, filters)
+    chunks = export_artifact_cache.store(cache_key, export_format, chunks)
+    return _export_response(request, export_format, chunks, basename, "miss")
 
 
 @router.get("/project-submissions/export")
 def export_project_submissions(
+    request: Request,
     team_name: Optional[str] = None,
     innovation_type_no: Optional[int] = None,
     challenge_no: Optional[int] = None,
-    db: Session = Depends(get_db),
+    export_format: str = Query("xlsx", alias="format"),
+    db: Session = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    sql = "SELECT * FROM dbo.vProjectSubmissionExport WHERE StatusCode = 'SUBMITTED'"
-    params: dict = {}
-    if team_name:
-        sql += " AND TeamName LIKE :team_name"
-        params["team_name"] = f"%{team_name}%"
-    if innovation_type_no is not None:
-        sql += " AND InnovationTypeNo = :innovation_type_no"
-        params["innovation_type_no"] = innovation_type_no
-    if challenge_no is not None:
-        sql += " AND ChallengeNo = :challenge_no"
-        params["challenge_no"] = challenge_no
-    sql += " ORDER BY ProjectId DESC"
-
-    df = pd.read_sql(text(sql), db.bind, params=params)
-
-    for col in PROJECT_SUBMISSION_EXPORT_BIT_COLUMNS:
-        if col in df.columns:
-            df[col] = df[col].apply(lambda v: "ใช่" if bool(v) else "ไม่ใช่")
-
-    for col in PROJECT_SUBMISSION_EXPORT_HTML_COLUMNS:
-        if col in df.columns:
-            df[col] = df[col].apply(_strip_html_to_text)
-
-    if "SubmissionTypeCode" in df.columns:
-        df["SubmissionTypeCode"] = df["SubmissionTypeCode"].map(PROJECT_SUBMISSION_EXPORT_SUBMISSION_TYPE_TH).fillna(df["SubmissionTypeCode"])
-    if "StatusCode" in df.columns:
-        df["StatusCode"] = df["StatusCode"].map(PROJECT_SUBMISSION_EXPORT_STATUS_TH).fillna(df["StatusCode"])
-
-    df = df.rename(columns=PROJECT_SUBMISSION_EXPORT_COLUMNS_TH)
-
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="ผลงานที่ส่งเข้าประกวด")
-    buffer.seek(0)
-
-    return StreamingResponse(
-        buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=project_submissions_export.xlsx"},
+    """Export submitted projects as xlsx (default), csv or ndjson (keyed by column name)"""
+    filters = {"team_name": team_name, "innovation_type_no": innovation_type_no, "challenge_no": challenge_no}
+    return _project_submission_export(
+        request, db, models.ProjectSubmission, "project-submissions", filters, export_format
     )
 
 
@@ -1650,7 +2110,7 @@ def list_project_submissions(
     team_name: Optional[str] = None,
     innovation_type_no: Optional[int] = None,
     challenge_no: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
     query = db.query(models.ProjectSubmission).filter(models.ProjectSubmission.StatusCode == "SUBMITTED")
@@ -1678,121 +2138,144 @@ def get_project_submission(project_id: int, db: Session = Depends(get_db)):
 
 # Project Submission New (IDEA Tank 2026 - new form) API Routes
 
-def _get_submission_new_or_404(db: Session, project_id: int) -> models.ProjectSubmissionNew:
-    submission = (
-        db.query(models.ProjectSubmissionNew)
-        .options(joinedload(models.ProjectSubmissionNew.members))
-        .filter(models.ProjectSubmissionNew.ProjectId == project_id)
-        .first()
-    )
+def _get_submission_new_or_404(db: Session, project_id: int, with_content: bool = True) -> models.ProjectSubmissionNew:
+    # with_content=False is for the pre-write status checks: no members join, no HTML columns
+    query = db.query(models.ProjectSubmissionNew).filter(models.ProjectSubmissionNew.ProjectId == project_id)
+    if with_content:
+        query = query.options(joinedload(models.ProjectSubmissionNew.members), undefer_group("submission_html"))
+    submission = query.first()
     if not submission:
         raise HTTPException(status_code=404, detail="Project submission not found")
     return submission
 
 
-def _replace_members_new(db: Session, project_id: int, members: list) -> None:
+def _replace_members_new(db: Session, project_id: int, members: list) -> list:
     db.query(models.ProjectSubmissionNewMember).filter(
         models.ProjectSubmissionNewMember.ProjectId == project_id
     ).delete(synchronize_session=False)
-    for seq, member in enumerate(members, start=1):
-        db.add(
-            models.ProjectSubmissionNewMember(
-                ProjectId=project_id,
-                MemberSeq=seq,
-                EmpCode=member.EmpCode,
-                FullNameTh=member.FullNameTh,
-                PositionName=member.PositionName,
-                OrgName=member.OrgName,
-                MobileNo=member.MobileNo,
-                IsTeamLeader=member.IsTeamLeader,
-                IsMainContact=member.IsMainContact,
-            )
-        )
+    return insert_returning(
+        db, models.ProjectSubmissionNewMember.__table__, _member_values(project_id, members),
+        SUBMISSION_NEW_MEMBER_OUT_COLUMNS,
+    )
+
+
+def _submission_new_members(db: Session, project_id: int) -> list:
+    return db.execute(
+        select(*SUBMISSION_NEW_MEMBER_OUT_COLUMNS)
+        .where(models.ProjectSubmissionNewMember.ProjectId == project_id)
+        .order_by(models.ProjectSubmissionNewMember.MemberSeq)
+    ).all()
 
 
-@router.post("/project-submissions-new", response_model=ProjectSubmissionNewOut, status_code=status.HTTP_201_CREATED)
+def _update_draft_submission_new(db: Session, project_id: int, values: dict):
+    """UPDATE ... OUTPUT of a new-form submission that is still a draft; None if missing or submitted."""
+    table = models.ProjectSubmissionNew.__table__
+    return update_returning(
+        db, table, (table.c.ProjectId == project_id) & (table.c.StatusCode == "DRAFT"), values,
+        SUBMISSION_NEW_OUT_COLUMNS,
+    )
+
+
+def _draft_write_error_new(db: Session, project_id: int, detail: str) -> HTTPException:
+    _get_submission_new_or_404(db, project_id, with_content=False)
+    return HTTPException(status_code=409, detail=detail)
+
+
+@router.post(
+    "/project-submissions-new", response_model=ProjectSubmissionNewOut, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(records_write)],
+)
 def create_project_submission_new(payload: ProjectSubmissionNewStep1In, db: Session = Depends(get_db)):
     _validate_members(payload.SubmissionTypeCode, payload.Members)
     if payload.SubmissionTypeCode == "TEAM" and not (payload.TeamName and payload.TeamName.strip()):
         raise HTTPException(status_code=400, detail="กรุณากรอกชื่อทีม")
 
-    new_submission = models.ProjectSubmissionNew(
-        SubmissionTypeCode=payload.SubmissionTypeCode,
-        SubmissionTypeNameTh=SUBMISSION_TYPE_NAME_TH[payload.SubmissionTypeCode],
-        TeamName=payload.TeamName if payload.SubmissionTypeCode == "TEAM" else None,
-        CreativeIdeaName=payload.CreativeIdeaName,
-        CreatedByEmpCode=payload.Members[0].EmpCode,
-    )
-    db.add(new_submission)
     try:
-        db.flush()
-        _replace_members_new(db, new_submission.ProjectId, payload.Members)
+        (submission,) = insert_returning(db, models.ProjectSubmissionNew.__table__, [{
+            "SubmissionTypeCode": payload.SubmissionTypeCode,
+            "SubmissionTypeNameTh": SUBMISSION_TYPE_NAME_TH[payload.SubmissionTypeCode],
+            "TeamName": payload.TeamName if payload.SubmissionTypeCode == "TEAM" else None,
+            "CreativeIdeaName": payload.CreativeIdeaName,
+            "CreatedByEmpCode": payload.Members[0].EmpCode,
+        }], SUBMISSION_NEW_OUT_COLUMNS)
+        members = insert_returning(
+            db,
+            models.ProjectSubmissionNewMember.__table__,
+            _member_values(submission.ProjectId, payload.Members),
+            SUBMISSION_NEW_MEMBER_OUT_COLUMNS,
+        )
         db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to create project submission")
 
-    return _get_submission_new_or_404(db, new_submission.ProjectId)
+    return submission_response(submission, members)
 
 
-@router.put("/project-submissions-new/{project_id}/step1", response_model=ProjectSubmissionNewOut)
+@router.put(
+    "/project-submissions-new/{project_id}/step1", response_model=ProjectSubmissionNewOut,
+    dependencies=[Depends(records_write)],
+)
 def update_project_submission_new_step1(project_id: int, payload: ProjectSubmissionNewStep1In, db: Session = Depends(get_db)):
     _validate_members(payload.SubmissionTypeCode, payload.Members)
     if payload.SubmissionTypeCode == "TEAM" and not (payload.TeamName and payload.TeamName.strip()):
         raise HTTPException(status_code=400, detail="กรุณากรอกชื่อทีม")
 
-    submission = _get_submission_new_or_404(db, project_id)
-    if submission.StatusCode != "DRAFT":
-        raise HTTPException(status_code=409, detail="ไม่สามารถแก้ไขผลงานที่ส่งแล้วได้")
-
-    submission.SubmissionTypeCode = payload.SubmissionTypeCode
-    submission.SubmissionTypeNameTh = SUBMISSION_TYPE_NAME_TH[payload.SubmissionTypeCode]
-    submission.TeamName = payload.TeamName if payload.SubmissionTypeCode == "TEAM" else None
-    submission.CreativeIdeaName = payload.CreativeIdeaName
-    submission.CreatedByEmpCode = payload.Members[0].EmpCode
-    submission.UpdatedAt = datetime.now()
-
     try:
-        _replace_members_new(db, project_id, payload.Members)
-        db.commit()
+        submission = _update_draft_submission_new(db, project_id, {
+            "SubmissionTypeCode": payload.SubmissionTypeCode,
+            "SubmissionTypeNameTh": SUBMISSION_TYPE_NAME_TH[payload.SubmissionTypeCode],
+            "TeamName": payload.TeamName if payload.SubmissionTypeCode == "TEAM" else None,
+            "CreativeIdeaName": payload.CreativeIdeaName,
+            "CreatedByEmpCode": payload.Members[0].EmpCode,
+            "UpdatedAt": datetime.now(),
+        })
+        if submission is not None:
+            members = _replace_members_new(db, project_id, payload.Members)
+            db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to update project submission")
 
-    return _get_submission_new_or_404(db, project_id)
+    if submission is None:
+        raise _draft_write_error_new(db, project_id, "ไม่สามารถแก้ไขผลงานที่ส่งแล้วได้")
+    return submission_response(submission, members)
 
 
-def _apply_step2_fields_new(submission: models.ProjectSubmissionNew, payload: ProjectSubmissionNewStep2In) -> None:
-    for field, value in payload.model_dump().items():
-        setattr(submission, field, value)
+def _step2_values_new(payload: ProjectSubmissionNewStep2In) -> dict:
+    values = payload.model_dump()
+    values.update(plain_text_values(values, models.PROJECT_SUBMISSION_NEW_PLAIN_TEXT_COLUMNS))
+    return values
 
 
-@router.put("/project-submissions-new/{project_id}/step2", response_model=ProjectSubmissionNewOut)
+@router.put(
+    "/project-submissions-new/{project_id}/step2", response_model=ProjectSubmissionNewOut,
+    dependencies=[Depends(records_write)],
+)
 def save_project_submission_new_step2(project_id: int, payload: ProjectSubmissionNewStep2In, db: Session = Depends(get_db)):
-    submission = _get_submission_new_or_404(db, project_id)
-    if submission.StatusCode != "DRAFT":
-        raise HTTPException(status_code=409, detail="ไม่สามารถแก้ไขผลงานที่ส่งแล้วได้")
-
-    _apply_step2_fields_new(submission, payload)
-    submission.UpdatedAt = datetime.now()
+    values = _step2_values_new(payload)
+    values["UpdatedAt"] = datetime.now()
 
     try:
-        db.commit()
+        submission = _update_draft_submission_new(db, project_id, values)
+        if submission is not None:
+            members = _submission_new_members(db, project_id)
+            db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to save project submission draft")
 
-    return _get_submission_new_or_404(db, project_id)
+    if submission is None:
+        raise _draft_write_error_new(db, project_id, "ไม่สามารถแก้ไขผลงานที่ส่งแล้วได้")
+    return submission_response(submission, members)
 
 
-@router.post("/project-submissions-new/{project_id}/submit", response_model=ProjectSubmissionNewOut)
-def submit_project_submission_new(project_id: int, payload: ProjectSubmissionNewStep2In, db: Session = Depends(get_db)):
-    submission = _get_submission_new_or_404(db, project_id)
-    if submission.StatusCode != "DRAFT":
-        raise HTTPException(status_code=409, detail="ผลงานนี้ถูกส่งไปแล้ว")
-
-    if not submission.CreativeIdeaName or not submission.CreativeIdeaName.strip():
+def _validate_creative_idea_name(creative_idea_name: Optional[str]) -> None:
+    if not creative_idea_name or not creative_idea_name.strip():
         raise HTTPException(status_code=400, detail="กรุณาระบุชื่อความคิดสร้างสรรค์")
+
+
+def _validate_submission_new_payload(payload: ProjectSubmissionNewStep2In) -> None:
     if not payload.ChallengeNo:
         raise HTTPException(status_code=400, detail="กรุณาเลือกโจทย์นวัตกรรมที่ท่านต้องการแก้ปัญหา")
     if not payload.ChallengeCategoryNo:
@@ -1833,196 +2316,57 @@ def submit_project_submission_new(project_id: int, payload: ProjectSubmissionNew
     ):
         raise HTTPException(status_code=400, detail="กรุณาเลือกมูลค่านวัตกรรมที่ไม่ใช่การเงินอย่างน้อย 1 ข้อ")
 
-    _apply_step2_fields_new(submission, payload)
-    submission.StatusCode = "SUBMITTED"
-    submission.SubmittedAt = datetime.now()
-    submission.UpdatedAt = datetime.now()
 
+@router.post(
+    "/project-submissions-new/{project_id}/submit", response_model=ProjectSubmissionNewOut,
+    dependencies=[Depends(records_write)],
+)
+def submit_project_submission_new(project_id: int, payload: ProjectSubmissionNewStep2In, db: Session = Depends(get_db)):
     try:
-        db.commit()
+        _validate_submission_new_payload(payload)
+    except HTTPException:
+        # Same order as before the payload checks: missing, already submitted, no idea name
+        submission = _get_submission_new_or_404(db, project_id, with_content=False)
+        if submission.StatusCode != "DRAFT":
+            raise HTTPException(status_code=409, detail="ผลงานนี้ถูกส่งไปแล้ว")
+        _validate_creative_idea_name(submission.CreativeIdeaName)
+        raise
+
+    values = _step2_values_new(payload)
+    values.update(StatusCode="SUBMITTED", SubmittedAt=datetime.now(), UpdatedAt=datetime.now())
+
+    try:
+        submission = _update_draft_submission_new(db, project_id, values)
+        # The idea name is saved by step 1, so it is checked on the row the update returns
+        if submission is not None and (submission.CreativeIdeaName or "").strip():
+            members = _submission_new_members(db, project_id)
+            db.commit()
+        else:
+            db.rollback()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to submit project submission")
 
-    return _get_submission_new_or_404(db, project_id)
-
-
-PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH = {
-    "ProjectId": "รหัสโครงการ",
-    "EventYear": "ปีของโครงการ",
-    "SubmissionTypeCode": "รหัสประเภทการส่งประกวด",
-    "SubmissionTypeNameTh": "ประเภทการส่งประกวด",
-    "TeamName": "ชื่อทีม",
-    "CreativeIdeaName": "ชื่อความคิดสร้างสรรค์",
-
-    "ChallengeNo": "ลำดับโจทย์นวัตกรรม",
-    "ChallengeText": "โจทย์นวัตกรรมที่เลือก",
-
-    "ChallengeCategoryNo": "ลำดับประเภทของโจทย์นวัตกรรม",
-    "ChallengeCategoryText": "ประเภทของโจทย์นวัตกรรม",
-
-    "StrategicObjectiveSO1": "SO1: บริหารจัดการสินทรัพย์เพื่อสร้างรายได้ให้สมดุล",
-    "StrategicObjectiveSO2": "SO2: บริหารจัดการคุณภาพสินเชื่อเพื่อความแข็งแกร่งทางการเงิน",
-    "StrategicObjectiveSO3": "SO3: เพิ่มขีดความสามารถลูกค้าและชุมชนผ่านแกนกลางการเกษตร",
-    "StrategicObjectiveSO4": "SO4: เพิ่มขีดความสามารถองค์กรด้วยเทคโนโลยีดิจิทัลและนวัตกรรม",
-    "StrategicObjectiveSO5": "SO5: เพิ่มศักยภาพบุคลากรและ GRC รองรับการเติบโตทางธุรกิจ",
-    "StrategicObjectiveSO6": "SO6: บริหารจัดการองค์กรและชุมชนเพื่อมุ่งสู่ Net Zero Emissions",
-
-    "IdeaSourceCoPs": "แหล่งที่มา: ชุมชนนักปฏิบัติ (CoPs)",
-    "IdeaSourceCoPsDetail": "รายละเอียด: ชุมชนนักปฏิบัติ (CoPs)",
-    "IdeaSourceLR": "แหล่งที่มา: คลังความรู้ (LR)",
-    "IdeaSourceLRDetail": "รายละเอียด: คลังความรู้ (LR)",
-    "IdeaSourceResearch": "แหล่งที่มา: ผลงานวิจัย",
-    "IdeaSourceResearchDetail": "รายละเอียด: ผลงานวิจัย",
-    "IdeaSourceExperience": "แหล่งที่มา: ประสบการณ์",
-    "IdeaSourceExperienceDetail": "รายละเอียด: ประสบการณ์",
-    "IdeaSourceStudyVisit": "แหล่งที่มา: ศึกษาดูงาน",
-    "IdeaSourceStudyVisitDetail": "รายละเอียด: ศึกษาดูงาน",
-    "IdeaSourceKnowledgeExchange": "แหล่งที่มา: การแลกเปลี่ยนเรียนรู้",
-    "IdeaSourceKnowledgeExchangeDetail": "รายละเอียด: การแลกเปลี่ยนเรียนรู้",
-    "IdeaSourceInnovationDatabase": "แหล่งที่มา: ฐานข้อมูลนวัตกรรม",
-    "IdeaSourceInnovationDatabaseDetail": "รายละเอียด: ฐานข้อมูลนวัตกรรม",
-    "IdeaSourceMarketStudy": "แหล่งที่มา: ผลการศึกษาความต้องการของตลาด",
-    "IdeaSourceMarketStudyDetail": "รายละเอียด: ผลการศึกษาความต้องการของตลาด",
-    "IdeaSourceVOS": "แหล่งที่มา: Voice of Stakeholder (VOS)",
-    "IdeaSourceVOSDetail": "รายละเอียด: Voice of Stakeholder (VOS)",
-    "IdeaSourceOther": "แหล่งที่มา: อื่นๆ",
-    "IdeaSourceOtherDetail": "รายละเอียด: อื่นๆ",
-
-    "TargetCustomerTypeNo": "ลำดับลูกค้ากลุ่มเป้าหมาย",
-    "TargetCustomerTypeText": "ลูกค้ากลุ่มเป้าหมาย",
-    "TargetCustomerProblemHtml": "รายละเอียดลูกค้ากลุ่มเป้าหมายและประเด็นปัญหา",
-
-    "InnovationTypeNo": "ลำดับประเภทนวัตกรรม",
-    "InnovationTypeText": "ประเภทนวัตกรรม",
-
-    "IdeaConceptHtml": "แนวคิดนวัตกรรมโดยสังเขป",
-
-    "DigitalInnovationNo": "ลำดับผลงานนวัตกรรมเทคโนโลยีดิจิทัล",
-    "DigitalInnovationText": "ผลงานนวัตกรรมเทคโนโลยีดิจิทัล",
-
-    "NoveltyLevelNo": "ลำดับระดับความใหม่",
-    "NoveltyLevelText": "ระดับความใหม่ของความคิดสร้างสรรค์",
-
-    "InnovationValueFinancial": "มูลค่านวัตกรรม: ด้านการเงิน",
-    "FinancialValueRevenue": "ด้านการเงิน: สร้างรายได้",
-    "FinancialValueCostSaving": "ด้านการเงิน: ลดค่าใช้จ่าย",
-    "FinancialValueDetailHtml": "รายละเอียดเพิ่มเติมด้านการเงิน",
-
-    "InnovationValueNonFinancial": "มูลค่านวัตกรรม: ไม่ใช่การเงิน",
-    "NonFinancialValueCustomerSatisfaction": "ไม่ใช่การเงิน: ความพึงพอใจ",
-    "NonFinancialValueWorkEfficiency": "ไม่ใช่การเงิน: ลดขั้นตอนการทำงาน/เพิ่ม Value Added",
-    "NonFinancialValueCustomerQuality": "ไม่ใช่การเงิน: คุณภาพชีวิตลูกค้า",
-    "NonFinancialValueEnvironment": "ไม่ใช่การเงิน: สิ่งแวดล้อม",
-    "NonFinancialValueDetailHtml": "รายละเอียดเพิ่มเติมที่ไม่ใช่การเงิน",
-
-    "StatusCode": "สถานะ",
-    "SubmittedAt": "วันที่ส่งผลงาน",
-    "CreatedByEmpCode": "ผู้สร้างรายการ (รหัสพนักงาน)",
-    "CreatedAt": "วันที่สร้างรายการ",
-    "UpdatedByEmpCode": "ผู้แก้ไขล่าสุด (รหัสพนักงาน)",
-    "UpdatedAt": "วันที่แก้ไขล่าสุด",
-}
-
-for _seq in range(1, 6):
-    PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH[f"Member{_seq}EmpCode"] = f"สมาชิกคนที่ {_seq}: รหัสพนักงาน"
-    PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH[f"Member{_seq}FullNameTh"] = f"สมาชิกคนที่ {_seq}: ชื่อ-นามสกุล"
-    PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH[f"Member{_seq}PositionName"] = f"สมาชิกคนที่ {_seq}: ตำแหน่งงาน"
-    PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH[f"Member{_seq}OrgName"] = f"สมาชิกคนที่ {_seq}: สังกัด/ฝ่าย"
-    PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH[f"Member{_seq}MobileNo"] = f"สมาชิกคนที่ {_seq}: เบอร์ติดต่อ"
-
-PROJECT_SUBMISSION_NEW_EXPORT_BIT_COLUMNS = [
-    "StrategicObjectiveSO1", "StrategicObjectiveSO2", "StrategicObjectiveSO3",
-    "StrategicObjectiveSO4", "StrategicObjectiveSO5", "StrategicObjectiveSO6",
-    "IdeaSourceCoPs", "IdeaSourceLR", "IdeaSourceResearch", "IdeaSourceExperience",
-    "IdeaSourceStudyVisit", "IdeaSourceKnowledgeExchange", "IdeaSourceInnovationDatabase",
-    "IdeaSourceMarketStudy", "IdeaSourceVOS", "IdeaSourceOther",
-    "InnovationValueFinancial", "FinancialValueRevenue", "FinancialValueCostSaving",
-    "InnovationValueNonFinancial", "NonFinancialValueCustomerSatisfaction",
-    "NonFinancialValueWorkEfficiency", "NonFinancialValueCustomerQuality", "NonFinancialValueEnvironment",
-]
-
-PROJECT_SUBMISSION_NEW_EXPORT_HTML_COLUMNS = [
-    "TargetCustomerProblemHtml", "IdeaConceptHtml", "FinancialValueDetailHtml", "NonFinancialValueDetailHtml",
-]
-
-
-def _project_submission_new_to_export_row(submission: models.ProjectSubmissionNew) -> dict:
-    row = {
-        column.name: getattr(submission, column.name)
-        for column in models.ProjectSubmissionNew.__table__.columns
-    }
-
-    members_by_seq = {member.MemberSeq: member for member in submission.members}
-    for seq in range(1, 6):
-        member = members_by_seq.get(seq)
-        row[f"Member{seq}EmpCode"] = member.EmpCode if member else None
-        row[f"Member{seq}FullNameTh"] = member.FullNameTh if member else None
-        row[f"Member{seq}PositionName"] = member.PositionName if member else None
-        row[f"Member{seq}OrgName"] = member.OrgName if member else None
-        row[f"Member{seq}MobileNo"] = member.MobileNo if member else None
-
-    return row
+    if submission is None:
+        raise _draft_write_error_new(db, project_id, "ผลงานนี้ถูกส่งไปแล้ว")
+    _validate_creative_idea_name(submission.CreativeIdeaName)
+    return submission_response(submission, members)
 
 
 @router.get("/project-submissions-new/export")
 def export_project_submissions_new(
+    request: Request,
     team_name: Optional[str] = None,
     innovation_type_no: Optional[int] = None,
     challenge_no: Optional[int] = None,
-    db: Session = Depends(get_db),
+    export_format: str = Query("xlsx", alias="format"),
+    db: Session = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    query = (
-        db.query(models.ProjectSubmissionNew)
-        .options(joinedload(models.ProjectSubmissionNew.members))
-        .filter(models.ProjectSubmissionNew.StatusCode == "SUBMITTED")
-    )
-    if team_name:
-        query = query.filter(
-            or_(
-                models.ProjectSubmissionNew.TeamName.ilike(f"%{team_name}%"),
-                models.ProjectSubmissionNew.CreativeIdeaName.ilike(f"%{team_name}%"),
-            )
-        )
-    if innovation_type_no is not None:
-        query = query.filter(models.ProjectSubmissionNew.InnovationTypeNo == innovation_type_no)
-    if challenge_no is not None:
-        query = query.filter(models.ProjectSubmissionNew.ChallengeNo == challenge_no)
-
-    export_keys = list(PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH.keys())
-    submissions = query.order_by(models.ProjectSubmissionNew.ProjectId.desc()).all()
-    rows = []
-    for submission in submissions:
-        raw_row = _project_submission_new_to_export_row(submission)
-        rows.append({key: raw_row.get(key) for key in export_keys})
-
-    df = pd.DataFrame(rows, columns=export_keys)
-
-    for col in PROJECT_SUBMISSION_NEW_EXPORT_BIT_COLUMNS:
-        if col in df.columns:
-            df[col] = df[col].apply(lambda v: "ใช่" if bool(v) else "ไม่ใช่")
-
-    for col in PROJECT_SUBMISSION_NEW_EXPORT_HTML_COLUMNS:
-        if col in df.columns:
-            df[col] = df[col].apply(_strip_html_to_text)
-
-    if "SubmissionTypeCode" in df.columns:
-        df["SubmissionTypeCode"] = df["SubmissionTypeCode"].map(PROJECT_SUBMISSION_EXPORT_SUBMISSION_TYPE_TH).fillna(df["SubmissionTypeCode"])
-    if "StatusCode" in df.columns:
-        df["StatusCode"] = df["StatusCode"].map(PROJECT_SUBMISSION_EXPORT_STATUS_TH).fillna(df["StatusCode"])
-
-    df = df.rename(columns=PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH)
-
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="ผลงานที่ส่งเข้าประกวด")
-    buffer.seek(0)
-
-    return StreamingResponse(
-        buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=project_submissions_new_export.xlsx"},
+    """Export submitted projects as xlsx (default), csv or ndjson (keyed by column name)"""
+    filters = {"team_name": team_name, "innovation_type_no": innovation_type_no, "challenge_no": challenge_no}
+    return _project_submission_export(
+        request, db, models.ProjectSubmissionNew, "project-submissions-new", filters, export_format
     )
 
 
@@ -2033,7 +2377,7 @@ def list_project_submissions_new(
     team_name: Optional[str] = None,
     innovation_type_no: Optional[int] = None,
     challenge_no: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
     query = db.query(models.ProjectSubmissionNew).filter(models.ProjectSubmissionNew.StatusCode == "SUBMITTED")
@@ -2062,7 +2406,10 @@ def get_project_submission_new(project_id: int, db: Session = Depends(get_db)):
     return _get_submission_new_or_404(db, project_id)
 
 
-@router.post("/settings", response_model=SettingOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/settings", response_model=SettingOut, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(records_write)],
+)
 def create_setting(
     payload: SettingCreate,
     db: Session = Depends(get_db),
@@ -2091,7 +2438,7 @@ def create_setting(
     return new_setting
 
 
-@router.put("/settings/{set_code}", response_model=SettingOut)
+@router.put("/settings/{set_code}", response_model=SettingOut, dependencies=[Depends(records_write)])
 def update_setting(
     set_code: str,
     payload: SettingUpdate,
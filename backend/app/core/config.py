@@ -5,6 +5,23 @@ from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+PRE_PING_MODES = ("always", "idle", "off")
+
+# Async driver used for each sync driver in the database URLs
+ASYNC_DRIVERS = {
+    "mssql+pyodbc": "mssql+aioodbc",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_uri(url: str) -> str:
+    if not url:
+        return ""
+    scheme, rest = url.split("://", 1)
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
 class Settings(BaseSettings):
     # MSSQL Configuration
     mssql_user: str = ""
@@ -13,6 +30,26 @@ class Settings(BaseSettings):
     mssql_dbname: str = ""
     mssql_port: int = 1433
     mssql_driver: str = "ODBC Driver 17 for SQL Server"
+
+    # Read replica for list, export and dashboard reads; empty host keeps them on the primary
+    mssql_read_host: str = ""
+    mssql_read_port: int = 1433
+    # Seconds a client keeps reading from the primary after its own write (replica lag margin)
+    read_your_writes_seconds: int = 30
+
+    # Connection pool, per engine (primary, replica and their async twins)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: int = 30
+    db_pool_recycle_seconds: int = 1800
+    # Liveness check on checkout: always (ping on every checkout), idle (ping only connections
+    # idle longer than db_pool_ping_idle_seconds) or off (rely on recycle and disconnect handling)
+    db_pool_pre_ping: str = "idle"
+    db_pool_ping_idle_seconds: int = 60
+
+    # SQLAlchemy URLs replacing the MSSQL ones, e.g. a SQLite primary/replica pair for tests
+    primary_database_url: str = ""
+    read_database_url: str = ""
     
     # OpenAI Configuration
     openai_api_key: str = ""
@@ -33,6 +70,32 @@ class Settings(BaseSettings):
     api_key_header: str = "X-API-Key"
     internal_api_key: str = ""
 
+    # Idea tank read caches
+    idea_facet_cache_ttl_seconds: int = 30
+    idea_snapshot_refresh_seconds: int = 5
+
+    # Background idea import jobs
+    import_job_workers: int = 2
+    import_job_retention_seconds: int = 86400
+
+    # Rendered export files; empty dir means <system temp>/eventcategorize_exports
+    export_cache_dir: str = ""
+    export_cache_max_files: int = 50
+
+    # Startup schema check against dbo.alembic_version: off, warn or strict
+    schema_version_check: str = "warn"
+
+    # Separate processes for parsing large imports and rendering large exports; one process is
+    # started per task, so only work that outlasts the ~1 s start-up is sent there
+    cpu_pool_workers: int = 2
+    cpu_task_timeout_seconds: int = 900
+    import_max_upload_mb: int = 200
+    import_offload_min_kb: int = 1024
+    # Rows of one import kept in memory for in-file near-duplicate checks (about 6 KB each);
+    # later rows are still compared with the tank and with these. 0 turns in-file checks off
+    import_dedup_in_file_max_rows: int = 20000
+    export_offload_min_rows: int = 5000
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -40,7 +103,7 @@ class Settings(BaseSettings):
         extra="ignore",  # tolerate unknown/malformed env keys
     )
 
-    @field_validator("mssql_port", mode="before")
+    @field_validator("mssql_port", "mssql_read_port", mode="before")
     @classmethod
     def normalize_mssql_port(cls, value):
         """Accept empty MSSQL_PORT and fall back to the default port."""
@@ -50,22 +113,57 @@ class Settings(BaseSettings):
             return 1433
         return value
 
-    @property
-    def sqlalchemy_database_uri(self) -> str:
+    @field_validator("db_pool_pre_ping", mode="before")
+    @classmethod
+    def normalize_db_pool_pre_ping(cls, value):
+        """Accept always / idle / off in any case; empty falls back to idle."""
+        value = (value or "idle").strip().lower()
+        if value not in PRE_PING_MODES:
+            raise ValueError(f"DB_POOL_PRE_PING must be one of {', '.join(PRE_PING_MODES)}")
+        return value
+
+    def odbc_connection_string(self, host: str, port: int, read_only: bool = False) -> str:
         # Create ODBC connection string for MSSQL
         connection_string = (
             f"DRIVER={{{self.mssql_driver}}};"
-            f"SERVER={self.mssql_host},{self.mssql_port};"
+            f"SERVER={host},{port};"
             f"DATABASE={self.mssql_dbname};"
             f"UID={self.mssql_user};"
             f"PWD={self.mssql_password};"
             f"TrustServerCertificate=yes;"
             f"Encrypt=yes;"
         )
+        if read_only:
+            # Lets an availability group listener route the connection to a readable secondary
+            connection_string += "ApplicationIntent=ReadOnly;"
         # URL encode the connection string for SQLAlchemy
         from urllib.parse import quote_plus
-        encoded_connection_string = quote_plus(connection_string)
-        return f"mssql+pyodbc:///?odbc_connect={encoded_connection_string}"
+        return quote_plus(connection_string)
+
+    @property
+    def sqlalchemy_database_uri(self) -> str:
+        if self.primary_database_url:
+            return self.primary_database_url
+        return f"mssql+pyodbc:///?odbc_connect={self.odbc_connection_string(self.mssql_host, self.mssql_port)}"
+
+    @property
+    def sqlalchemy_async_database_uri(self) -> str:
+        # Same connection through aioodbc, which runs pyodbc calls off the event loop
+        return async_database_uri(self.sqlalchemy_database_uri)
+
+    @property
+    def sqlalchemy_read_database_uri(self) -> str:
+        """Replica URL, or empty when reads go to the primary."""
+        if self.read_database_url:
+            return self.read_database_url
+        if self.mssql_read_host:
+            odbc = self.odbc_connection_string(self.mssql_read_host, self.mssql_read_port, read_only=True)
+            return f"mssql+pyodbc:///?odbc_connect={odbc}"
+        return ""
+
+    @property
+    def sqlalchemy_async_read_database_uri(self) -> str:
+        return async_database_uri(self.sqlalchemy_read_database_uri)
 
     def get_cors_allow_origins(self) -> list[str]:
         """Parse ALLOW_ORIGINS from .env.
@@ -0,0 +1,62 @@
+"""
+Bulk Writes
+Multi-row INSERT and UPDATE as a few set-based statements instead of one ORM flush per object
+"""
+
+from typing import Dict, List
+
+from sqlalchemy import Table, bindparam, column, insert, update, values
+from sqlalchemy.orm import Session
+
+
+# SQL Server accepts at most 2100 parameters in one statement
+MSSQL_MAX_PARAMS = 2100
+_MAX_VALUES_ROWS = 1000
+
+
+def bulk_insert(db: Session, table: Table, rows: List[Dict]) -> int:
+    """INSERT rows (dicts keyed by column name) as one executemany.
+
+    The engine has fast_executemany on, so pyodbc sends all parameter sets in one round trip.
+    Every row must carry the same keys.
+    """
+    if not rows:
+        return 0
+    db.execute(insert(table), rows)
+    return len(rows)
+
+
+def bulk_update(db: Session, table: Table, key: str, rows: List[Dict]) -> int:
+    """UPDATE the rows matched on column key; each row dict holds key plus the same columns to set.
+
+    On SQL Server every batch is one UPDATE joined to a VALUES list, sized to stay under the
+    parameter limit. Other dialects (SQLite in local runs) get an executemany of a keyed UPDATE.
+    Returns the number of rows updated.
+    """
+    if not rows:
+        return 0
+    columns = [name for name in rows[0] if name != key]
+    if db.get_bind().dialect.name != "mssql":
+        stmt = (
+            update(table)
+            .where(table.c[key] == bindparam(f"b_{key}"))
+            .values({name: bindparam(f"b_{name}") for name in columns})
+        )
+        db.execute(stmt, [{f"b_{name}": value for name, value in row.items()} for row in rows])
+        return len(rows)
+
+    names = [key] + columns
+    batch_size = min(_MAX_VALUES_ROWS, (MSSQL_MAX_PARAMS - 1) // len(names))
+    updated = 0
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        source = values(*[column(name, table.c[name].type) for name in names], name="v").data(
+            [tuple(row[name] for name in names) for row in batch]
+        )
+        stmt = (
+            update(table)
+            .values({name: source.c[name] for name in columns})
+            .where(table.c[key] == source.c[key])
+        )
+        updated += db.execute(stmt).rowcount
+    return updated
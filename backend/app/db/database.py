@@ -1,17 +1,180 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+import secrets
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import get_settings
+from app.db.pool_metrics import PoolMetrics, instrument_engine, instrumented_pool_class
 
 
 class Base(DeclarativeBase):
     pass
 
 
+def _attach_sqlite_dbo(engine, url: str) -> None:
+    # The models live in the dbo schema; SQLite gets it by attaching the database file a second
+    # time under that name, plus the MSSQL date functions used in server defaults
+    database = make_url(url).database or ":memory:"
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        now = lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")  # noqa: E731
+        dbapi_connection.create_function("GETDATE", 0, now)
+        dbapi_connection.create_function("SYSDATETIME", 0, now)
+        dbapi_connection.execute(f"ATTACH DATABASE '{database}' AS dbo")
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (make_url(url).database or ":memory:") == ":memory:"
+
+
+def _pool_options(metrics: PoolMetrics, base_pool) -> dict:
+    return {
+        "poolclass": instrumented_pool_class(base_pool, metrics),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping == "always",
+    }
+
+
+def _instrument(sync_engine, metrics: PoolMetrics) -> None:
+    metrics.engine = sync_engine
+    instrument_engine(sync_engine, metrics, settings.db_pool_pre_ping, settings.db_pool_ping_idle_seconds)
+
+
+def _create_engine(url: str, name: str):
+    options = {}
+    metrics = None
+    # In-memory SQLite keeps SQLAlchemy's single-connection pool; sizing does not apply there
+    if not _is_memory_sqlite(url):
+        metrics = PoolMetrics(name, None)
+        options.update(_pool_options(metrics, QueuePool))
+    if url.startswith("mssql+pyodbc"):
+        # fast_executemany makes pyodbc send executemany() parameter sets in one batch instead
+        # of one round trip per row; bulk inserts through Core insert() rely on it
+        options["fast_executemany"] = True
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+    sync_engine = create_engine(url, **options)
+    if url.startswith("sqlite"):
+        _attach_sqlite_dbo(sync_engine, url)
+    if metrics is not None:
+        _instrument(sync_engine, metrics)
+    return sync_engine
+
+
+def _create_async_engine(url: str, name: str):
+    options = {}
+    metrics = None
+    if not _is_memory_sqlite(url):
+        metrics = PoolMetrics(name, None)
+        options.update(_pool_options(metrics, AsyncAdaptedQueuePool))
+    async_engine = create_async_engine(url, **options)
+    if url.startswith("sqlite"):
+        _attach_sqlite_dbo(async_engine.sync_engine, url)
+    if metrics is not None:
+        _instrument(async_engine.sync_engine, metrics)
+    return async_engine
+
+
+class ReadOnlySession(Session):
+    """Session handed to read routes; flushing one means a write slipped into a read path."""
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_read_only_flush(session, flush_context, instances):
+    raise RuntimeError("Read-only session cannot write; use get_db for this route")
+
+
+class ReadYourWrites:
+    """Remembers which clients wrote recently.
+
+    Their reads stay on the primary for window_seconds, so a user sees their own change right
+    away even while the replica is still catching up. State is per process, like the idea
+    snapshot. A client is identified by its bearer token; an anonymous writer is handed a random
+    cookie instead, because behind nginx every anonymous client shares one address. Anonymous
+    clients that do not send the cookie back simply read from the replica.
+    """
+
+    cookie_name = "rw_client"
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._writes: Dict[str, float] = {}
+
+    @classmethod
+    def client_key(cls, request: Request) -> Optional[str]:
+        authorization = request.headers.get("authorization")
+        if authorization:
+            return authorization
+        cookie = request.cookies.get(cls.cookie_name)
+        return "cookie:" + cookie if cookie else None
+
+    def mark_write(self, request: Request, response: Response) -> None:
+        key = self.client_key(request)
+        if key is None:
+            cookie = secrets.token_urlsafe(16)
+            response.set_cookie(
+                self.cookie_name, cookie, max_age=int(self.window_seconds), httponly=True, samesite="lax",
+            )
+            key = "cookie:" + cookie
+        now = time.monotonic()
+        with self._lock:
+            self._writes[key] = now
+            if len(self._writes) > 10000:
+                cutoff = now - self.window_seconds
+                self._writes = {key: at for key, at in self._writes.items() if at > cutoff}
+
+    def wrote_recently(self, request: Request) -> bool:
+        key = self.client_key(request)
+        if key is None:
+            return False
+        with self._lock:
+            written_at = self._writes.get(key)
+        return written_at is not None and time.monotonic() - written_at < self.window_seconds
+
+
 settings = get_settings()
-engine = create_engine(settings.sqlalchemy_database_uri, pool_pre_ping=True)
+engine = _create_engine(settings.sqlalchemy_database_uri, "primary")
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# Async routes wait on the database without holding a threadpool thread; the engine keeps
+# its own connection pool next to the sync one
+async_engine = _create_async_engine(settings.sqlalchemy_async_database_uri, "primary_async")
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Without a replica configured the read engines are the primary ones
+read_engine = (
+    _create_engine(settings.sqlalchemy_read_database_uri, "replica")
+    if settings.sqlalchemy_read_database_uri else engine
+)
+async_read_engine = (
+    _create_async_engine(settings.sqlalchemy_async_read_database_uri, "replica_async")
+    if settings.sqlalchemy_async_read_database_uri else async_engine
+)
+ReadSessionLocal = sessionmaker(bind=read_engine, class_=ReadOnlySession, autoflush=False, autocommit=False)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, sync_session_class=ReadOnlySession, autoflush=False, expire_on_commit=False
+)
+read_your_writes = ReadYourWrites(window_seconds=settings.read_your_writes_seconds)
+
+
+def records_write(request: Request) -> None:
+    """Route dependency for routes that commit; a successful call keeps the client's reads on the
+    primary (see remember_writers in app.main). Read-only POSTs such as login leave it out."""
+    request.state.records_write = True
+
 
 def get_db():
     db = SessionLocal()
@@ -21,3 +184,22 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db(request: Request):
+    """Read-only session on the replica, or on the primary right after this client's own write."""
+    bind = engine if read_your_writes.wrote_recently(request) else read_engine
+    db = ReadSessionLocal(bind=bind)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    bind = async_engine if read_your_writes.wrote_recently(request) else async_read_engine
+    async with AsyncReadSessionLocal(bind=bind) as db:
+        yield db
@@ -0,0 +1,239 @@
+"""
+Legacy text Columns
+Moves the text / varchar(max) columns of the original tables to NVARCHAR online: a shadow
+column is added, filled in batches while the app keeps running, then swapped in. Long-form text
+becomes NVARCHAR(MAX); short label columns get a bounded NVARCHAR(n) so they can be index keys.
+SQL Server change tracking records which rows the app writes meanwhile, so the swap only has to
+copy those again; triggers are not an option because the app writes these tables with OUTPUT.
+"""
+
+from typing import Dict, List, NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+SHADOW_SUFFIX = "__nvarchar"
+
+# The backfill tags its own writes with this change tracking context, so the swap can tell them
+# apart from the app's writes
+BACKFILL_CONTEXT = "CAST('nvarchar_backfill' AS VARBINARY(128))"
+
+# One row per table the backfill finished, holding the change tracking version it started from
+BACKFILL_STATE_TABLE = "dbo.nvarchar_backfill_state"
+
+
+class LegacyTable(NamedTuple):
+    primary_key: str
+    columns: List[str]
+    not_null: List[str]
+    # Bounded NVARCHAR length of the short columns; the rest become NVARCHAR(MAX)
+    lengths: Dict[str, int] = {}
+
+    def column_type(self, column: str) -> str:
+        length = self.lengths.get(column)
+        return f"NVARCHAR({length})" if length else "NVARCHAR(MAX)"
+
+
+# Tables of db/init/09-mssql-createtable.sql; columns already NVARCHAR(MAX) are skipped
+LEGACY_TEXT_COLUMNS: Dict[str, LegacyTable] = {
+    "dbo.Question": LegacyTable("question_id", ["question_description", "question_categories"], []),
+    "dbo.Answer": LegacyTable(
+        "answer_id",
+        [
+            "answer_title", "answer_painpoint", "answer_text", "answer_outcome",
+            "answer_keywords", "model_overall_feedback",
+        ],
+        ["answer_text"],
+    ),
+    "dbo.idea_tank": LegacyTable(
+        "idea_seq",
+        [
+            "idea_subject", "idea_source", "customer_target", "idea_inno_type", "idea_detail",
+            "idea_finance_impact", "idea_nonfinance_impact", "idea_status", "idea_status_md_remark",
+            "idea_keywords", "idea_comment", "idea_summary_byai", "idea_score_comment",
+        ],
+        [],
+        {"idea_status": 100, "idea_inno_type": 255, "idea_source": 500},
+    ),
+    "dbo.tb_setting": LegacyTable("set_code", ["set_value", "set_description"], ["set_value"]),
+}
+
+
+def shadowed_columns(conn: Connection, table: str, columns: List[str]) -> List[str]:
+    """The columns of table that still have a shadow column, i.e. are not swapped yet."""
+    return [
+        col for col in columns
+        if conn.execute(
+            text("SELECT COL_LENGTH(:table, :column)"), {"table": table, "column": col + SHADOW_SUFFIX}
+        ).scalar() is not None
+    ]
+
+
+def overlong_columns(conn: Connection, table: str, legacy: LegacyTable, columns: List[str]) -> Dict[str, int]:
+    """Rows per bounded column whose value does not fit its new length; they must be fixed first."""
+    counts = {}
+    for col in columns:
+        length = legacy.lengths.get(col)
+        if not length:
+            continue
+        count = conn.execute(text(
+            f"SELECT COUNT(*) FROM {table} WHERE LEN(CAST({col} AS NVARCHAR(MAX))) > {length}"
+        )).scalar()
+        if count:
+            counts[col] = count
+    return counts
+
+
+def _is_legacy_sql(table: str, column: str) -> str:
+    return f"""EXISTS (
+    SELECT 1
+    FROM sys.columns c
+    JOIN sys.types t ON t.user_type_id = c.user_type_id
+    WHERE c.object_id = OBJECT_ID('{table}') AND c.name = '{column}'
+      AND (t.name IN ('text', 'ntext') OR (t.name = 'varchar' AND c.max_length = -1))
+)"""
+
+
+def add_shadow_column_sql(table: str, column: str, column_type: str = "NVARCHAR(MAX)") -> str:
+    """Add an empty shadow column of column_type; metadata only, so it does not block writers."""
+    shadow = column + SHADOW_SUFFIX
+    return f"""
+IF {_is_legacy_sql(table, column)}
+    AND COL_LENGTH('{table}', '{shadow}') IS NULL
+BEGIN
+    ALTER TABLE {table} ADD {shadow} {column_type} NULL;
+END
+"""
+
+
+def enable_database_change_tracking_sql() -> str:
+    # ALTER DATABASE cannot run inside a transaction; call it from an autocommit block
+    return """
+IF NOT EXISTS (SELECT 1 FROM sys.change_tracking_databases WHERE database_id = DB_ID())
+BEGIN
+    ALTER DATABASE CURRENT SET CHANGE_TRACKING = ON (CHANGE_RETENTION = 7 DAYS, AUTO_CLEANUP = ON);
+END
+"""
+
+
+def disable_database_change_tracking_sql() -> str:
+    """Turn change tracking off again once no table uses it; also needs an autocommit block."""
+    return """
+IF EXISTS (SELECT 1 FROM sys.change_tracking_databases WHERE database_id = DB_ID())
+    AND NOT EXISTS (SELECT 1 FROM sys.change_tracking_tables)
+BEGIN
+    ALTER DATABASE CURRENT SET CHANGE_TRACKING = OFF;
+END
+"""
+
+
+def enable_change_tracking_sql(table: str) -> str:
+    return f"""
+IF NOT EXISTS (SELECT 1 FROM sys.change_tracking_tables WHERE object_id = OBJECT_ID('{table}'))
+BEGIN
+    ALTER TABLE {table} ENABLE CHANGE_TRACKING;
+END
+"""
+
+
+def disable_change_tracking_sql(table: str) -> str:
+    return f"""
+IF EXISTS (SELECT 1 FROM sys.change_tracking_tables WHERE object_id = OBJECT_ID('{table}'))
+BEGIN
+    ALTER TABLE {table} DISABLE CHANGE_TRACKING;
+END
+"""
+
+
+def create_backfill_state_sql() -> str:
+    return f"""
+IF OBJECT_ID('{BACKFILL_STATE_TABLE}', 'U') IS NULL
+BEGIN
+    CREATE TABLE {BACKFILL_STATE_TABLE} (
+        table_name NVARCHAR(128) NOT NULL PRIMARY KEY,
+        since_version BIGINT NOT NULL
+    );
+END
+"""
+
+
+def drop_backfill_state_sql() -> str:
+    return f"""
+IF OBJECT_ID('{BACKFILL_STATE_TABLE}', 'U') IS NOT NULL
+BEGIN
+    DROP TABLE {BACKFILL_STATE_TABLE};
+END
+"""
+
+
+def _shadow_assignments(columns: List[str]) -> str:
+    # Cast to MAX even for bounded shadows: a value that does not fit fails the statement
+    # ("would be truncated") instead of being cut short silently
+    return ", ".join(f"{col}{SHADOW_SUFFIX} = CAST({col} AS NVARCHAR(MAX))" for col in columns)
+
+
+def backfill_range_sql(table: str, columns: List[str], primary_key: str) -> str:
+    """Copy the rows with :first_key <= primary key <= :last_key into the shadow columns."""
+    return (
+        f"DECLARE @context VARBINARY(128) = {BACKFILL_CONTEXT};\n"
+        f"WITH CHANGE_TRACKING_CONTEXT (@context) "
+        f"UPDATE {table} SET {_shadow_assignments(columns)} WHERE {primary_key} BETWEEN :first_key AND :last_key"
+    )
+
+
+def record_backfill_sql() -> str:
+    """Remember that :table_name was backfilled completely, starting at change tracking :since_version."""
+    return f"""
+UPDATE {BACKFILL_STATE_TABLE} SET since_version = :since_version WHERE table_name = :table_name;
+IF @@ROWCOUNT = 0
+    INSERT INTO {BACKFILL_STATE_TABLE} (table_name, since_version) VALUES (:table_name, :since_version);
+"""
+
+
+def catch_up_sql(table: str, columns: List[str], primary_key: str) -> str:
+    """Lock the table and copy every shadowed column of the rows the app wrote since the backfill.
+
+    One UPDATE per table. Only rows whose last change was not the backfill's own are touched;
+    when the backfill did not finish (or its version is past the retention period) every row
+    is copied instead. TABLOCKX is held until the migration commits, so no write can slip in
+    between this copy and the swap.
+    """
+    assignments = _shadow_assignments(columns)
+    return f"""
+DECLARE @since BIGINT = (SELECT since_version FROM {BACKFILL_STATE_TABLE} WHERE table_name = '{table}');
+IF @since IS NOT NULL AND @since >= CHANGE_TRACKING_MIN_VALID_VERSION(OBJECT_ID('{table}'))
+BEGIN
+    UPDATE t SET {assignments}
+    FROM {table} AS t WITH (TABLOCKX)
+    JOIN CHANGETABLE(CHANGES {table}, @since) AS ct ON ct.{primary_key} = t.{primary_key}
+    WHERE ct.SYS_CHANGE_CONTEXT IS NULL OR ct.SYS_CHANGE_CONTEXT <> {BACKFILL_CONTEXT};
+END
+ELSE
+BEGIN
+    UPDATE {table} WITH (TABLOCKX) SET {assignments};
+END
+"""
+
+
+def swap_column_sql(table: str, column: str, not_null: bool, column_type: str = "NVARCHAR(MAX)") -> str:
+    """Drop the old column and rename the shadow into place; run catch_up_sql for the table first.
+
+    The statements run through EXEC because the batch would not compile once the shadow
+    column is gone.
+    """
+    shadow = column + SHADOW_SUFFIX
+    schema, name = table.split(".")
+    statements = [
+        f"ALTER TABLE {table} DROP COLUMN {column};",
+        f"EXEC sp_rename '{schema}.{name}.{shadow}', '{column}', 'COLUMN';",
+    ]
+    if not_null:
+        statements.append(f"ALTER TABLE {table} ALTER COLUMN {column} {column_type} NOT NULL;")
+    body = "\n    ".join("EXEC(N'{}');".format(stmt.replace("'", "''")) for stmt in statements)
+    return f"""
+IF COL_LENGTH('{table}', '{shadow}') IS NOT NULL
+BEGIN
+    {body}
+END
+"""
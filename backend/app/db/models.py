@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, BigInteger, Text, TIMESTAMP, text, String, DateTime, Boolean, SmallInteger, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, NVARCHAR, TIMESTAMP, text, String, DateTime, Boolean, SmallInteger, ForeignKey, Index
 from sqlalchemy.dialects.mssql import TINYINT
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql.elements import quoted_name
 
 from app.db.database import Base
@@ -12,8 +12,8 @@ class Question(Base):
 
     question_id = Column(String(100), primary_key=True, nullable=False)
     question_title = Column(String(500), nullable=False)
-    question_description = Column(Text)
-    question_categories = Column(Text)  # Changed from ARRAY(Text) to Text for MSSQL
+    question_description = Column(NVARCHAR())
+    question_categories = Column(NVARCHAR())  # Changed from ARRAY(Text) to Text for MSSQL
     qrcode_url = Column(String(500))
     created_at = Column(
         DateTime, nullable=False, server_default=text("GETDATE()")
@@ -24,23 +24,29 @@ class Question(Base):
 
 class Answer(Base):
     __tablename__ = quoted_name("Answer", True)
-    __table_args__ = {"schema": "dbo"}
+    __table_args__ = (
+        # Secondary indexes are created by alembic/versions/0002_secondary_indexes.py
+        Index("IX_Answer_question_id_created_at", "question_id", text("created_at DESC")),
+        Index("IX_Answer_created_at", text("created_at DESC")),
+        {"schema": "dbo"},
+    )
 
+    # Long text columns are deferred: loaded on first access, or with undefer_group("answer_text" / "answer_model")
     answer_id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
     # Plain text field; no ForeignKey relation
     question_id = Column(String(255), nullable=False)
-    answer_title = Column(Text)
-    answer_painpoint = Column(Text)
-    answer_text = Column(Text, nullable=False)
-    answer_outcome = Column(Text)
+    answer_title = deferred(Column(NVARCHAR()), group="answer_text")
+    answer_painpoint = deferred(Column(NVARCHAR()), group="answer_text")
+    answer_text = deferred(Column(NVARCHAR(), nullable=False), group="answer_text")
+    answer_outcome = deferred(Column(NVARCHAR()), group="answer_text")
     category = Column(String(255), nullable=False)
     create_user_name = Column(String(255))
     create_user_code = Column(String(100))
     create_user_department = Column(String(255))
-    answer_keywords = Column(Text)
+    answer_keywords = deferred(Column(NVARCHAR()), group="answer_model")
     model_scores_criterion = Column(String(1000), nullable=True)
     model_overall_score = Column(Integer, nullable=True)
-    model_overall_feedback = Column(Text, nullable=True)
+    model_overall_feedback = deferred(Column(NVARCHAR(), nullable=True), group="answer_model")
     created_at = Column(
         DateTime, nullable=False, server_default=text("GETDATE()")
     )
@@ -49,31 +55,46 @@ class Answer(Base):
 
 class IdeaTank(Base):
     __tablename__ = quoted_name("idea_tank", True)
-    __table_args__ = {"schema": "dbo"}
+    __table_args__ = (
+        # Backs GET /ideas/leaderboard; created by alembic revision 0005
+        Index(
+            "IX_idea_tank_score_rank",
+            text("idea_score DESC"),
+            "idea_seq",
+            mssql_where=text("idea_score IS NOT NULL"),
+            mssql_include=["idea_code", "category_idea_type1", "idea_name"],
+        ),
+        # Backs GET /ideas/changes and the incremental idea snapshot refresh
+        Index("IX_idea_tank_update_datetime", "update_datetime"),
+        # Upsert MERGE key and idea code lookups
+        Index("IX_idea_tank_idea_code", "idea_code", mssql_where=text("idea_code IS NOT NULL")),
+        {"schema": "dbo"},
+    )
 
+    # Long text columns are deferred: loaded on first access, or with undefer_group("idea_text" / "idea_ai")
     idea_seq = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
     idea_code = Column(String(10))
     category_idea_type1 = Column(String(100))
     idea_name = Column(String(500))
-    idea_subject = Column(Text)
-    idea_source = Column(Text)
-    customer_target = Column(Text)
-    idea_inno_type = Column(Text)
-    idea_detail = Column(Text)
-    idea_finance_impact = Column(Text)
-    idea_nonfinance_impact = Column(Text)
-    idea_status = Column(Text)
+    idea_subject = deferred(Column(NVARCHAR()), group="idea_text")
+    idea_source = deferred(Column(NVARCHAR(500)), group="idea_text")
+    customer_target = deferred(Column(NVARCHAR()), group="idea_text")
+    idea_inno_type = deferred(Column(NVARCHAR(255)), group="idea_text")
+    idea_detail = deferred(Column(NVARCHAR()), group="idea_text")
+    idea_finance_impact = deferred(Column(NVARCHAR()), group="idea_text")
+    idea_nonfinance_impact = deferred(Column(NVARCHAR()), group="idea_text")
+    idea_status = Column(NVARCHAR(100))
     idea_status_md = Column(String(50))
-    idea_status_md_remark = Column(Text)
+    idea_status_md_remark = deferred(Column(NVARCHAR()), group="idea_text")
     idea_owner_empcode = Column(String(50))
     idea_owner_empname = Column(String(200))
     idea_owner_deposit = Column(String(100))
     idea_owner_contacts = Column(String(200))
-    idea_keywords = Column(Text)
-    idea_comment = Column(Text)
-    idea_summary_byai = Column(Text)
+    idea_keywords = deferred(Column(NVARCHAR()), group="idea_ai")
+    idea_comment = deferred(Column(NVARCHAR()), group="idea_text")
+    idea_summary_byai = deferred(Column(NVARCHAR()), group="idea_ai")
     idea_score = Column(Integer, nullable=True)
-    idea_score_comment = Column(Text, nullable=True)
+    idea_score_comment = deferred(Column(NVARCHAR(), nullable=True), group="idea_ai")
     create_datetime = Column(
         DateTime, nullable=False, server_default=text("GETDATE()")
     )
@@ -84,6 +105,21 @@ class IdeaTank(Base):
 
 
 
+class IdeaTankTombstone(Base):
+    __tablename__ = quoted_name("idea_tank_tombstone", True)
+    __table_args__ = (
+        Index("IX_idea_tank_tombstone_deleted_datetime", "deleted_datetime"),
+        {"schema": "dbo"},
+    )
+
+    tombstone_id = Column(BigInteger, primary_key=True, autoincrement=True, nullable=False)
+    idea_seq = Column(Integer, nullable=False)
+    idea_code = Column(String(10))
+    deleted_datetime = Column(
+        DateTime, nullable=False, server_default=text("GETDATE()")
+    )
+
+
 class User(Base):
     __tablename__ = quoted_name("idea_users", True)
     __table_args__ = {"schema": "dbo"}
@@ -104,8 +140,24 @@ class User(Base):
 
 class ProjectSubmission(Base):
     __tablename__ = quoted_name("ProjectSubmission", True)
-    __table_args__ = {"schema": "dbo"}
+    __table_args__ = (
+        # List and export filters: StatusCode, optional ChallengeNo/InnovationTypeNo, newest first
+        Index(
+            "IX_ProjectSubmission_StatusCode_CreatedAt",
+            "StatusCode",
+            text("CreatedAt DESC"),
+            mssql_include=["ChallengeNo", "InnovationTypeNo"],
+        ),
+        Index(
+            "IX_ProjectSubmission_ChallengeNo_InnovationTypeNo",
+            "ChallengeNo",
+            "InnovationTypeNo",
+            mssql_include=["StatusCode", "CreatedAt"],
+        ),
+        {"schema": "dbo"},
+    )
 
+    # HTML and plain-text columns are deferred in groups "submission_html" and "submission_plain_text"
     ProjectId = Column(BigInteger, primary_key=True, autoincrement=True, nullable=False)
     EventYear = Column(SmallInteger, nullable=False, server_default=text("2026"))
     SubmissionTypeCode = Column(String(20), nullable=False)
@@ -136,13 +188,16 @@ class ProjectSubmission(Base):
     IdeaSourceOther = Column(Boolean, nullable=False, server_default=text("0"))
     IdeaSourceOtherDetail = Column(String(1000), nullable=True)
 
-    TargetCustomerHtml = Column(Text, nullable=True)
+    TargetCustomerHtml = deferred(Column(NVARCHAR(), nullable=True), group="submission_html")
+    TargetCustomerPlainText = deferred(Column(NVARCHAR(), nullable=True), group="submission_plain_text")
 
     InnovationTypeNo = Column(TINYINT, nullable=True)
     InnovationTypeText = Column(String(500), nullable=True)
 
-    IdeaConceptHtml = Column(Text, nullable=True)
-    ExpectedBenefitHtml = Column(Text, nullable=True)
+    IdeaConceptHtml = deferred(Column(NVARCHAR(), nullable=True), group="submission_html")
+    IdeaConceptPlainText = deferred(Column(NVARCHAR(), nullable=True), group="submission_plain_text")
+    ExpectedBenefitHtml = deferred(Column(NVARCHAR(), nullable=True), group="submission_html")
+    ExpectedBenefitPlainText = deferred(Column(NVARCHAR(), nullable=True), group="submission_plain_text")
 
     GenCapProjectManagement = Column(Boolean, nullable=False, server_default=text("0"))
     GenCapCommunications = Column(Boolean, nullable=False, server_default=text("0"))
@@ -161,7 +216,8 @@ class ProjectSubmission(Base):
     DigitalCapOther = Column(Boolean, nullable=False, server_default=text("0"))
     DigitalCapOtherDetail = Column(String(1000), nullable=True)
 
-    HackathonMotivationHtml = Column(Text, nullable=True)
+    HackathonMotivationHtml = deferred(Column(NVARCHAR(), nullable=True), group="submission_html")
+    HackathonMotivationPlainText = deferred(Column(NVARCHAR(), nullable=True), group="submission_plain_text")
 
     StatusCode = Column(String(20), nullable=False, server_default=text("'DRAFT'"))
     SubmittedAt = Column(DateTime, nullable=True)
@@ -201,8 +257,24 @@ class ProjectSubmissionMember(Base):
 
 class ProjectSubmissionNew(Base):
     __tablename__ = quoted_name("ProjectSubmissionNew", True)
-    __table_args__ = {"schema": "dbo"}
+    __table_args__ = (
+        # List and export filters: StatusCode, optional ChallengeNo/InnovationTypeNo, newest first
+        Index(
+            "IX_ProjectSubmissionNew_StatusCode_CreatedAt",
+            "StatusCode",
+            text("CreatedAt DESC"),
+            mssql_include=["ChallengeNo", "InnovationTypeNo"],
+        ),
+        Index(
+            "IX_ProjectSubmissionNew_ChallengeNo_InnovationTypeNo",
+            "ChallengeNo",
+            "InnovationTypeNo",
+            mssql_include=["StatusCode", "CreatedAt"],
+        ),
+        {"schema": "dbo"},
+    )
 
+    # HTML and plain-text columns are deferred in groups "submission_html" and "submission_plain_text"
     ProjectId = Column(BigInteger, primary_key=True, autoincrement=True, nullable=False)
     EventYear = Column(SmallInteger, nullable=False, server_default=text("2026"))
     SubmissionTypeCode = Column(String(20), nullable=False)
@@ -246,12 +318,14 @@ class ProjectSubmissionNew(Base):
 
     TargetCustomerTypeNo = Column(TINYINT, nullable=True)
     TargetCustomerTypeText = Column(String(100), nullable=True)
-    TargetCustomerProblemHtml = Column(Text, nullable=True)
+    TargetCustomerProblemHtml = deferred(Column(NVARCHAR(), nullable=True), group="submission_html")
+    TargetCustomerProblemPlainText = deferred(Column(NVARCHAR(), nullable=True), group="submission_plain_text")
 
     InnovationTypeNo = Column(TINYINT, nullable=True)
     InnovationTypeText = Column(String(500), nullable=True)
 
-    IdeaConceptHtml = Column(Text, nullable=True)
+    IdeaConceptHtml = deferred(Column(NVARCHAR(), nullable=True), group="submission_html")
+    IdeaConceptPlainText = deferred(Column(NVARCHAR(), nullable=True), group="submission_plain_text")
 
     DigitalInnovationNo = Column(TINYINT, nullable=True)
     DigitalInnovationText = Column(String(300), nullable=True)
@@ -262,14 +336,16 @@ class ProjectSubmissionNew(Base):
     InnovationValueFinancial = Column(Boolean, nullable=False, server_default=text("0"))
     FinancialValueRevenue = Column(Boolean, nullable=False, server_default=text("0"))
     FinancialValueCostSaving = Column(Boolean, nullable=False, server_default=text("0"))
-    FinancialValueDetailHtml = Column(Text, nullable=True)
+    FinancialValueDetailHtml = deferred(Column(NVARCHAR(), nullable=True), group="submission_html")
+    FinancialValueDetailPlainText = deferred(Column(NVARCHAR(), nullable=True), group="submission_plain_text")
 
     InnovationValueNonFinancial = Column(Boolean, nullable=False, server_default=text("0"))
     NonFinancialValueCustomerSatisfaction = Column(Boolean, nullable=False, server_default=text("0"))
     NonFinancialValueWorkEfficiency = Column(Boolean, nullable=False, server_default=text("0"))
     NonFinancialValueCustomerQuality = Column(Boolean, nullable=False, server_default=text("0"))
     NonFinancialValueEnvironment = Column(Boolean, nullable=False, server_default=text("0"))
-    NonFinancialValueDetailHtml = Column(Text, nullable=True)
+    NonFinancialValueDetailHtml = deferred(Column(NVARCHAR(), nullable=True), group="submission_html")
+    NonFinancialValueDetailPlainText = deferred(Column(NVARCHAR(), nullable=True), group="submission_plain_text")
 
     StatusCode = Column(String(20), nullable=False, server_default=text("'DRAFT'"))
     SubmittedAt = Column(DateTime, nullable=True)
@@ -313,11 +389,28 @@ class Setting(Base):
 
     set_code = Column(String(50), primary_key=True, nullable=False)
     set_name = Column(String(255), nullable=True)
-    set_value = Column(Text, nullable=False)
-    set_description = Column(Text, nullable=True)
+    set_value = Column(NVARCHAR(), nullable=False)
+    set_description = Column(NVARCHAR(), nullable=True)
     create_datetime = Column(
         DateTime, nullable=False, server_default=text("GETDATE()")
     )
     update_datetime = Column(
         DateTime, nullable=False, server_default=text("GETDATE()")
     )
+
+
+# Plain-text companions of the rich-text columns, filled when the HTML is saved
+# (backfill existing rows with backend/backfill_plain_text.py)
+PROJECT_SUBMISSION_PLAIN_TEXT_COLUMNS = {
+    "TargetCustomerHtml": "TargetCustomerPlainText",
+    "IdeaConceptHtml": "IdeaConceptPlainText",
+    "ExpectedBenefitHtml": "ExpectedBenefitPlainText",
+    "HackathonMotivationHtml": "HackathonMotivationPlainText",
+}
+
+PROJECT_SUBMISSION_NEW_PLAIN_TEXT_COLUMNS = {
+    "TargetCustomerProblemHtml": "TargetCustomerProblemPlainText",
+    "IdeaConceptHtml": "IdeaConceptPlainText",
+    "FinancialValueDetailHtml": "FinancialValueDetailPlainText",
+    "NonFinancialValueDetailHtml": "NonFinancialValueDetailPlainText",
+}
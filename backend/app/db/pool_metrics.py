@@ -0,0 +1,159 @@
+"""
+Pool Metrics
+Connection pool instrumentation: checkout waits, connect latency and saturation counters per engine
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+# Latency percentiles are computed over the most recent samples only
+_SAMPLE_SIZE = 1000
+
+
+def _latency_summary(samples) -> Dict:
+    if not samples:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "max_ms": None}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(ordered[len(ordered) // 2], 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+class PoolMetrics:
+    """Counters and recent latencies of one engine's pool.
+
+    Checkout wait is measured around the pool's own checkout, so it includes opening a new
+    connection when the pool grows; connect latency on its own is tracked separately.
+    """
+
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.failed_pings = 0
+        self._wait_ms = deque(maxlen=_SAMPLE_SIZE)
+        self._connect_ms = deque(maxlen=_SAMPLE_SIZE)
+
+    def record_checkout(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self._wait_ms.append(wait_ms)
+            if timed_out:
+                self.checkout_timeouts += 1
+            else:
+                self.checkouts += 1
+
+    def record_connect(self, connect_ms: float) -> None:
+        with self._lock:
+            self.connects += 1
+            self._connect_ms.append(connect_ms)
+
+    def snapshot(self) -> Dict:
+        pool = self.engine.pool
+        with self._lock:
+            data = {
+                "engine": self.name,
+                "pool": type(pool).__name__,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "failed_pings": self.failed_pings,
+                "checkout_wait": _latency_summary(self._wait_ms),
+                "connect": _latency_summary(self._connect_ms),
+            }
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return data
+
+
+# Engine name -> metrics, filled by instrument_engine
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def instrumented_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """Subclass of the pool class that times each checkout.
+
+    A class per engine rather than an attribute on the pool, because engine.dispose()
+    rebuilds the pool from its class.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except exc.TimeoutError:
+            metrics.record_checkout((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        metrics.record_checkout((time.perf_counter() - started) * 1000)
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def _ping(dbapi_connection) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    finally:
+        cursor.close()
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics, pre_ping: str, ping_idle_seconds: int) -> None:
+    """Time connects, count invalidations and apply the idle pre-ping strategy.
+
+    pre_ping "always" is SQLAlchemy's pool_pre_ping and is set on the engine itself; "idle"
+    pings only connections that sat in the pool longer than ping_idle_seconds, so busy
+    connections skip the extra round trip; "off" relies on pool_recycle and on invalidation
+    when a statement hits a dead connection.
+    """
+    pool_metrics[metrics.name] = metrics
+
+    @event.listens_for(engine, "do_connect")
+    def _timed_connect(dialect, connection_record, cargs, cparams):
+        started = time.perf_counter()
+        connection = dialect.connect(*cargs, **cparams)
+        metrics.record_connect((time.perf_counter() - started) * 1000)
+        return connection
+
+    @event.listens_for(engine, "invalidate")
+    def _count_invalidation(dbapi_connection, connection_record, exception):
+        with metrics._lock:
+            metrics.invalidations += 1
+
+    if pre_ping != "idle":
+        return
+
+    @event.listens_for(engine, "checkin")
+    def _remember_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < ping_idle_seconds:
+            return
+        try:
+            _ping(dbapi_connection)
+        except Exception as e:  # noqa: BLE001
+            with metrics._lock:
+                metrics.failed_pings += 1
+            # The pool discards this connection and retries the checkout with a fresh one
+            raise exc.DisconnectionError(f"Idle connection failed ping: {e}") from e
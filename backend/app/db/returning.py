@@ -0,0 +1,49 @@
+"""
+Returning Writes
+INSERT and UPDATE that hand back the written rows in the same statement, so a write route needs
+no refresh() or re-query after it commits
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import Column, Table, insert, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ColumnElement
+
+# SQL Server rejects OUTPUT without INTO on tables that have triggers; keep these helpers off those
+
+
+def insert_returning(
+    db: Session, table: Table, rows: List[Dict], columns: Optional[Sequence[Column]] = None
+) -> List[Row]:
+    """INSERT rows (dicts keyed by column name) and return them as stored, in the order given.
+
+    On SQL Server this is INSERT ... OUTPUT INSERTED.<columns>, so identity values and server
+    defaults (created_at, CreatedAt, StatusCode ...) come back without a SELECT; several rows go
+    as one multi-row INSERT. columns defaults to every column of the table; pass the response
+    columns to keep long text the caller just sent from being echoed back unused.
+    """
+    if not rows:
+        return []
+    stmt = insert(table).returning(*(columns or table.c), sort_by_parameter_order=len(rows) > 1)
+    if len(rows) == 1:
+        return [db.execute(stmt.values(rows[0])).one()]
+    return list(db.execute(stmt, rows).all())
+
+
+def update_returning(
+    db: Session,
+    table: Table,
+    where: ColumnElement,
+    values: Dict,
+    columns: Optional[Sequence[Column]] = None,
+) -> Optional[Row]:
+    """UPDATE the single row matched by where and return it after the update, or None if no row matched.
+
+    UPDATE ... OUTPUT INSERTED.<columns> on SQL Server. Conditions that used to be a read before
+    the write (exists, still a draft) can go into where; only a None result needs a follow-up
+    read to tell the caller which one failed.
+    """
+    stmt = update(table).where(where).values(values).returning(*(columns or table.c))
+    return db.execute(stmt).one_or_none()
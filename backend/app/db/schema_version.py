@@ -0,0 +1,56 @@
+"""
+Schema Version Check
+Compares the Alembic revision stamped in the database with the newest migration on disk
+"""
+
+import logging
+import os
+from typing import Optional
+
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "alembic")
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def expected_schema_revision() -> Optional[str]:
+    """Head revision of the migration scripts; read from disk, no database access."""
+    return ScriptDirectory(MIGRATIONS_DIR).get_current_head()
+
+
+def current_schema_revision(engine: Engine) -> Optional[str]:
+    """Revision stamped by `alembic upgrade`, or None when the database was never migrated."""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT version_num FROM dbo.alembic_version")).scalar()
+    except SQLAlchemyError:
+        return None
+
+
+def check_schema_version(engine: Engine, mode: str = "warn") -> None:
+    """One query against dbo.alembic_version instead of reflecting every table at startup.
+
+    mode "warn" logs a mismatch, "strict" raises SchemaVersionError, "off" skips the check.
+    """
+    if mode == "off":
+        return
+    expected = expected_schema_revision()
+    current = current_schema_revision(engine)
+    if current == expected:
+        return
+    message = (
+        f"Database schema is at revision {current or 'none'}, expected {expected}; "
+        "run `alembic upgrade head` from backend/"
+    )
+    if mode == "strict":
+        raise SchemaVersionError(message)
+    logger.warning(message)
@@ -117,6 +117,42 @@ class IdeaOut(BaseModel):
         from_attributes = True
 
 
+class IdeaLeaderboardItem(BaseModel):
+    rank: int
+    idea_seq: int
+    idea_code: Optional[str] = None
+    category_idea_type1: Optional[str] = None
+    idea_name: Optional[str] = None
+    idea_score: int
+
+    class Config:
+        from_attributes = True
+
+
+class IdeaLeaderboardResponse(BaseModel):
+    items: List[IdeaLeaderboardItem]
+    limit: int
+    next_after_rank: Optional[int] = None
+
+
+class IdeaTombstoneOut(BaseModel):
+    idea_seq: int
+    idea_code: Optional[str] = None
+    deleted_datetime: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class IdeaChangesResponse(BaseModel):
+    since: Optional[datetime] = None
+    watermark: datetime
+    limit: int
+    next_after_seq: Optional[int] = None
+    upserts: List[IdeaOut]
+    deleted: List[IdeaTombstoneOut]
+
+
 class ProjectSubmissionMemberIn(BaseModel):
     EmpCode: str = Field(..., min_length=1, max_length=20)
     FullNameTh: str = Field(..., min_length=1, max_length=200)
@@ -1,11 +1,11 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 from fastapi.openapi.utils import get_openapi
 
 from app.api.routes import router as api_router
-from app.db.database import Base, engine
-from app.db import models  # ensure models are imported for table creation
+from app.db.database import engine, read_your_writes
+from app.db.schema_version import check_schema_version
 from app.core.config import get_settings
 
 
@@ -36,7 +36,19 @@ allowed_origins = settings.get_cors_allow_origins() or [
 
 @app.on_event("startup")
 def on_startup() -> None:
-    Base.metadata.create_all(bind=engine)
+    # Tables are created and changed by `alembic upgrade head` (the migrate service in
+    # docker-compose.yml), once per deploy rather than on every worker boot
+    check_schema_version(engine, settings.schema_version_check)
+
+
+@app.middleware("http")
+async def remember_writers(request: Request, call_next):
+    response = await call_next(request)
+    # Keeps this client's reads on the primary until the replica has its write; only routes
+    # that declare records_write count, so logins and read-only POSTs do not pin a client
+    if getattr(request.state, "records_write", False) and response.status_code < 400:
+        read_your_writes.mark_write(request, response)
+    return response
 
 
 def custom_openapi():
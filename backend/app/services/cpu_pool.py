@@ -0,0 +1,99 @@
+"""
+CPU Task Pool
+Runs CPU-bound import parsing and export rendering in separate processes, so the GIL of the
+API process stays free for request handling. Despite the name there are no standing workers:
+every task gets a freshly spawned process, and the pool only caps how many run at once.
+"""
+
+import multiprocessing
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from app.core.config import get_settings
+
+
+settings = get_settings()
+
+_POLL_SECONDS = 0.2
+
+
+class TaskCancelled(Exception):
+    """The task was cancelled by its caller before it finished."""
+
+
+class TaskTimeout(Exception):
+    """The task ran longer than the pool's timeout and was stopped."""
+
+
+def _run_task(conn, func: Callable, args: tuple) -> None:
+    try:
+        outcome = ("ok", func(*args))
+    except BaseException as e:  # noqa: BLE001
+        outcome = ("error", e)
+    try:
+        conn.send(outcome)
+    except Exception as e:  # result or exception could not be pickled
+        conn.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+    finally:
+        conn.close()
+
+
+class CpuTaskPool:
+    """Process-per-task runner: each task runs in its own spawned process, at most max_workers
+    at a time. No process is reused.
+
+    A process per task costs a second or so to start (it re-imports pandas, numpy and
+    SQLAlchemy), which is why callers send only work that takes much longer than that and
+    handle small inputs in-process (see EXPORT_OFFLOAD_MIN_ROWS, IMPORT_OFFLOAD_MIN_BYTES). In exchange a task can be stopped at any point:
+    cancel_event or the timeout terminates the process instead of waiting for it. Callers
+    block while the task runs, so call run() from a worker thread, never the event loop.
+    Arguments and results are pickled; pass file paths rather than large data.
+    """
+
+    def __init__(self, max_workers: int, timeout_seconds: int):
+        self.timeout_seconds = timeout_seconds
+        self._context = multiprocessing.get_context("spawn")
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def run(self, func: Callable, *args, cancel_event: Optional[threading.Event] = None) -> Any:
+        deadline = time.monotonic() + self.timeout_seconds
+        while not self._slots.acquire(timeout=_POLL_SECONDS):
+            self._check_stop(cancel_event, deadline)
+        try:
+            return self._run_in_process(func, args, cancel_event, deadline)
+        finally:
+            self._slots.release()
+
+    def _run_in_process(self, func, args, cancel_event, deadline) -> Any:
+        receiver, sender = self._context.Pipe(duplex=False)
+        process = self._context.Process(target=_run_task, args=(sender, func, args), daemon=True)
+        process.start()
+        sender.close()
+        try:
+            while not receiver.poll(_POLL_SECONDS):
+                if not process.is_alive() and not receiver.poll():
+                    raise RuntimeError(f"Worker process exited with code {process.exitcode}")
+                self._check_stop(cancel_event, deadline)
+            status, value = receiver.recv()
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        if status == "error":
+            raise value
+        return value
+
+    @staticmethod
+    def _check_stop(cancel_event: Optional[threading.Event], deadline: float) -> None:
+        if cancel_event is not None and cancel_event.is_set():
+            raise TaskCancelled("Task cancelled")
+        if time.monotonic() > deadline:
+            raise TaskTimeout("Task timed out")
+
+
+cpu_task_pool = CpuTaskPool(
+    max_workers=settings.cpu_pool_workers,
+    timeout_seconds=settings.cpu_task_timeout_seconds,
+)
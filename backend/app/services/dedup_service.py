@@ -0,0 +1,289 @@
+import re
+import threading
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db import models
+from app.services.idea_cache import SNAPSHOT_WATERMARK_OVERLAP
+
+
+settings = get_settings()
+
+
+# 128 permutations split into 32 bands x 4 rows puts the LSH S-curve knee near
+# Jaccard ~0.42, so pairs around the 0.8 threshold collide with near certainty
+NUM_PERMUTATIONS = 128
+NUM_BANDS = 32
+ROWS_PER_BAND = NUM_PERMUTATIONS // NUM_BANDS
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_WORD_RE = re.compile(r"[^\wก-๙ ]+")
+
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def normalize_idea_text(idea_name: Optional[str], idea_detail: Optional[str]) -> str:
+    """Lower-case, strip punctuation and collapse whitespace of idea_name + idea_detail."""
+    combined = f"{idea_name or ''} {idea_detail or ''}".lower()
+    combined = _NON_WORD_RE.sub(" ", combined)
+    return _WHITESPACE_RE.sub(" ", combined).strip()
+
+
+def _shingles(text_value: str) -> Set[int]:
+    # Character shingles rather than word shingles: Thai text has no spaces between words
+    if len(text_value) <= SHINGLE_SIZE:
+        return {zlib.crc32(text_value.encode("utf-8"))} if text_value else set()
+    return {
+        zlib.crc32(text_value[i:i + SHINGLE_SIZE].encode("utf-8"))
+        for i in range(len(text_value) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash_signature(text_value: str) -> Optional[np.ndarray]:
+    """Return the MinHash signature of a normalized text, or None for empty text."""
+    shingles = _shingles(text_value)
+    if not shingles:
+        return None
+    values = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+    hashed = (np.outer(values, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return hashed.min(axis=0)
+
+
+def idea_signature(idea_name: Optional[str], idea_detail: Optional[str]) -> Optional[np.ndarray]:
+    """MinHash signature of an idea's name + detail, or None when both are empty."""
+    return minhash_signature(normalize_idea_text(idea_name, idea_detail))
+
+
+def estimate_similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERMUTATIONS
+
+
+def _band_keys(signature: np.ndarray) -> List[Tuple[int, bytes]]:
+    return [
+        (band, signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes())
+        for band in range(NUM_BANDS)
+    ]
+
+
+class IdeaDedupIndex:
+    """In-process MinHash/LSH index over the idea tank.
+
+    Candidate lookup only touches the LSH buckets the query falls into, so checking a row
+    against the tank does not scan every existing idea. The first check hashes the whole tank;
+    after that, when the tank watermark (row count + max update_datetime) moves, only rows
+    updated since the last seen max are re-hashed and rows listed in dbo.idea_tank_tombstone
+    are dropped, like the idea snapshot. A full rebuild only happens when the row count still
+    disagrees. This keeps several uvicorn workers consistent without cross-process signalling.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[int, bytes], Set[int]] = defaultdict(set)
+        self._signatures: Dict[int, np.ndarray] = {}
+        # Every idea_seq seen, including ideas without text (and so without a signature)
+        self._seqs: Set[int] = set()
+        self._row_count: Optional[int] = None
+        self._max_updated: Optional[datetime] = None
+
+    def _clear(self) -> None:
+        self._buckets = defaultdict(set)
+        self._signatures = {}
+        self._seqs = set()
+
+    def _add(self, key: int, signature: np.ndarray) -> None:
+        self._signatures[key] = signature
+        for band_key in _band_keys(signature):
+            self._buckets[band_key].add(key)
+
+    def _remove(self, key: int) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band_key in _band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def _put(self, idea_seq: int, idea_name: Optional[str], idea_detail: Optional[str]) -> None:
+        signature = idea_signature(idea_name, idea_detail)
+        self._remove(idea_seq)
+        if signature is not None:
+            self._add(idea_seq, signature)
+        self._seqs.add(idea_seq)
+
+    def _advance(self, updated_at: Optional[datetime]) -> None:
+        if updated_at is not None and (self._max_updated is None or updated_at > self._max_updated):
+            self._max_updated = updated_at
+
+    def _candidates(self, signature: np.ndarray) -> Set[int]:
+        found: Set[int] = set()
+        for band_key in _band_keys(signature):
+            found.update(self._buckets.get(band_key, ()))
+        return found
+
+    def _matches(self, signature: np.ndarray, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        matches = []
+        for key in self._candidates(signature):
+            if key == exclude:
+                continue
+            similarity = estimate_similarity(signature, self._signatures[key])
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda item: (-item[1], item[0]))
+        return matches
+
+    @staticmethod
+    def _current_watermark(db: Session):
+        return db.query(
+            func.count(models.IdeaTank.idea_seq),
+            func.max(models.IdeaTank.update_datetime),
+        ).one()
+
+    def _load(self, db: Session, since: Optional[datetime]) -> None:
+        query = db.query(
+            models.IdeaTank.idea_seq,
+            models.IdeaTank.idea_name,
+            models.IdeaTank.idea_detail,
+            models.IdeaTank.update_datetime,
+        )
+        if since is None:
+            self._clear()
+        else:
+            query = query.filter(models.IdeaTank.update_datetime >= since - SNAPSHOT_WATERMARK_OVERLAP)
+        for idea_seq, idea_name, idea_detail, updated_at in query.yield_per(1000):
+            self._put(idea_seq, idea_name, idea_detail)
+            self._advance(updated_at)
+
+    def ensure_fresh(self, db: Session) -> None:
+        """Bring the index up to date with the database if the idea tank changed since the last check."""
+        row_count, max_updated = self._current_watermark(db)
+        with self._lock:
+            if self._row_count is not None and (row_count, max_updated) == (self._row_count, self._max_updated):
+                return
+            since = self._max_updated if self._row_count is not None else None
+            self._load(db, since=since)
+            if since is not None:
+                deleted_seqs = {
+                    seq for (seq,) in db.query(models.IdeaTankTombstone.idea_seq).filter(
+                        models.IdeaTankTombstone.deleted_datetime >= since - SNAPSHOT_WATERMARK_OVERLAP
+                    )
+                }
+                for idea_seq in deleted_seqs & self._seqs:
+                    self._remove(idea_seq)
+                    self._seqs.discard(idea_seq)
+                if len(self._seqs) != row_count:
+                    self._max_updated = None
+                    self._load(db, since=None)
+            self._row_count = row_count
+            self._max_updated = max_updated
+
+    def index_idea(
+        self,
+        idea_seq: int,
+        idea_name: Optional[str],
+        idea_detail: Optional[str],
+        updated_at: Optional[datetime] = None,
+    ) -> None:
+        """Index an idea this worker just created or edited, and move the watermark past the write.
+
+        Pass the idea's update_datetime so the next ensure_fresh sees the tank it expects and
+        does not re-read it.
+        """
+        with self._lock:
+            if self._row_count is None:
+                # Never loaded; the first ensure_fresh reads the whole tank anyway
+                return
+            if idea_seq not in self._seqs:
+                self._row_count += 1
+            self._put(idea_seq, idea_name, idea_detail)
+            self._advance(updated_at)
+
+    def remove_idea(self, idea_seq: int) -> None:
+        with self._lock:
+            if idea_seq not in self._seqs:
+                return
+            self._remove(idea_seq)
+            self._seqs.discard(idea_seq)
+            self._row_count -= 1
+
+    def find_duplicates(self, idea_name: Optional[str], idea_detail: Optional[str]) -> List[Tuple[int, float]]:
+        """Return (idea_seq, estimated_similarity) of existing ideas that look like this one."""
+        return self.find_signature_duplicates(idea_signature(idea_name, idea_detail))
+
+    def find_signature_duplicates(self, signature: Optional[np.ndarray]) -> List[Tuple[int, float]]:
+        """find_duplicates for a signature computed elsewhere (see idea_signature)."""
+        if signature is None:
+            return []
+        with self._lock:
+            return self._matches(signature)
+
+    def duplicate_groups(self) -> List[List[Tuple[int, float]]]:
+        """Group every indexed idea with its near-duplicates; singletons are left out."""
+        with self._lock:
+            seen: Set[int] = set()
+            groups = []
+            for key in sorted(self._signatures):
+                if key in seen:
+                    continue
+                matches = [m for m in self._matches(self._signatures[key], exclude=key) if m[0] not in seen]
+                if not matches:
+                    continue
+                seen.add(key)
+                seen.update(m[0] for m in matches)
+                groups.append([(key, 1.0)] + matches)
+            return groups
+
+
+class ImportDedupBatch:
+    """Tracks rows of one import so duplicates inside the same file are caught as well.
+
+    Takes the signatures the import parse process computed, so no hashing happens here.
+    Every tracked row costs about 6 KB (signature plus its 32 LSH bucket entries), so only the
+    first max_in_file_rows rows are tracked; later rows are still checked against the tank and
+    those rows, which keeps a chunked import's memory flat however long the file is.
+    """
+
+    def __init__(self, index: IdeaDedupIndex, max_in_file_rows: Optional[int] = None):
+        self._index = index
+        self._local = IdeaDedupIndex(threshold=index.threshold)
+        self.max_in_file_rows = (
+            settings.import_dedup_in_file_max_rows if max_in_file_rows is None else max_in_file_rows
+        )
+        self._tracked = 0
+
+    def check(self, row_no: int, idea_name: Optional[str], signature: Optional[np.ndarray]) -> Optional[dict]:
+        if signature is None:
+            return None
+        existing = self._index.find_signature_duplicates(signature)
+        in_file = self._local.find_signature_duplicates(signature) if self._tracked else []
+        if self._tracked < self.max_in_file_rows:
+            self._local._add(row_no, signature)
+            self._tracked += 1
+        if not existing and not in_file:
+            return None
+        return {
+            "row": row_no,
+            "idea_name": idea_name,
+            "matches_idea_seq": [seq for seq, _ in existing],
+            "matches_rows": [seq for seq, _ in in_file],
+            "similarity": max([s for _, s in existing + in_file]),
+        }
+
+
+idea_dedup_index = IdeaDedupIndex()
@@ -0,0 +1,129 @@
+"""
+Export Artifact Cache
+Keeps rendered export files on disk, keyed by endpoint, filters and a data watermark
+"""
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from app.core.config import get_settings
+
+
+settings = get_settings()
+
+EXPORT_CACHE_READ_BYTES = 64 * 1024
+# How often a streamed render checks its file for new bytes
+EXPORT_TAIL_POLL_SECONDS = 0.2
+
+
+class ExportArtifactCache:
+    """Rendered exports are written to disk while they stream to the first client.
+
+    The cache key includes a data watermark, so a changed table produces a new key; stale
+    files are never served and are pruned once more than max_files artifacts exist.
+    """
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+
+    @staticmethod
+    def make_key(endpoint: str, params: dict, watermark: Any) -> str:
+        raw = json.dumps([endpoint, params, watermark], sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{key}.{suffix}")
+
+    def get(self, key: str, suffix: str) -> Optional[str]:
+        path = self._path(key, suffix)
+        return path if os.path.exists(path) else None
+
+    def read(self, path: str) -> Iterator[bytes]:
+        with open(path, "rb") as artifact:
+            while True:
+                chunk = artifact.read(EXPORT_CACHE_READ_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+
+    def store(self, key: str, suffix: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Pass chunks through while writing them; the file only appears once it is complete."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, part_path = tempfile.mkstemp(dir=self.directory, prefix=f"{key}.", suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as artifact:
+                for chunk in chunks:
+                    artifact.write(chunk)
+                    yield chunk
+            os.replace(part_path, self._path(key, suffix))
+            self._prune()
+        finally:
+            # Left behind when the client disconnects or rendering fails
+            if os.path.exists(part_path):
+                os.unlink(part_path)
+
+    def render_streaming(self, key: str, suffix: str, write: Callable[[str], None]) -> Iterator[bytes]:
+        """Run write(part_path) on a thread and stream the file while it grows.
+
+        The artifact is published once write returns, even if the client disconnected
+        meanwhile; an exception from write is raised to the reader after the bytes so far.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, part_path = tempfile.mkstemp(dir=self.directory, prefix=f"{key}.", suffix=".part")
+        os.close(fd)
+        done = threading.Event()
+        failure: List[BaseException] = []
+
+        def run() -> None:
+            try:
+                write(part_path)
+                os.replace(part_path, self._path(key, suffix))
+                self._prune()
+            except BaseException as e:  # noqa: BLE001
+                failure.append(e)
+                if os.path.exists(part_path):
+                    os.unlink(part_path)
+            finally:
+                done.set()
+
+        # Open before the writer starts, so the reader keeps the file after it is renamed
+        artifact = open(part_path, "rb")
+        threading.Thread(target=run, name="export-render", daemon=True).start()
+        with artifact:
+            while True:
+                finished = done.is_set()
+                chunk = artifact.read(EXPORT_CACHE_READ_BYTES)
+                if chunk:
+                    yield chunk
+                elif finished:
+                    break
+                else:
+                    done.wait(EXPORT_TAIL_POLL_SECONDS)
+        if failure:
+            raise failure[0]
+
+    def _prune(self) -> None:
+        artifacts = [
+            path for path in glob.glob(os.path.join(self.directory, "*.*"))
+            if not path.endswith(".part")
+        ]
+        if len(artifacts) <= self.max_files:
+            return
+        artifacts.sort(key=os.path.getmtime)
+        for path in artifacts[:len(artifacts) - self.max_files]:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+export_artifact_cache = ExportArtifactCache(
+    directory=settings.export_cache_dir or os.path.join(tempfile.gettempdir(), "eventcategorize_exports"),
+    max_files=settings.export_cache_max_files,
+)
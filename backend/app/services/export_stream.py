@@ -0,0 +1,77 @@
+"""
+Streaming Export Formats
+CSV and NDJSON row writers plus on-the-fly gzip, for exports sent through StreamingResponse
+"""
+
+import csv
+import io
+import json
+import zlib
+from typing import Iterable, Iterator, Sequence
+
+from app.services.xlsx_stream import XLSX_MEDIA_TYPE, iter_xlsx
+
+
+EXPORT_FORMATS = ("xlsx", "csv", "ndjson")
+EXPORT_MEDIA_TYPES = {
+    "xlsx": XLSX_MEDIA_TYPE,
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+EXPORT_FLUSH_ROWS = 500
+GZIP_LEVEL = 6
+
+
+def iter_csv(header: Sequence[str], rows: Iterable[Sequence], flush_rows: int = EXPORT_FLUSH_ROWS) -> Iterator[bytes]:
+    """Yield UTF-8 CSV with a BOM, so Excel opens Thai headers and text correctly."""
+    yield b"\xef\xbb\xbf"
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    pending = 0
+    for values in rows:
+        writer.writerow(values)
+        pending += 1
+        if pending >= flush_rows:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+def iter_ndjson(keys: Sequence[str], rows: Iterable[Sequence], flush_rows: int = EXPORT_FLUSH_ROWS) -> Iterator[bytes]:
+    """Yield one JSON object per line; datetimes and decimals are written with str()."""
+    pending = []
+    for values in rows:
+        pending.append(json.dumps(dict(zip(keys, values)), ensure_ascii=False, default=str))
+        if len(pending) >= flush_rows:
+            yield ("\n".join(pending) + "\n").encode("utf-8")
+            pending = []
+    if pending:
+        yield ("\n".join(pending) + "\n").encode("utf-8")
+
+
+def iter_gzip(chunks: Iterable[bytes], level: int = GZIP_LEVEL) -> Iterator[bytes]:
+    """Compress a byte stream into a single gzip member as it is produced."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_export(
+    export_format: str,
+    sheet_name: str,
+    keys: Sequence[str],
+    header: Sequence[str],
+    rows: Iterable[Sequence],
+) -> Iterator[bytes]:
+    """Render rows in the requested format; NDJSON is keyed by column name, the others use header."""
+    if export_format == "csv":
+        return iter_csv(header, rows)
+    if export_format == "ndjson":
+        return iter_ndjson(keys, rows)
+    return iter_xlsx(sheet_name, header, rows)
@@ -0,0 +1,71 @@
+"""
+HTML to Text
+Converts rich-text editor HTML into readable plain text for exports, search and LLM prompts
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+
+_BLOCK_TAGS = {
+    "address", "article", "blockquote", "div", "dl", "dt", "dd", "footer", "h1", "h2", "h3",
+    "h4", "h5", "h6", "header", "hr", "li", "ol", "p", "pre", "section", "table", "tr", "ul",
+}
+_SKIP_TAGS = {"script", "style", "head", "title"}
+_INLINE_SPACE_RE = re.compile(r"[ \t\r\f\v ]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "br":
+            self.parts.append("\n")
+        elif tag == "li":
+            self.parts.append("\n- ")
+        elif tag in ("td", "th"):
+            self.parts.append(" ")
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == "br":
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in _BLOCK_TAGS and tag != "li":
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(value: Optional[str]) -> Optional[str]:
+    """Return the visible text of an HTML fragment, keeping paragraph and list breaks."""
+    if value is None:
+        return None
+    extractor = _TextExtractor()
+    extractor.feed(str(value))
+    extractor.close()
+    lines = [_INLINE_SPACE_RE.sub(" ", line).strip() for line in "".join(extractor.parts).split("\n")]
+    text_value = _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+    return text_value or None
+
+
+def plain_text_values(values: Dict, column_map: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Plain-text companion column values for the HTML columns present in values."""
+    return {
+        text_column: html_to_text(values[html_column])
+        for html_column, text_column in column_map.items()
+        if html_column in values
+    }
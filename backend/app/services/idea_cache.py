@@ -0,0 +1,236 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db import models
+from app.db.database import SessionLocal
+from app.db.schemas import IdeaOut
+from app.services.row_json import row_to_json, schema_columns
+
+
+settings = get_settings()
+
+
+class TTLCache:
+    """Small thread-safe cache whose entries expire after a fixed number of seconds."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Hash arbitrary JSON-serializable filter values into a stable cache key."""
+        raw = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Drop the entry closest to expiry rather than tracking full LRU order
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Snapshot rows are plain Core rows of the IdeaOut columns, serialized with orjson
+IDEA_OUT_COLUMNS = schema_columns(models.IdeaTank.__table__, IdeaOut)
+IDEA_OUT_KEYS = [column.name for column in IDEA_OUT_COLUMNS]
+
+
+class IdeaSnapshotEntry(NamedTuple):
+    json_bytes: bytes
+    idea_code: Optional[str]
+    idea_score: Optional[int]
+    category_idea_type1: Optional[str]
+    idea_status_md: Optional[str]
+    search_text: str
+
+
+# Rows written with an application clock slightly behind the database clock can carry an
+# update_datetime below the watermark; re-reading this window keeps them from being missed
+SNAPSHOT_WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+class IdeaSnapshot:
+    """In-process copy of dbo.idea_tank with each row pre-serialized as IdeaOut JSON.
+
+    The first read loads the whole tank. Later refreshes only re-read rows whose
+    update_datetime moved past the watermark, drop rows listed in dbo.idea_tank_tombstone,
+    and fall back to a full reload when the row count still disagrees. Writes in this
+    worker mark the snapshot dirty; other workers pick them up within
+    idea_snapshot_refresh_seconds.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[int, IdeaSnapshotEntry] = {}
+        self._seq_by_code: Dict[str, int] = {}
+        self._sorted_seqs: List[int] = []
+        self._watermark: Optional[datetime] = None
+        self._checked_at = 0.0
+        self._dirty = True
+
+    @staticmethod
+    def _build_entry(idea) -> IdeaSnapshotEntry:
+        search_text = " ".join(
+            value for value in (idea.idea_keywords, idea.idea_name, idea.idea_detail, idea.idea_code) if value
+        ).lower()
+        return IdeaSnapshotEntry(
+            json_bytes=row_to_json(IDEA_OUT_KEYS, idea),
+            idea_code=idea.idea_code,
+            idea_score=idea.idea_score,
+            category_idea_type1=idea.category_idea_type1,
+            idea_status_md=idea.idea_status_md,
+            search_text=search_text,
+        )
+
+    def _reindex(self) -> None:
+        sorted_seqs = sorted(self._entries)
+        seq_by_code: Dict[str, int] = {}
+        for seq in sorted_seqs:
+            code = self._entries[seq].idea_code
+            if code is not None and code not in seq_by_code:
+                seq_by_code[code] = seq
+        self._sorted_seqs = sorted_seqs
+        self._seq_by_code = seq_by_code
+
+    def _load(self, db: Session, since: Optional[datetime]) -> None:
+        # Readers never take the lock, so build a new dict and swap it in at the end
+        query = db.query(*IDEA_OUT_COLUMNS)
+        if since is not None:
+            query = query.filter(models.IdeaTank.update_datetime >= since - SNAPSHOT_WATERMARK_OVERLAP)
+            entries = dict(self._entries)
+            watermark = self._watermark
+        else:
+            entries = {}
+            watermark = None
+        for idea in query.yield_per(500):
+            entries[idea.idea_seq] = self._build_entry(idea)
+            if watermark is None or idea.update_datetime > watermark:
+                watermark = idea.update_datetime
+        self._entries = entries
+        self._watermark = watermark
+        self._reindex()
+
+    def needs_refresh(self) -> bool:
+        return self._dirty or time.monotonic() - self._checked_at >= self.refresh_seconds
+
+    def refresh(self) -> None:
+        """ensure_fresh with a session of its own, for callers that have no sync session."""
+        db = SessionLocal()
+        try:
+            self.ensure_fresh(db)
+        finally:
+            db.close()
+
+    def ensure_fresh(self, db: Session) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if not self._dirty and now - self._checked_at < self.refresh_seconds:
+                return
+            if self._watermark is None:
+                self._load(db, since=None)
+            else:
+                since = self._watermark
+                self._load(db, since=since)
+                deleted_seqs = {
+                    seq for (seq,) in db.query(models.IdeaTankTombstone.idea_seq).filter(
+                        models.IdeaTankTombstone.deleted_datetime >= since - SNAPSHOT_WATERMARK_OVERLAP
+                    )
+                }
+                if deleted_seqs & self._entries.keys():
+                    self._entries = {
+                        seq: entry for seq, entry in self._entries.items() if seq not in deleted_seqs
+                    }
+                    self._reindex()
+                row_count = db.query(func.count(models.IdeaTank.idea_seq)).scalar()
+                if row_count != len(self._entries):
+                    self._load(db, since=None)
+            self._checked_at = now
+            self._dirty = False
+
+    def mark_dirty(self) -> None:
+        with self._lock:
+            self._dirty = True
+
+    def discard(self, idea_seq: int) -> None:
+        with self._lock:
+            if idea_seq in self._entries:
+                entries = dict(self._entries)
+                del entries[idea_seq]
+                self._entries = entries
+                self._reindex()
+            self._dirty = True
+
+    def get_json(self, idea_seq: int) -> Optional[bytes]:
+        entry = self._entries.get(idea_seq)
+        return entry.json_bytes if entry else None
+
+    def get_json_by_code(self, idea_code: str) -> Optional[bytes]:
+        seq = self._seq_by_code.get(idea_code)
+        return self.get_json(seq) if seq is not None else None
+
+    def list_json(
+        self,
+        keyword: Optional[str] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None,
+        category_idea_type1: Optional[str] = None,
+        idea_status_md: Optional[str] = None,
+    ) -> bytes:
+        """Same filters and ordering as _filter_ideas in the routes, rendered as a JSON array."""
+        keyword_lower = keyword.lower() if keyword else None
+        entries = self._entries
+        parts = []
+        for seq in self._sorted_seqs:
+            entry = entries.get(seq)
+            if entry is None:
+                continue
+            if keyword_lower and keyword_lower not in entry.search_text:
+                continue
+            if min_score is not None and (entry.idea_score is None or entry.idea_score < min_score):
+                continue
+            if max_score is not None and (entry.idea_score is None or entry.idea_score > max_score):
+                continue
+            if category_idea_type1 and entry.category_idea_type1 != category_idea_type1:
+                continue
+            if idea_status_md and entry.idea_status_md != idea_status_md:
+                continue
+            parts.append(entry.json_bytes)
+        return b"[" + b",".join(parts) + b"]"
+
+
+idea_facet_cache = TTLCache(ttl_seconds=settings.idea_facet_cache_ttl_seconds)
+idea_snapshot = IdeaSnapshot(refresh_seconds=settings.idea_snapshot_refresh_seconds)
+
+
+def invalidate_idea_caches() -> None:
+    """Call after any committed write to dbo.idea_tank."""
+    idea_facet_cache.clear()
+    idea_snapshot.mark_dirty()
@@ -0,0 +1,655 @@
+"""
+Idea Import Service
+Streams tabular uploads (Excel, CSV, Parquet, NDJSON) into dbo.idea_tank in bounded-memory chunks
+"""
+
+import json
+import os
+import pickle
+import struct
+import tempfile
+import threading
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from fastapi import UploadFile
+from sqlalchemy import Column, MetaData, String, Table, text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db import models
+from app.db.bulk import bulk_insert
+from app.services.cpu_pool import cpu_task_pool
+from app.services.dedup_service import idea_dedup_index, idea_signature, ImportDedupBatch
+
+
+settings = get_settings()
+
+
+IDEA_IMPORT_COLUMNS = [
+    "idea_code", "category_idea_type1", "idea_name", "idea_subject", "idea_source",
+    "customer_target", "idea_inno_type", "idea_detail", "idea_finance_impact",
+    "idea_nonfinance_impact", "idea_status", "idea_owner_empcode", "idea_owner_empname",
+    "idea_owner_deposit", "idea_owner_contacts", "idea_keywords", "idea_comment",
+    "idea_summary_byai",
+]
+
+# JSON lines often leave out keys whose value is empty; only these must appear in the file
+NDJSON_REQUIRED_KEYS = ["idea_name"]
+
+IMPORT_CHUNK_SIZE = 2000
+
+# Smaller uploads are parsed in the request's own process; starting a parse process would cost
+# more than the parse itself
+IMPORT_OFFLOAD_MIN_BYTES = settings.import_offload_min_kb * 1024
+
+# Spooled chunks are length-prefixed, so the writer can tell a complete chunk from one the
+# parse process is still writing
+_SPOOL_FRAME_HEADER = struct.Struct("<Q")
+SPOOL_POLL_SECONDS = 0.1
+UPLOAD_SPOOL_CHUNK_BYTES = 1024 * 1024
+
+IMPORT_MODES = ("insert", "upsert")
+
+# Columns compared by the upsert content hash; idea_code is the merge key
+IDEA_UPSERT_HASH_COLUMNS = [col for col in IDEA_IMPORT_COLUMNS if col != "idea_code"]
+
+# Session-scoped temp table holding one chunk while it is merged into dbo.idea_tank;
+# column types mirror idea_tank
+STAGE_TABLE_NAME = "#idea_import_stage"
+_stage_table = Table(
+    STAGE_TABLE_NAME,
+    MetaData(),
+    *[Column(col, models.IdeaTank.__table__.c[col].type) for col in IDEA_IMPORT_COLUMNS],
+)
+
+
+# Sized columns of idea_tank; longer values would fail the whole chunk on insert
+IDEA_COLUMN_MAX_LENGTHS = {
+    col: models.IdeaTank.__table__.c[col].type.length
+    for col in IDEA_IMPORT_COLUMNS
+    if isinstance(models.IdeaTank.__table__.c[col].type, String)
+    and models.IdeaTank.__table__.c[col].type.length
+}
+
+
+class IdeaImportError(ValueError):
+    """Raised for uploads that cannot be imported at all (bad format, missing columns)."""
+
+
+class UploadTooLargeError(IdeaImportError):
+    """The upload is larger than settings.import_max_upload_mb."""
+
+
+class ImportProgress:
+    """Receives row counts and rejected rows while an import runs; the base class ignores them."""
+
+    def parsed(self, count: int) -> None:
+        pass
+
+    def validated(self, count: int) -> None:
+        pass
+
+    def inserted(self, count: int) -> None:
+        pass
+
+    def rejected(self, row_no: int, record: dict, reason: str) -> None:
+        pass
+
+
+def validate_record(record: dict) -> Optional[str]:
+    """Return why a normalized row cannot be stored, or None if it is fine."""
+    for col, max_length in IDEA_COLUMN_MAX_LENGTHS.items():
+        value = record.get(col)
+        if value is not None and len(value) > max_length:
+            return f"{col} exceeds {max_length} characters"
+    return None
+
+
+async def spool_upload(file: UploadFile) -> str:
+    """Copy an upload to a temporary file on disk in fixed-size chunks and return its path.
+
+    Raises UploadTooLargeError as soon as more than settings.import_max_upload_mb is read.
+    """
+    max_bytes = settings.import_max_upload_mb * 1024 * 1024
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    fd, path = tempfile.mkstemp(prefix="idea_import_", suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            written = 0
+            while True:
+                chunk = await file.read(UPLOAD_SPOOL_CHUNK_BYTES)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise UploadTooLargeError(f"File is larger than {settings.import_max_upload_mb} MB")
+                out.write(chunk)
+    except Exception:
+        os.unlink(path)
+        raise
+    return path
+
+
+def _check_header(header, file_kind: str = "Excel") -> List[Optional[str]]:
+    if header is None or len(header) == 0:
+        raise IdeaImportError(f"{file_kind} file is empty")
+    columns = [str(value).strip() if value is not None else None for value in header]
+    missing_columns = [col for col in IDEA_IMPORT_COLUMNS if col not in columns]
+    if missing_columns:
+        raise IdeaImportError(f"Missing required columns: {', '.join(missing_columns)}")
+    return columns
+
+
+def iter_xlsx_chunks(path: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Yield the first worksheet as DataFrames of at most chunk_size rows.
+
+    Uses openpyxl's read-only mode, which parses the sheet XML lazily instead of building
+    the whole workbook in memory. Cells keep the type openpyxl read (object dtype), so a
+    numeric code column with blanks is not coerced to float.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        columns = _check_header(next(rows, None))
+        wanted = [columns.index(col) for col in IDEA_IMPORT_COLUMNS]
+
+        buffer = []
+        row_numbers = []
+        for row_no, row in enumerate(rows, start=2):
+            if row is None or all(value is None for value in row):
+                continue
+            buffer.append([row[i] if i < len(row) else None for i in wanted])
+            row_numbers.append(row_no)
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame(buffer, index=row_numbers, columns=IDEA_IMPORT_COLUMNS, dtype=object)
+                buffer = []
+                row_numbers = []
+        if buffer:
+            yield pd.DataFrame(buffer, index=row_numbers, columns=IDEA_IMPORT_COLUMNS, dtype=object)
+    finally:
+        workbook.close()
+
+
+def _spreadsheet_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Index a 0-based frame by spreadsheet row (header is row 1) and drop the blank rows."""
+    df.index = df.index + 2
+    return df.dropna(how="all")
+
+
+def iter_xls_chunks(path: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    # Legacy .xls has no streaming reader; parse it whole and hand it out in chunks
+    df = pd.read_excel(path, dtype=object)
+    _check_header(list(df.columns))
+    df = _spreadsheet_rows(df[IDEA_IMPORT_COLUMNS])
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def iter_csv_chunks(path: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    # dtype=str keeps codes such as "0012" intact; utf-8-sig drops the BOM Excel puts in CSV exports.
+    # Blank lines are read (and dropped afterwards) so the running index stays the record number
+    try:
+        reader = pd.read_csv(
+            path, dtype=str, encoding="utf-8-sig", chunksize=chunk_size, skip_blank_lines=False
+        )
+    except pd.errors.EmptyDataError:
+        raise IdeaImportError("CSV file is empty")
+    with reader:
+        for chunk in reader:
+            chunk.columns = [str(col).strip() for col in chunk.columns]
+            _check_header(list(chunk.columns), "CSV")
+            chunk = _spreadsheet_rows(chunk[IDEA_IMPORT_COLUMNS])
+            if len(chunk):
+                yield chunk
+
+
+def _ndjson_chunk(objects: List[dict], line_numbers: List[int]) -> pd.DataFrame:
+    chunk = pd.DataFrame(objects, index=line_numbers, dtype=object)
+    missing_keys = [key for key in NDJSON_REQUIRED_KEYS if key not in chunk.columns]
+    if missing_keys:
+        raise IdeaImportError(f"Missing required keys: {', '.join(missing_keys)}")
+    return chunk.reindex(columns=IDEA_IMPORT_COLUMNS)
+
+
+def iter_ndjson_chunks(path: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """One JSON object per line; keys follow the same column contract as the spreadsheet header.
+
+    A line may leave keys out; they read as empty cells. Only NDJSON_REQUIRED_KEYS are checked.
+    Values keep their JSON type (object dtype) and rows are numbered by line; blank lines are
+    skipped.
+    """
+    if os.path.getsize(path) == 0:
+        raise IdeaImportError("NDJSON file is empty")
+    objects = []
+    line_numbers = []
+    with open(path, encoding="utf-8-sig") as lines:
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError as e:
+                raise IdeaImportError(f"Invalid NDJSON on line {line_no}: {str(e)}")
+            if not isinstance(value, dict):
+                raise IdeaImportError(f"Invalid NDJSON on line {line_no}: expected an object")
+            objects.append(value)
+            line_numbers.append(line_no)
+            if len(objects) >= chunk_size:
+                yield _ndjson_chunk(objects, line_numbers)
+                objects = []
+                line_numbers = []
+    if objects:
+        yield _ndjson_chunk(objects, line_numbers)
+
+
+def iter_parquet_chunks(path: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Read row-group batches of only the contract columns through pyarrow.
+
+    Rows are numbered from 1. Integer columns with nulls stay integers instead of turning
+    into floats.
+    """
+    import pyarrow.parquet as pq
+
+    try:
+        parquet_file = pq.ParquetFile(path)
+    except Exception as e:
+        raise IdeaImportError(f"Invalid Parquet file: {str(e)}")
+    _check_header(parquet_file.schema_arrow.names, "Parquet")
+    first_row_no = 1
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=IDEA_IMPORT_COLUMNS):
+        chunk = batch.to_pandas(integer_object_nulls=True)
+        chunk.index = range(first_row_no, first_row_no + len(chunk))
+        first_row_no += len(chunk)
+        yield chunk
+
+
+# File extension -> chunk reader; every reader yields DataFrames with exactly IDEA_IMPORT_COLUMNS,
+# indexed by the row number the source file shows for each row
+IMPORT_READERS: Dict[str, Callable[..., Iterator[pd.DataFrame]]] = {
+    ".xlsx": iter_xlsx_chunks,
+    ".xls": iter_xls_chunks,
+    ".csv": iter_csv_chunks,
+    ".parquet": iter_parquet_chunks,
+    ".ndjson": iter_ndjson_chunks,
+    ".jsonl": iter_ndjson_chunks,
+}
+
+
+def get_import_reader(filename: Optional[str]) -> Optional[Callable[..., Iterator[pd.DataFrame]]]:
+    return IMPORT_READERS.get(os.path.splitext(filename or "")[1].lower())
+
+
+def normalize_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert every cell to str, keeping empty cells as None, column-wise instead of per row."""
+    # object dtype, so None stays None instead of becoming NaN under pandas' string dtype
+    as_text = df.astype(str).astype(object)
+    return as_text.where(df.notna(), None)
+
+
+class ParsedChunk(NamedTuple):
+    """Normalized rows of one chunk with their source row numbers, plus their MinHash
+    signatures when the import dedups."""
+
+    records: List[dict]
+    row_numbers: List[int]
+    signatures: Optional[List[Optional[np.ndarray]]] = None
+
+
+def parse_chunk(df: pd.DataFrame, with_signatures: bool = False) -> ParsedChunk:
+    records = normalize_chunk(df).to_dict("records")
+    row_numbers = [int(row_no) for row_no in df.index]
+    if not with_signatures:
+        return ParsedChunk(records, row_numbers)
+    signatures = [idea_signature(r["idea_name"], r["idea_detail"]) for r in records]
+    return ParsedChunk(records, row_numbers, signatures)
+
+
+def import_idea_chunks(
+    db: Session,
+    chunks: Iterator[ParsedChunk],
+    dedup_mode: str = "report",
+    progress: Optional[ImportProgress] = None,
+) -> dict:
+    """Insert normalized chunks into dbo.idea_tank, committing once per chunk.
+
+    A failing chunk is rolled back and reported by its row range; the chunks before and after
+    it are kept. Row numbers are the ones the source file shows: the spreadsheet row (header is
+    row 1), the NDJSON line, or the Parquet row counted from 1. create_datetime and
+    update_datetime come from the database default as each chunk is written, so a late chunk is
+    not stamped with the time the import started.
+    """
+    progress = progress or ImportProgress()
+    dedup_batch = None
+    if dedup_mode != "off":
+        idea_dedup_index.ensure_fresh(db)
+        dedup_batch = ImportDedupBatch(idea_dedup_index)
+
+    idea_table = models.IdeaTank.__table__
+    total_rows = 0
+    imported_count = 0
+    skipped_count = 0
+    duplicates = []
+    errors = []
+
+    for chunk in chunks:
+        records = chunk.records
+        row_numbers = chunk.row_numbers
+        total_rows += len(records)
+        progress.parsed(len(records))
+
+        values = []
+        value_rows = []
+        for offset, record in enumerate(records):
+            row_no = row_numbers[offset]
+            reason = validate_record(record)
+            if reason:
+                errors.append(f"Row {row_no}: {reason}")
+                progress.rejected(row_no, record, reason)
+                continue
+            if dedup_batch is not None:
+                signature = (
+                    chunk.signatures[offset] if chunk.signatures is not None
+                    else idea_signature(record["idea_name"], record["idea_detail"])
+                )
+                duplicate = dedup_batch.check(row_no, record["idea_name"], signature)
+                if duplicate:
+                    duplicates.append(duplicate)
+                    if dedup_mode == "skip":
+                        skipped_count += 1
+                        progress.rejected(row_no, record, _duplicate_reason(duplicate))
+                        continue
+            values.append(record)
+            value_rows.append(row_no)
+        progress.validated(len(values))
+
+        if not values:
+            continue
+        try:
+            bulk_insert(db, idea_table, values)
+            db.commit()
+            imported_count += len(values)
+            progress.inserted(len(values))
+        except Exception as e:
+            db.rollback()
+            errors.append(f"Rows {row_numbers[0]}-{row_numbers[-1]}: {str(e)}")
+            for row_no, record in zip(value_rows, values):
+                progress.rejected(row_no, record, str(e))
+
+    return {
+        "message": f"Successfully imported {imported_count} ideas",
+        "total_rows": total_rows,
+        "imported_count": imported_count,
+        "skipped_count": skipped_count,
+        "duplicates": duplicates,
+        "errors": errors,
+    }
+
+
+def _duplicate_reason(duplicate: dict) -> str:
+    matches = [f"idea_seq {seq}" for seq in duplicate["matches_idea_seq"]]
+    matches += [f"row {row}" for row in duplicate["matches_rows"]]
+    return f"Near-duplicate ({duplicate['similarity']:.2f}) of {', '.join(matches)}"
+
+
+def _content_hash_sql(alias: str) -> str:
+    # NCHAR(0) stands in for NULL so that NULL and '' hash differently; NCHAR(31) separates
+    # columns so that values cannot bleed into their neighbours
+    parts = []
+    for col in IDEA_UPSERT_HASH_COLUMNS:
+        if parts:
+            parts.append("NCHAR(31)")
+        parts.append(f"COALESCE(CAST({alias}.{col} AS NVARCHAR(MAX)), NCHAR(0))")
+    return f"HASHBYTES('SHA2_256', CONCAT({', '.join(parts)}))"
+
+
+def _build_merge_sql() -> str:
+    update_set = ",\n        ".join(f"t.{col} = s.{col}" for col in IDEA_UPSERT_HASH_COLUMNS)
+    insert_columns = ", ".join(IDEA_IMPORT_COLUMNS)
+    insert_values = ", ".join(f"s.{col}" for col in IDEA_IMPORT_COLUMNS)
+    # idea_code is not unique in idea_tank: each code merges into its lowest idea_seq only, so a
+    # staged row matches at most one target row
+    return f"""
+MERGE dbo.idea_tank WITH (HOLDLOCK) AS t
+USING (
+    SELECT stage.*, (
+        SELECT MIN(i.idea_seq) FROM dbo.idea_tank AS i WITH (UPDLOCK, HOLDLOCK)
+        WHERE i.idea_code = stage.idea_code
+    ) AS target_seq
+    FROM {STAGE_TABLE_NAME} AS stage
+) AS s
+    ON t.idea_seq = s.target_seq
+WHEN MATCHED AND {_content_hash_sql("t")} <> {_content_hash_sql("s")} THEN
+    UPDATE SET
+        {update_set},
+        t.update_datetime = GETDATE()
+WHEN NOT MATCHED BY TARGET THEN
+    INSERT ({insert_columns}, create_datetime, update_datetime)
+    VALUES ({insert_values}, GETDATE(), GETDATE())
+OUTPUT $action, s.idea_code;
+"""
+
+
+IDEA_MERGE_SQL = _build_merge_sql()
+
+
+def _stage_upsert_chunk(chunk: ParsedChunk, errors: List[str], progress: ImportProgress) -> Dict[str, tuple]:
+    """Valid records of a chunk keyed by idea_code, as (row number, record); the last row of a code wins."""
+    staged = {}
+    for row_no, record in zip(chunk.row_numbers, chunk.records):
+        reason = "idea_code is required for upsert" if not record["idea_code"] else validate_record(record)
+        if reason:
+            errors.append(f"Row {row_no}: {reason}")
+            progress.rejected(row_no, record, reason)
+            continue
+        staged[record["idea_code"]] = (row_no, record)
+    return staged
+
+
+def upsert_idea_chunks(
+    db: Session,
+    chunks: Iterator[ParsedChunk],
+    progress: Optional[ImportProgress] = None,
+) -> dict:
+    """Merge normalized chunks into dbo.idea_tank keyed on idea_code.
+
+    Each chunk is staged into a temp table and applied with one MERGE: unknown codes are
+    inserted, known codes are updated only when their content hash differs. A code that
+    several ideas share updates the one with the lowest idea_seq. Rows without idea_code
+    cannot be matched and are reported as errors. When a code repeats within a chunk, the
+    last row wins. Near-duplicate detection does not apply here, since every
+    re-imported row would match itself.
+    """
+    progress = progress or ImportProgress()
+    total_rows = 0
+    inserted_count = 0
+    updated_count = 0
+    unchanged_count = 0
+    errors = []
+
+    for chunk in chunks:
+        records = chunk.records
+        row_numbers = chunk.row_numbers
+        total_rows += len(records)
+        progress.parsed(len(records))
+
+        staged = _stage_upsert_chunk(chunk, errors, progress)
+        progress.validated(len(staged))
+
+        if not staged:
+            continue
+        try:
+            db.execute(text(
+                f"IF OBJECT_ID('tempdb..{STAGE_TABLE_NAME}') IS NOT NULL DROP TABLE {STAGE_TABLE_NAME}"
+            ))
+            _stage_table.create(db.connection())
+            bulk_insert(db, _stage_table, [record for _, record in staged.values()])
+            actions = db.execute(text(IDEA_MERGE_SQL)).all()
+            db.execute(text(f"DROP TABLE {STAGE_TABLE_NAME}"))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            errors.append(f"Rows {row_numbers[0]}-{row_numbers[-1]}: {str(e)}")
+            for row_no, record in staged.values():
+                progress.rejected(row_no, record, str(e))
+            continue
+
+        # Counted per distinct code, so the counts always add up to the staged codes
+        inserted = len({code for action, code in actions if action == "INSERT"})
+        updated = len({code for action, code in actions if action == "UPDATE"})
+        progress.inserted(inserted + updated)
+        inserted_count += inserted
+        updated_count += updated
+        unchanged_count += max(len(staged) - inserted - updated, 0)
+
+    return {
+        "message": f"Inserted {inserted_count}, updated {updated_count}, unchanged {unchanged_count} ideas",
+        "total_rows": total_rows,
+        "imported_count": inserted_count + updated_count,
+        "inserted_count": inserted_count,
+        "updated_count": updated_count,
+        "unchanged_count": unchanged_count,
+        "errors": errors,
+    }
+
+
+def parse_upload_to_spool(path: str, spool_path: str, with_signatures: bool = False) -> None:
+    """Append an uploaded file to spool_path as length-prefixed, pickled ParsedChunks.
+
+    Runs in the CPU task pool, so the pandas/openpyxl parsing, the cell normalization and the
+    MinHash hashing all happen outside the API process. Each chunk is flushed as soon as it is
+    parsed, so the API process can write it while the next one is parsed.
+    """
+    reader = get_import_reader(path)
+    with open(spool_path, "ab") as spool:
+        for chunk in reader(path):
+            payload = pickle.dumps(parse_chunk(chunk, with_signatures), protocol=pickle.HIGHEST_PROTOCOL)
+            spool.write(_SPOOL_FRAME_HEADER.pack(len(payload)) + payload)
+            spool.flush()
+
+
+def _read_spooled(spool, size: int, parse_done: Optional[threading.Event]) -> bytes:
+    """Read size bytes, waiting for the parse process to write them until parse_done is set."""
+    data = b""
+    while len(data) < size:
+        # Checked before reading: whatever was written before parse_done was set is read below
+        finished = parse_done is None or parse_done.is_set()
+        more = spool.read(size - len(data))
+        if more:
+            data += more
+        elif finished:
+            break
+        else:
+            parse_done.wait(SPOOL_POLL_SECONDS)
+    return data
+
+
+def iter_spooled_chunks(spool_path: str, parse_done: Optional[threading.Event] = None) -> Iterator[ParsedChunk]:
+    """Yield the chunks of a spool file; with parse_done, follow the file until it is set.
+
+    A chunk cut short (the parse process was stopped mid-write) ends the iteration.
+    """
+    with open(spool_path, "rb") as spool:
+        while True:
+            header = _read_spooled(spool, _SPOOL_FRAME_HEADER.size, parse_done)
+            if len(header) < _SPOOL_FRAME_HEADER.size:
+                return
+            (size,) = _SPOOL_FRAME_HEADER.unpack(header)
+            payload = _read_spooled(spool, size, parse_done)
+            if len(payload) < size:
+                return
+            yield pickle.loads(payload)
+
+
+def _iter_parsed_in_pool(
+    path: str, spool_path: str, with_signatures: bool, cancel_event: Optional[threading.Event]
+) -> Iterator[ParsedChunk]:
+    """Parse in the CPU task pool and yield each chunk as soon as the parse process spools it.
+
+    The pool call runs on a helper thread; its failure (TaskCancelled, TaskTimeout, a parse
+    error) is raised once the chunks spooled before it are consumed. Leaving the iteration
+    early, e.g. because the writer failed, stops the parse process.
+    """
+    parse_done = threading.Event()
+    stop = threading.Event()
+    failure: List[BaseException] = []
+
+    def parse() -> None:
+        try:
+            cpu_task_pool.run(parse_upload_to_spool, path, spool_path, with_signatures, cancel_event=stop)
+        except BaseException as e:  # noqa: BLE001
+            failure.append(e)
+        finally:
+            parse_done.set()
+
+    def stop_on_cancel() -> None:
+        # cancel_event belongs to the caller; the parse process is stopped through stop
+        while not parse_done.is_set():
+            if cancel_event.wait(SPOOL_POLL_SECONDS):
+                stop.set()
+                return
+
+    worker = threading.Thread(target=parse, name="idea-import-parse", daemon=True)
+    worker.start()
+    if cancel_event is not None:
+        threading.Thread(target=stop_on_cancel, name="idea-import-cancel", daemon=True).start()
+    try:
+        yield from iter_spooled_chunks(spool_path, parse_done)
+        worker.join()
+        if failure:
+            raise failure[0]
+    finally:
+        stop.set()
+        worker.join()
+
+
+def import_ideas_from_file(
+    db: Session,
+    path: str,
+    dedup_mode: str = "report",
+    mode: str = "insert",
+    progress: Optional[ImportProgress] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> dict:
+    """Parse the file, in the CPU task pool when it is large, and write its chunks with this session.
+
+    Chunks are written while later ones are still being parsed. Setting cancel_event stops
+    the parse process and raises TaskCancelled; chunks already written stay committed.
+    """
+    reader = get_import_reader(path)
+    if reader is None:
+        raise IdeaImportError(f"Unsupported file type: {os.path.splitext(path)[1]}")
+    with_signatures = mode == "insert" and dedup_mode != "off"
+    if os.path.getsize(path) < IMPORT_OFFLOAD_MIN_BYTES:
+        chunks = (parse_chunk(chunk, with_signatures) for chunk in reader(path))
+        return _write_idea_chunks(db, chunks, dedup_mode, mode, progress)
+
+    fd, spool_path = tempfile.mkstemp(prefix="idea_import_chunks_", suffix=".pkl")
+    os.close(fd)
+    try:
+        # The parent owns the spool file, so it is removed even when the parse process is killed
+        chunks = _iter_parsed_in_pool(path, spool_path, with_signatures, cancel_event)
+        try:
+            return _write_idea_chunks(db, chunks, dedup_mode, mode, progress)
+        finally:
+            chunks.close()
+    finally:
+        remove_spooled_file(spool_path)
+
+
+def _write_idea_chunks(
+    db: Session, chunks: Iterator[ParsedChunk], dedup_mode: str, mode: str, progress: Optional[ImportProgress]
+) -> dict:
+    if mode == "upsert":
+        return upsert_idea_chunks(db, chunks, progress=progress)
+    return import_idea_chunks(db, chunks, dedup_mode=dedup_mode, progress=progress)
+
+
+def remove_spooled_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
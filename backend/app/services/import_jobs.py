@@ -0,0 +1,194 @@
+"""
+Idea Import Jobs
+Runs bulk idea imports in the background and tracks their progress in-process
+"""
+
+import csv
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.core.config import get_settings
+from app.db.database import SessionLocal
+from app.services.cpu_pool import TaskCancelled, TaskTimeout
+from app.services.idea_cache import invalidate_idea_caches
+from app.services.idea_import import (
+    IDEA_IMPORT_COLUMNS,
+    IdeaImportError,
+    ImportProgress,
+    import_ideas_from_file,
+    remove_spooled_file,
+)
+
+
+settings = get_settings()
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+JOB_FINISHED = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class ImportJob(ImportProgress):
+    """State of one background import; rejected rows are appended to a CSV error file."""
+
+    def __init__(self, filename: str, dedup_mode: str, mode: str):
+        self.job_id = uuid.uuid4().hex
+        self.filename = filename
+        self.dedup_mode = dedup_mode
+        self.mode = mode
+        self.status = JOB_QUEUED
+        self.rows_parsed = 0
+        self.rows_validated = 0
+        self.rows_inserted = 0
+        self.rows_rejected = 0
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.error_file_path: Optional[str] = None
+        self._error_file = None
+        self._error_writer = None
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def parsed(self, count: int) -> None:
+        # Called before each chunk is written; chunks committed so far are kept
+        if self.cancel_event.is_set():
+            raise TaskCancelled("Import cancelled")
+        self.rows_parsed += count
+
+    def validated(self, count: int) -> None:
+        self.rows_validated += count
+
+    def inserted(self, count: int) -> None:
+        self.rows_inserted += count
+
+    def rejected(self, row_no: int, record: dict, reason: str) -> None:
+        with self._lock:
+            if self._error_writer is None:
+                fd, self.error_file_path = tempfile.mkstemp(prefix="idea_import_errors_", suffix=".csv")
+                # utf-8-sig so Excel opens Thai text correctly
+                self._error_file = os.fdopen(fd, "w", newline="", encoding="utf-8-sig")
+                self._error_writer = csv.writer(self._error_file)
+                self._error_writer.writerow(["row", "reason"] + IDEA_IMPORT_COLUMNS)
+            self._error_writer.writerow([row_no, reason] + [record.get(col) for col in IDEA_IMPORT_COLUMNS])
+            self.rows_rejected += 1
+
+    def close_error_file(self) -> None:
+        with self._lock:
+            if self._error_file is not None:
+                self._error_file.close()
+                self._error_file = None
+                self._error_writer = None
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "filename": self.filename,
+            "mode": self.mode,
+            "dedup_mode": self.dedup_mode,
+            "status": self.status,
+            "rows_parsed": self.rows_parsed,
+            "rows_validated": self.rows_validated,
+            "rows_inserted": self.rows_inserted,
+            "rows_rejected": self.rows_rejected,
+            "has_error_file": self.error_file_path is not None and self.status in JOB_FINISHED,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ImportJobManager:
+    """Queues imports on a small thread pool, each job with its own database session.
+
+    Jobs live in this process only, which matches the single uvicorn process the backend
+    runs as. Finished jobs and their error files are dropped after retention_seconds.
+    """
+
+    def __init__(self, max_workers: int, retention_seconds: int):
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="idea-import")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, ImportJob] = {}
+
+    def submit(self, path: str, filename: str, dedup_mode: str, mode: str) -> ImportJob:
+        self._prune()
+        job = ImportJob(filename, dedup_mode, mode)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, path)
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[ImportJob]:
+        """Ask a queued or running job to stop; returns None for unknown jobs."""
+        job = self.get(job_id)
+        if job is not None and job.status not in JOB_FINISHED:
+            job.cancel_event.set()
+        return job
+
+    def _run(self, job: ImportJob, path: str) -> None:
+        if job.cancel_event.is_set():
+            job.status = JOB_CANCELLED
+            job.finished_at = datetime.now()
+            remove_spooled_file(path)
+            return
+        job.status = JOB_RUNNING
+        job.started_at = datetime.now()
+        db = SessionLocal()
+        status = JOB_FAILED
+        try:
+            job.result = import_ideas_from_file(
+                db, path, job.dedup_mode, job.mode, progress=job, cancel_event=job.cancel_event
+            )
+            status = JOB_COMPLETED
+        except TaskCancelled:
+            db.rollback()
+            status = JOB_CANCELLED
+        except TaskTimeout:
+            job.error = "Parsing the file took too long"
+        except IdeaImportError as e:
+            job.error = str(e)
+        except Exception as e:
+            job.error = f"Error processing file: {str(e)}"
+        finally:
+            db.close()
+            job.close_error_file()
+            job.finished_at = datetime.now()
+            remove_spooled_file(path)
+            invalidate_idea_caches()
+            # Only a finished job offers its error file, so report it finished once the file is closed
+            job.status = status
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at is not None and job.finished_at.timestamp() < cutoff
+            ]
+            for job_id in expired:
+                job = self._jobs.pop(job_id)
+                if job.error_file_path:
+                    remove_spooled_file(job.error_file_path)
+
+
+import_job_manager = ImportJobManager(
+    max_workers=settings.import_job_workers,
+    retention_seconds=settings.import_job_retention_seconds,
+)
@@ -0,0 +1,29 @@
+"""
+Row JSON
+Serializes Core result rows straight to JSON with orjson, for list endpoints that return
+database rows as-is: no ORM objects, no Pydantic model per row and no response validation
+"""
+
+from typing import Iterable, List, Sequence, Type
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import Column, Table
+
+
+def schema_columns(table: Table, schema: Type[BaseModel]) -> List[Column]:
+    """Columns of table named like the fields of a response schema, in field order.
+
+    Selecting exactly these keeps the JSON keys identical to what response_model produced,
+    and never reads a column the schema leaves out (user_password for UserOut).
+    """
+    return [table.c[name] for name in schema.model_fields]
+
+
+def rows_to_json(keys: Sequence[str], rows: Iterable[Sequence]) -> bytes:
+    """JSON array of objects; datetimes come out in the same ISO format Pydantic writes."""
+    return orjson.dumps([dict(zip(keys, row)) for row in rows])
+
+
+def row_to_json(keys: Sequence[str], row: Sequence) -> bytes:
+    return orjson.dumps(dict(zip(keys, row)))
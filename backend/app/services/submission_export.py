@@ -0,0 +1,314 @@
+"""
+Project Submission Exports
+Column headers, display rules and row rendering for the submission export views, shared by the
+API routes and the CPU task pool processes that render large exports
+"""
+
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.database import ReadSessionLocal
+from app.services.export_stream import EXPORT_FLUSH_ROWS, iter_export
+
+
+settings = get_settings()
+
+# Exports with at least this many rows are rendered in the CPU task pool
+EXPORT_OFFLOAD_MIN_ROWS = settings.export_offload_min_rows
+
+
+PROJECT_SUBMISSION_EXPORT_COLUMNS_TH = {
+    "ProjectId": "รหัสโครงการ",
+    "EventYear": "ปีของโครงการ",
+    "SubmissionTypeCode": "รหัสประเภทการส่งประกวด",
+    "SubmissionTypeNameTh": "ประเภทการส่งประกวด",
+    "TeamName": "ชื่อทีม / ชื่อผลงาน",
+
+    "ChallengeNo": "ลำดับโจทย์นวัตกรรม",
+    "ChallengeText": "โจทย์นวัตกรรมที่เลือก",
+
+    "IdeaSourceCoPs": "แหล่งที่มา: ชุมชนนักปฏิบัติ (CoPs)",
+    "IdeaSourceCoPsDetail": "รายละเอียด: ชุมชนนักปฏิบัติ (CoPs)",
+    "IdeaSourceLR": "แหล่งที่มา: คลังความรู้ (LR)",
+    "IdeaSourceLRDetail": "รายละเอียด: คลังความรู้ (LR)",
+    "IdeaSourceResearch": "แหล่งที่มา: ผลงานวิจัย",
+    "IdeaSourceResearchDetail": "รายละเอียด: ผลงานวิจัย",
+    "IdeaSourceExperience": "แหล่งที่มา: ประสบการณ์",
+    "IdeaSourceExperienceDetail": "รายละเอียด: ประสบการณ์",
+    "IdeaSourceStudyVisit": "แหล่งที่มา: ศึกษาดูงาน",
+    "IdeaSourceStudyVisitDetail": "รายละเอียด: ศึกษาดูงาน",
+    "IdeaSourceKnowledgeExchange": "แหล่งที่มา: การแลกเปลี่ยนเรียนรู้",
+    "IdeaSourceKnowledgeExchangeDetail": "รายละเอียด: การแลกเปลี่ยนเรียนรู้",
+    "IdeaSourceInnovationDatabase": "แหล่งที่มา: ฐานข้อมูลนวัตกรรม",
+    "IdeaSourceInnovationDatabaseDetail": "รายละเอียด: ฐานข้อมูลนวัตกรรม",
+    "IdeaSourceMarketStudy": "แหล่งที่มา: ผลการศึกษาความต้องการของตลาด",
+    "IdeaSourceMarketStudyDetail": "รายละเอียด: ผลการศึกษาความต้องการของตลาด",
+    "IdeaSourceVOS": "แหล่งที่มา: Voice of Stakeholder (VOS)",
+    "IdeaSourceVOSDetail": "รายละเอียด: Voice of Stakeholder (VOS)",
+    "IdeaSourceOther": "แหล่งที่มา: อื่นๆ",
+    "IdeaSourceOtherDetail": "รายละเอียด: อื่นๆ",
+
+    "TargetCustomerHtml": "กลุ่มลูกค้าเป้าหมาย",
+
+    "InnovationTypeNo": "ลำดับประเภทนวัตกรรม",
+    "InnovationTypeText": "ประเภทนวัตกรรม",
+
+    "IdeaConceptHtml": "แนวคิดนวัตกรรมโดยสังเขป",
+    "ExpectedBenefitHtml": "ประโยชน์ที่คาดว่าจะได้รับ",
+
+    "GenCapProjectManagement": "ทักษะทั่วไป: การบริหารโครงการ",
+    "GenCapCommunications": "ทักษะทั่วไป: การสื่อสาร",
+    "GenCapMarketing": "ทักษะทั่วไป: การตลาด",
+    "GenCapFinancialBusinessAnalysis": "ทักษะทั่วไป: การวิเคราะห์การเงินและธุรกิจ",
+    "GenCapCustomerManagement": "ทักษะทั่วไป: การดูแลลูกค้า",
+    "GenCapStakeholderPartnership": "ทักษะทั่วไป: การดูแลผู้มีส่วนได้เสียและพันธมิตร",
+    "GenCapOther": "ทักษะทั่วไป: อื่นๆ",
+    "GenCapOtherDetail": "รายละเอียดทักษะทั่วไปอื่นๆ",
+
+    "DigitalCapProductDevelopment": "ทักษะดิจิทัล: การพัฒนาผลิตภัณฑ์",
+    "DigitalCapCodingProgramming": "ทักษะดิจิทัล: การเขียนโค้ด/โปรแกรม",
+    "DigitalCapDataAnalysis": "ทักษะดิจิทัล: การวิเคราะห์ข้อมูล",
+    "DigitalCapUiUxGraphicDesign": "ทักษะดิจิทัล: UI/UX & Graphic Design",
+    "DigitalCapSoftwareTooling": "ทักษะดิจิทัล: การพัฒนาซอฟต์แวร์และเครื่องมือ",
+    "DigitalCapOther": "ทักษะดิจิทัล: อื่นๆ",
+    "DigitalCapOtherDetail": "รายละเอียดทักษะดิจิทัลอื่นๆ",
+
+    "HackathonMotivationHtml": "แรงจูงใจในการเข้าร่วมโครงการ",
+
+    "StatusCode": "สถานะ",
+    "SubmittedAt": "วันที่ส่งผลงาน",
+    "CreatedByEmpCode": "ผู้สร้างรายการ (รหัสพนักงาน)",
+    "CreatedAt": "วันที่สร้างรายการ",
+    "UpdatedByEmpCode": "ผู้แก้ไขล่าสุด (รหัสพนักงาน)",
+    "UpdatedAt": "วันที่แก้ไขล่าสุด",
+}
+
+for _seq in range(1, 6):
+    PROJECT_SUBMISSION_EXPORT_COLUMNS_TH[f"Member{_seq}EmpCode"] = f"สมาชิกคนที่ {_seq}: รหัสพนักงาน"
+    PROJECT_SUBMISSION_EXPORT_COLUMNS_TH[f"Member{_seq}FullNameTh"] = f"สมาชิกคนที่ {_seq}: ชื่อ-นามสกุล"
+    PROJECT_SUBMISSION_EXPORT_COLUMNS_TH[f"Member{_seq}PositionName"] = f"สมาชิกคนที่ {_seq}: ตำแหน่งงาน"
+    PROJECT_SUBMISSION_EXPORT_COLUMNS_TH[f"Member{_seq}OrgName"] = f"สมาชิกคนที่ {_seq}: สังกัด/ฝ่าย"
+    PROJECT_SUBMISSION_EXPORT_COLUMNS_TH[f"Member{_seq}MobileNo"] = f"สมาชิกคนที่ {_seq}: เบอร์ติดต่อ"
+
+PROJECT_SUBMISSION_EXPORT_BIT_COLUMNS = [
+    "IdeaSourceCoPs", "IdeaSourceLR", "IdeaSourceResearch", "IdeaSourceExperience",
+    "IdeaSourceStudyVisit", "IdeaSourceKnowledgeExchange", "IdeaSourceInnovationDatabase",
+    "IdeaSourceMarketStudy", "IdeaSourceVOS", "IdeaSourceOther",
+    "GenCapProjectManagement", "GenCapCommunications", "GenCapMarketing",
+    "GenCapFinancialBusinessAnalysis", "GenCapCustomerManagement", "GenCapStakeholderPartnership",
+    "GenCapOther",
+    "DigitalCapProductDevelopment", "DigitalCapCodingProgramming", "DigitalCapDataAnalysis",
+    "DigitalCapUiUxGraphicDesign", "DigitalCapSoftwareTooling", "DigitalCapOther",
+]
+
+PROJECT_SUBMISSION_EXPORT_SUBMISSION_TYPE_TH = {"INDIVIDUAL": "บุคคล", "TEAM": "ทีม"}
+PROJECT_SUBMISSION_EXPORT_STATUS_TH = {
+    "DRAFT": "ร่าง", "SUBMITTED": "ส่งแล้ว", "CANCELLED": "ยกเลิก",
+    "APPROVED": "ผ่าน", "REJECTED": "ไม่ผ่าน",
+}
+
+
+PROJECT_SUBMISSION_EXPORT_SHEET_NAME = "ผลงานที่ส่งเข้าประกวด"
+
+
+def format_export_row(row, keys: List[str], bit_columns: set) -> list:
+    """Apply the export display rules (ใช่/ไม่ใช่, Thai type/status names) to one row.
+
+    The export views already return the precomputed plain text for the *Html columns.
+    """
+    values = []
+    for key in keys:
+        value = row.get(key)
+        if key in bit_columns:
+            value = "ใช่" if bool(value) else "ไม่ใช่"
+        elif key == "SubmissionTypeCode":
+            value = PROJECT_SUBMISSION_EXPORT_SUBMISSION_TYPE_TH.get(value, value)
+        elif key == "StatusCode":
+            value = PROJECT_SUBMISSION_EXPORT_STATUS_TH.get(value, value)
+        values.append(value)
+    return values
+
+
+PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH = {
+    "ProjectId": "รหัสโครงการ",
+    "EventYear": "ปีของโครงการ",
+    "SubmissionTypeCode": "รหัสประเภทการส่งประกวด",
+    "SubmissionTypeNameTh": "ประเภทการส่งประกวด",
+    "TeamName": "ชื่อทีม",
+    "CreativeIdeaName": "ชื่อความคิดสร้างสรรค์",
+
+    "ChallengeNo": "ลำดับโจทย์นวัตกรรม",
+    "ChallengeText": "โจทย์นวัตกรรมที่เลือก",
+
+    "ChallengeCategoryNo": "ลำดับประเภทของโจทย์นวัตกรรม",
+    "ChallengeCategoryText": "ประเภทของโจทย์นวัตกรรม",
+
+    "StrategicObjectiveSO1": "SO1: บริหารจัดการสินทรัพย์เพื่อสร้างรายได้ให้สมดุล",
+    "StrategicObjectiveSO2": "SO2: บริหารจัดการคุณภาพสินเชื่อเพื่อความแข็งแกร่งทางการเงิน",
+    "StrategicObjectiveSO3": "SO3: เพิ่มขีดความสามารถลูกค้าและชุมชนผ่านแกนกลางการเกษตร",
+    "StrategicObjectiveSO4": "SO4: เพิ่มขีดความสามารถองค์กรด้วยเทคโนโลยีดิจิทัลและนวัตกรรม",
+    "StrategicObjectiveSO5": "SO5: เพิ่มศักยภาพบุคลากรและ GRC รองรับการเติบโตทางธุรกิจ",
+    "StrategicObjectiveSO6": "SO6: บริหารจัดการองค์กรและชุมชนเพื่อมุ่งสู่ Net Zero Emissions",
+
+    "IdeaSourceCoPs": "แหล่งที่มา: ชุมชนนักปฏิบัติ (CoPs)",
+    "IdeaSourceCoPsDetail": "รายละเอียด: ชุมชนนักปฏิบัติ (CoPs)",
+    "IdeaSourceLR": "แหล่งที่มา: คลังความรู้ (LR)",
+    "IdeaSourceLRDetail": "รายละเอียด: คลังความรู้ (LR)",
+    "IdeaSourceResearch": "แหล่งที่มา: ผลงานวิจัย",
+    "IdeaSourceResearchDetail": "รายละเอียด: ผลงานวิจัย",
+    "IdeaSourceExperience": "แหล่งที่มา: ประสบการณ์",
+    "IdeaSourceExperienceDetail": "รายละเอียด: ประสบการณ์",
+    "IdeaSourceStudyVisit": "แหล่งที่มา: ศึกษาดูงาน",
+    "IdeaSourceStudyVisitDetail": "รายละเอียด: ศึกษาดูงาน",
+    "IdeaSourceKnowledgeExchange": "แหล่งที่มา: การแลกเปลี่ยนเรียนรู้",
+    "IdeaSourceKnowledgeExchangeDetail": "รายละเอียด: การแลกเปลี่ยนเรียนรู้",
+    "IdeaSourceInnovationDatabase": "แหล่งที่มา: ฐานข้อมูลนวัตกรรม",
+    "IdeaSourceInnovationDatabaseDetail": "รายละเอียด: ฐานข้อมูลนวัตกรรม",
+    "IdeaSourceMarketStudy": "แหล่งที่มา: ผลการศึกษาความต้องการของตลาด",
+    "IdeaSourceMarketStudyDetail": "รายละเอียด: ผลการศึกษาความต้องการของตลาด",
+    "IdeaSourceVOS": "แหล่งที่มา: Voice of Stakeholder (VOS)",
+    "IdeaSourceVOSDetail": "รายละเอียด: Voice of Stakeholder (VOS)",
+    "IdeaSourceOther": "แหล่งที่มา: อื่นๆ",
+    "IdeaSourceOtherDetail": "รายละเอียด: อื่นๆ",
+
+    "TargetCustomerTypeNo": "ลำดับลูกค้ากลุ่มเป้าหมาย",
+    "TargetCustomerTypeText": "ลูกค้ากลุ่มเป้าหมาย",
+    "TargetCustomerProblemHtml": "รายละเอียดลูกค้ากลุ่มเป้าหมายและประเด็นปัญหา",
+
+    "InnovationTypeNo": "ลำดับประเภทนวัตกรรม",
+    "InnovationTypeText": "ประเภทนวัตกรรม",
+
+    "IdeaConceptHtml": "แนวคิดนวัตกรรมโดยสังเขป",
+
+    "DigitalInnovationNo": "ลำดับผลงานนวัตกรรมเทคโนโลยีดิจิทัล",
+    "DigitalInnovationText": "ผลงานนวัตกรรมเทคโนโลยีดิจิทัล",
+
+    "NoveltyLevelNo": "ลำดับระดับความใหม่",
+    "NoveltyLevelText": "ระดับความใหม่ของความคิดสร้างสรรค์",
+
+    "InnovationValueFinancial": "มูลค่านวัตกรรม: ด้านการเงิน",
+    "FinancialValueRevenue": "ด้านการเงิน: สร้างรายได้",
+    "FinancialValueCostSaving": "ด้านการเงิน: ลดค่าใช้จ่าย",
+    "FinancialValueDetailHtml": "รายละเอียดเพิ่มเติมด้านการเงิน",
+
+    "InnovationValueNonFinancial": "มูลค่านวัตกรรม: ไม่ใช่การเงิน",
+    "NonFinancialValueCustomerSatisfaction": "ไม่ใช่การเงิน: ความพึงพอใจ",
+    "NonFinancialValueWorkEfficiency": "ไม่ใช่การเงิน: ลดขั้นตอนการทำงาน/เพิ่ม Value Added",
+    "NonFinancialValueCustomerQuality": "ไม่ใช่การเงิน: คุณภาพชีวิตลูกค้า",
+    "NonFinancialValueEnvironment": "ไม่ใช่การเงิน: สิ่งแวดล้อม",
+    "NonFinancialValueDetailHtml": "รายละเอียดเพิ่มเติมที่ไม่ใช่การเงิน",
+
+    "StatusCode": "สถานะ",
+    "SubmittedAt": "วันที่ส่งผลงาน",
+    "CreatedByEmpCode": "ผู้สร้างรายการ (รหัสพนักงาน)",
+    "CreatedAt": "วันที่สร้างรายการ",
+    "UpdatedByEmpCode": "ผู้แก้ไขล่าสุด (รหัสพนักงาน)",
+    "UpdatedAt": "วันที่แก้ไขล่าสุด",
+}
+
+for _seq in range(1, 6):
+    PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH[f"Member{_seq}EmpCode"] = f"สมาชิกคนที่ {_seq}: รหัสพนักงาน"
+    PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH[f"Member{_seq}FullNameTh"] = f"สมาชิกคนที่ {_seq}: ชื่อ-นามสกุล"
+    PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH[f"Member{_seq}PositionName"] = f"สมาชิกคนที่ {_seq}: ตำแหน่งงาน"
+    PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH[f"Member{_seq}OrgName"] = f"สมาชิกคนที่ {_seq}: สังกัด/ฝ่าย"
+    PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH[f"Member{_seq}MobileNo"] = f"สมาชิกคนที่ {_seq}: เบอร์ติดต่อ"
+
+PROJECT_SUBMISSION_NEW_EXPORT_BIT_COLUMNS = [
+    "StrategicObjectiveSO1", "StrategicObjectiveSO2", "StrategicObjectiveSO3",
+    "StrategicObjectiveSO4", "StrategicObjectiveSO5", "StrategicObjectiveSO6",
+    "IdeaSourceCoPs", "IdeaSourceLR", "IdeaSourceResearch", "IdeaSourceExperience",
+    "IdeaSourceStudyVisit", "IdeaSourceKnowledgeExchange", "IdeaSourceInnovationDatabase",
+    "IdeaSourceMarketStudy", "IdeaSourceVOS", "IdeaSourceOther",
+    "InnovationValueFinancial", "FinancialValueRevenue", "FinancialValueCostSaving",
+    "InnovationValueNonFinancial", "NonFinancialValueCustomerSatisfaction",
+    "NonFinancialValueWorkEfficiency", "NonFinancialValueCustomerQuality", "NonFinancialValueEnvironment",
+]
+
+
+SUBMISSION_EXPORTS = {
+    "project-submissions": {
+        "view": "dbo.vProjectSubmissionExport",
+        "table": "dbo.ProjectSubmission",
+        "columns": None,
+        "columns_th": PROJECT_SUBMISSION_EXPORT_COLUMNS_TH,
+        "bit_columns": set(PROJECT_SUBMISSION_EXPORT_BIT_COLUMNS),
+        "search_columns": ["TeamName"],
+    },
+    "project-submissions-new": {
+        "view": "dbo.vProjectSubmissionNewExport",
+        "table": "dbo.ProjectSubmissionNew",
+        "columns": list(PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH),
+        "columns_th": PROJECT_SUBMISSION_NEW_EXPORT_COLUMNS_TH,
+        "bit_columns": set(PROJECT_SUBMISSION_NEW_EXPORT_BIT_COLUMNS),
+        "search_columns": ["TeamName", "CreativeIdeaName"],
+    },
+}
+
+
+def _export_filter_sql(
+    spec: dict,
+    team_name: Optional[str] = None,
+    innovation_type_no: Optional[int] = None,
+    challenge_no: Optional[int] = None,
+) -> tuple:
+    # Every filtered column exists under the same name on the view and on its base table
+    sql = "WHERE StatusCode = 'SUBMITTED'"
+    params: dict = {}
+    if team_name:
+        sql += " AND (" + " OR ".join(f"{col} LIKE :team_name" for col in spec["search_columns"]) + ")"
+        params["team_name"] = f"%{team_name}%"
+    if innovation_type_no is not None:
+        sql += " AND InnovationTypeNo = :innovation_type_no"
+        params["innovation_type_no"] = innovation_type_no
+    if challenge_no is not None:
+        sql += " AND ChallengeNo = :challenge_no"
+        params["challenge_no"] = challenge_no
+    return sql, params
+
+
+def build_submission_export_query(
+    export_name: str,
+    team_name: Optional[str] = None,
+    innovation_type_no: Optional[int] = None,
+    challenge_no: Optional[int] = None,
+) -> tuple:
+    """Return (sql, params) selecting the submitted rows of an export view, newest first."""
+    spec = SUBMISSION_EXPORTS[export_name]
+    columns = ", ".join(spec["columns"]) if spec["columns"] else "*"
+    where, params = _export_filter_sql(spec, team_name, innovation_type_no, challenge_no)
+    # The views pivot members per project in SQL; the filters below run inside the same query
+    return f"SELECT {columns} FROM {spec['view']} {where} ORDER BY ProjectId DESC", params
+
+
+def count_submission_export(db: Session, export_name: str, filters: Dict) -> int:
+    """Rows the export would contain, counted on the base table without the member pivot."""
+    spec = SUBMISSION_EXPORTS[export_name]
+    where, params = _export_filter_sql(spec, **filters)
+    return db.execute(text(f"SELECT COUNT(*) FROM {spec['table']} {where}"), params).scalar()
+
+
+def iter_submission_export(db: Session, export_name: str, export_format: str, filters: Dict) -> Iterator[bytes]:
+    """Render a submission export as it is read; filters are the build_submission_export_query kwargs."""
+    spec = SUBMISSION_EXPORTS[export_name]
+    sql, params = build_submission_export_query(export_name, **filters)
+    # pyodbc reads the result off the wire as rows are fetched, so with yield_per only one
+    # batch is held in memory while the workbook streams out
+    result = db.execute(text(sql).execution_options(yield_per=EXPORT_FLUSH_ROWS), params)
+    keys: List[str] = list(result.keys())
+    header = [spec["columns_th"].get(key, key) for key in keys]
+    rows = (format_export_row(row._mapping, keys, spec["bit_columns"]) for row in result)
+    return iter_export(export_format, PROJECT_SUBMISSION_EXPORT_SHEET_NAME, keys, header, rows)
+
+
+def render_submission_export(export_name: str, export_format: str, filters: Dict, path: str) -> None:
+    """Write a submission export to path with a session of its own; runs in the CPU task pool."""
+    db = ReadSessionLocal()
+    try:
+        with open(path, "wb") as artifact:
+            for chunk in iter_submission_export(db, export_name, export_format, filters):
+                artifact.write(chunk)
+    finally:
+        db.close()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Online backfill of the NVARCHAR(MAX) shadow columns added by migration 0003.
+
+Copies the legacy text columns in small keyset batches, one commit per batch, so the app keeps
+reading and writing the tables meanwhile. The batches are tagged with a change tracking context;
+migration 0004 copies again only the rows the app wrote since the backfill of their table started,
+then swaps the columns:
+
+    alembic upgrade 0003
+    python backfill_nvarchar_columns.py
+    alembic upgrade head
+"""
+
+from __future__ import annotations
+
+import os
+
+from sqlalchemy import text
+
+# Keep local script execution resilient if .env contains non-boolean DEBUG values.
+os.environ.setdefault("DEBUG", "false")
+
+from app.db.database import engine
+from app.db.legacy_text_columns import (
+    LEGACY_TEXT_COLUMNS,
+    backfill_range_sql,
+    overlong_columns,
+    record_backfill_sql,
+    shadowed_columns,
+)
+
+BATCH_SIZE = 1000
+
+
+def backfill_table(table: str, primary_key: str, columns: list) -> int:
+    update = text(backfill_range_sql(table, columns, primary_key))
+    first_keys = text(f"SELECT TOP (:batch_size) {primary_key} FROM {table} ORDER BY {primary_key}")
+    next_keys = text(
+        f"SELECT TOP (:batch_size) {primary_key} FROM {table} "
+        f"WHERE {primary_key} > :last_key ORDER BY {primary_key}"
+    )
+
+    # Writes committed after this version are the ones 0004 has to copy again
+    with engine.connect() as conn:
+        since_version = conn.execute(text("SELECT CHANGE_TRACKING_CURRENT_VERSION()")).scalar()
+
+    copied = 0
+    last_key = None
+    while True:
+        with engine.begin() as conn:
+            if last_key is None:
+                keys = conn.execute(first_keys, {"batch_size": BATCH_SIZE}).scalars().all()
+            else:
+                keys = conn.execute(next_keys, {"batch_size": BATCH_SIZE, "last_key": last_key}).scalars().all()
+            if not keys:
+                break
+            conn.execute(update, {"first_key": keys[0], "last_key": keys[-1]})
+        copied += len(keys)
+        last_key = keys[-1]
+        print(f"  {table}: {copied} rows")
+
+    with engine.begin() as conn:
+        conn.execute(text(record_backfill_sql()), {"table_name": table, "since_version": since_version})
+    return copied
+
+
+def run_backfill() -> int:
+    print("=== NVARCHAR backfill start ===")
+    failed = False
+    for table, legacy in LEGACY_TEXT_COLUMNS.items():
+        with engine.connect() as conn:
+            columns = shadowed_columns(conn, table, legacy.columns)
+            overlong = overlong_columns(conn, table, legacy, columns)
+        if not columns:
+            print(f"{table}: nothing to backfill")
+            continue
+        if overlong:
+            # A bounded shadow column cannot take these values; shorten them, then run again
+            for col, count in overlong.items():
+                print(f"{table}.{col}: {count} rows longer than {legacy.column_type(col)}")
+            failed = True
+            continue
+        copied = backfill_table(table, legacy.primary_key, columns)
+        print(f"{table}: {copied} rows backfilled ({', '.join(columns)})")
+    print("=== NVARCHAR backfill done ===")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(run_backfill())
+    except Exception as exc:  # noqa: BLE001
+        print(f"Backfill failed: {exc}")
+        raise SystemExit(1)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+One-time backfill of the plain-text companion columns of the rich-text *Html fields
+for dbo.ProjectSubmission and dbo.ProjectSubmissionNew.
+
+Run after `alembic upgrade head` (revision 0006 adds the columns). Pass --all to recompute every row
+(e.g. after changing the HTML-to-text conversion); by default only rows with a missing
+plain-text value are processed.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+from sqlalchemy import bindparam, or_, select, update
+
+# Keep local script execution resilient if .env contains non-boolean DEBUG values.
+os.environ.setdefault("DEBUG", "false")
+
+from app.db import models
+from app.db.database import engine
+from app.services.html_text import html_to_text
+
+BATCH_SIZE = 500
+
+
+def backfill_table(model, column_map: dict, recompute_all: bool) -> int:
+    table = model.__table__
+    pk = table.c.ProjectId
+    html_columns = [table.c[name] for name in column_map]
+    select_columns = [pk] + html_columns
+    pending = or_(*[
+        table.c[html_name].isnot(None) & table.c[text_name].is_(None)
+        for html_name, text_name in column_map.items()
+    ])
+    statement = update(table).where(pk == bindparam("b_project_id")).values(
+        {text_name: bindparam(f"b_{text_name}") for text_name in column_map.values()}
+    )
+
+    updated = 0
+    last_id = 0
+    while True:
+        query = select(*select_columns).where(pk > last_id).order_by(pk).limit(BATCH_SIZE)
+        if not recompute_all:
+            query = query.where(pending)
+        with engine.begin() as conn:
+            rows = conn.execute(query).all()
+            if not rows:
+                break
+            params = []
+            for row in rows:
+                values = {"b_project_id": row.ProjectId}
+                for html_name, text_name in column_map.items():
+                    values[f"b_{text_name}"] = html_to_text(row._mapping[html_name])
+                params.append(values)
+            conn.execute(statement, params)
+        updated += len(rows)
+        last_id = rows[-1].ProjectId
+        print(f"  {table.name}: {updated} rows")
+    return updated
+
+
+def run_backfill(recompute_all: bool = False) -> int:
+    print("=== Plain-text backfill start ===")
+    for model, column_map in (
+        (models.ProjectSubmission, models.PROJECT_SUBMISSION_PLAIN_TEXT_COLUMNS),
+        (models.ProjectSubmissionNew, models.PROJECT_SUBMISSION_NEW_PLAIN_TEXT_COLUMNS),
+    ):
+        updated = backfill_table(model, column_map, recompute_all)
+        print(f"{model.__table__.name}: {updated} rows backfilled")
+    print("=== Plain-text backfill done ===")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(run_backfill(recompute_all="--all" in sys.argv[1:]))
+    except Exception as exc:  # noqa: BLE001
+        print(f"Backfill failed: {exc}")
+        raise SystemExit(1)
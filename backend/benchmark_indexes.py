@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark the hot endpoint queries: logical reads (SET STATISTICS IO) and latency.
+
+Record a run before and after `alembic upgrade head`, then compare them:
+
+    python benchmark_indexes.py --label before --out bench_before.json
+    alembic upgrade head
+    python benchmark_indexes.py --label after --out bench_after.json
+    python benchmark_indexes.py --compare bench_before.json bench_after.json
+
+Queries mirror what the endpoints send; sample parameters are taken from the data itself.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import time
+
+# Keep local script execution resilient if .env contains non-boolean DEBUG values.
+os.environ.setdefault("DEBUG", "false")
+
+from app.db.database import engine
+
+RUNS = 5
+LOGICAL_READS_RE = re.compile(r"logical reads (\d+)")
+
+# (name, endpoint, query, sample query returning the parameters or None)
+BENCHMARK_QUERIES = [
+    (
+        "answers_by_question", "GET /questions/{id}/answers",
+        "SELECT * FROM dbo.Answer WHERE question_id = ? ORDER BY created_at DESC",
+        "SELECT TOP 1 question_id FROM dbo.Answer GROUP BY question_id ORDER BY COUNT(*) DESC",
+    ),
+    (
+        "answers_latest", "GET /answers",
+        "SELECT TOP 100 * FROM dbo.Answer ORDER BY created_at DESC",
+        None,
+    ),
+    (
+        "idea_by_code", "POST /ideas/bulk-import?mode=upsert",
+        "SELECT idea_seq FROM dbo.idea_tank WHERE idea_code = ?",
+        "SELECT TOP 1 idea_code FROM dbo.idea_tank WHERE idea_code IS NOT NULL ORDER BY idea_seq DESC",
+    ),
+    (
+        "ideas_score_range", "GET /ideas?min_score=",
+        "SELECT idea_seq, idea_code, idea_name, idea_score FROM dbo.idea_tank WHERE idea_score >= ? "
+        "ORDER BY idea_score DESC, idea_seq",
+        "SELECT ISNULL(MAX(idea_score), 0) FROM dbo.idea_tank",
+    ),
+    (
+        "ideas_missing_keywords", "POST /ideas/generate-keywords",
+        "SELECT idea_seq FROM dbo.idea_tank WHERE idea_keywords IS NULL "
+        "OR CAST(idea_keywords AS NVARCHAR(MAX)) IN (N'', N'-')",
+        None,
+    ),
+    (
+        "project_submissions_list", "GET /project-submissions",
+        "SELECT TOP 10 * FROM dbo.ProjectSubmission WHERE StatusCode = ? ORDER BY CreatedAt DESC",
+        "SELECT 'SUBMITTED'",
+    ),
+    (
+        "project_submissions_filtered", "GET /project-submissions?challenge_no=&innovation_type_no=",
+        "SELECT TOP 10 * FROM dbo.ProjectSubmission WHERE StatusCode = ? AND ChallengeNo = ? "
+        "AND InnovationTypeNo = ? ORDER BY CreatedAt DESC",
+        "SELECT 'SUBMITTED', 1, 1",
+    ),
+    (
+        "project_submissions_new_list", "GET /project-submissions-new",
+        "SELECT TOP 10 * FROM dbo.ProjectSubmissionNew WHERE StatusCode = ? ORDER BY CreatedAt DESC",
+        "SELECT 'SUBMITTED'",
+    ),
+    (
+        "project_submissions_new_filtered", "GET /project-submissions-new?challenge_no=&innovation_type_no=",
+        "SELECT TOP 10 * FROM dbo.ProjectSubmissionNew WHERE StatusCode = ? AND ChallengeNo = ? "
+        "AND InnovationTypeNo = ? ORDER BY CreatedAt DESC",
+        "SELECT 'SUBMITTED', 1, 1",
+    ),
+    (
+        "user_by_login", "POST /auth/login",
+        "SELECT * FROM dbo.idea_users WHERE user_login = ?",
+        "SELECT TOP 1 user_login FROM dbo.idea_users",
+    ),
+]
+
+
+def _collect_messages(cursor) -> list:
+    messages = list(cursor.messages or [])
+    while cursor.nextset():
+        messages.extend(cursor.messages or [])
+    return messages
+
+
+def run_query(cursor, sql: str, params: tuple) -> tuple:
+    """Return (elapsed ms, logical reads) for one execution including fetching all rows."""
+    started = time.perf_counter()
+    cursor.execute(sql, params)
+    cursor.fetchall()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    reads = sum(
+        int(match) for _, text in _collect_messages(cursor)
+        for match in LOGICAL_READS_RE.findall(str(text))
+    )
+    return elapsed_ms, reads
+
+
+def run_benchmark(label: str, out_path: str) -> int:
+    print(f"=== Index benchmark ({label}) ===")
+    results = {"label": label, "queries": {}}
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SET STATISTICS IO ON")
+        for name, endpoint, sql, sample_sql in BENCHMARK_QUERIES:
+            params: tuple = ()
+            if sample_sql:
+                cursor.execute(sample_sql)
+                row = cursor.fetchone()
+                _collect_messages(cursor)
+                if row is None:
+                    print(f"  {name}: skipped, no sample data")
+                    continue
+                params = tuple(row)
+            # First run warms the plan cache and buffer pool and is not counted
+            run_query(cursor, sql, params)
+            timings = []
+            reads = 0
+            for _ in range(RUNS):
+                elapsed_ms, reads = run_query(cursor, sql, params)
+                timings.append(elapsed_ms)
+            results["queries"][name] = {
+                "endpoint": endpoint,
+                "logical_reads": reads,
+                "median_ms": round(statistics.median(timings), 2),
+                "max_ms": round(max(timings), 2),
+            }
+            print(f"  {name}: {reads} logical reads, median {statistics.median(timings):.2f} ms")
+    finally:
+        connection.close()
+
+    with open(out_path, "w", encoding="utf-8") as out:
+        json.dump(results, out, indent=2)
+    print(f"=== Saved to {out_path} ===")
+    return 0
+
+
+def compare(before_path: str, after_path: str) -> int:
+    with open(before_path, encoding="utf-8") as f:
+        before = json.load(f)["queries"]
+    with open(after_path, encoding="utf-8") as f:
+        after = json.load(f)["queries"]
+    print(f"{'query':34} {'reads before':>13} {'reads after':>12} {'ms before':>10} {'ms after':>9}")
+    for name in before:
+        if name not in after:
+            continue
+        b, a = before[name], after[name]
+        print(
+            f"{name:34} {b['logical_reads']:>13} {a['logical_reads']:>12} "
+            f"{b['median_ms']:>10} {a['median_ms']:>9}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--out", default="bench_indexes.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+    try:
+        if args.compare:
+            raise SystemExit(compare(*args.compare))
+        raise SystemExit(run_benchmark(args.label, args.out))
+    except Exception as exc:  # noqa: BLE001
+        print(f"Benchmark failed: {exc}")
+        raise SystemExit(1)
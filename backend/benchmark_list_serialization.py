@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark the list endpoint read path: ORM + Pydantic against Core rows + orjson.
+
+For each list it times, over the same rows of the configured database:
+  orm   - ORM objects, one response model per row, then the response_model validation and
+          JSON encoding FastAPI applies to a returned list (the old path)
+  core  - Core select of the response columns serialized with rows_to_json (the new path)
+
+    python benchmark_list_serialization.py
+    python benchmark_list_serialization.py --out bench_lists.json
+
+Times include fetching the rows; per-row cost is the median run divided by the row count.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+# Keep local script execution resilient if .env contains non-boolean DEBUG values.
+os.environ.setdefault("DEBUG", "false")
+
+from pydantic import TypeAdapter
+from sqlalchemy import desc, select
+
+from app.api.routes import ANSWER_OUT_COLUMNS, ANSWER_OUT_KEYS, USER_OUT_COLUMNS, USER_OUT_KEYS, to_answer_out
+from app.db import models
+from app.db.database import SessionLocal
+from app.db.schemas import AnswerOut, IdeaOut, UserOut
+from app.services.idea_cache import IDEA_OUT_COLUMNS, IDEA_OUT_KEYS
+from app.services.row_json import rows_to_json
+
+RUNS = 5
+
+# (name, endpoint, model, order column, response schema, ORM row -> schema, Core columns, keys)
+BENCHMARK_LISTS = [
+    (
+        "answers", "GET /answers", models.Answer, models.Answer.created_at, AnswerOut,
+        to_answer_out, ANSWER_OUT_COLUMNS, ANSWER_OUT_KEYS,
+    ),
+    (
+        "ideas", "GET /ideas (snapshot load)", models.IdeaTank, models.IdeaTank.idea_seq, IdeaOut,
+        IdeaOut.model_validate, IDEA_OUT_COLUMNS, IDEA_OUT_KEYS,
+    ),
+    (
+        "users", "GET /users", models.User, models.User.user_createdate, UserOut,
+        UserOut.model_validate, USER_OUT_COLUMNS, USER_OUT_KEYS,
+    ),
+]
+
+
+def orm_path(db, model, order_by, schema, to_schema) -> tuple:
+    adapter = TypeAdapter(list[schema])
+    items = [to_schema(item) for item in db.query(model).order_by(desc(order_by)).all()]
+    # What FastAPI does with a returned list: validate against response_model, then encode
+    validated = adapter.validate_python(items, from_attributes=True)
+    body = json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False).encode("utf-8")
+    return len(items), body
+
+
+def core_path(db, order_by, columns, keys) -> tuple:
+    rows = db.execute(select(*columns).order_by(desc(order_by))).all()
+    return len(rows), rows_to_json(keys, rows)
+
+
+def timed(func, *args) -> tuple:
+    timings = []
+    row_count = 0
+    func(*args)  # warm-up: plan cache, buffer pool and first-call imports
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        row_count, _ = func(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return row_count, statistics.median(timings)
+
+
+def run_benchmark(out_path: str) -> int:
+    print("=== List serialization benchmark ===")
+    results = {}
+    db = SessionLocal()
+    try:
+        for name, endpoint, model, order_by, schema, to_schema, columns, keys in BENCHMARK_LISTS:
+            row_count, orm_ms = timed(orm_path, db, model, order_by, schema, to_schema)
+            db.expunge_all()
+            _, core_ms = timed(core_path, db, order_by, columns, keys)
+            if not row_count:
+                print(f"  {name}: skipped, no rows")
+                continue
+            orm_us = orm_ms * 1000 / row_count
+            core_us = core_ms * 1000 / row_count
+            results[name] = {
+                "endpoint": endpoint,
+                "rows": row_count,
+                "orm_median_ms": round(orm_ms, 2),
+                "core_median_ms": round(core_ms, 2),
+                "orm_us_per_row": round(orm_us, 2),
+                "core_us_per_row": round(core_us, 2),
+            }
+            print(
+                f"  {name}: {row_count} rows, {orm_us:.1f} -> {core_us:.1f} us/row "
+                f"({orm_ms:.1f} -> {core_ms:.1f} ms, {orm_ms / max(core_ms, 0.001):.1f}x)"
+            )
+    finally:
+        db.close()
+
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as out:
+            json.dump(results, out, indent=2)
+        print(f"=== Saved to {out_path} ===")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", default="")
+    args = parser.parse_args()
+    try:
+        raise SystemExit(run_benchmark(args.out))
+    except Exception as exc:  # noqa: BLE001
+        print(f"Benchmark failed: {exc}")
+        raise SystemExit(1)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Writes the db/init scripts for databases that are bootstrapped by hand instead of through
+`alembic upgrade head`. Each script is rendered from the upgrade() of its migration, so the
+migrations stay the only source; re-run this after changing 0005 or 0006.
+
+Pass --check to only report scripts that are missing or out of date (exit code 1).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+VERSIONS_DIR = BACKEND_DIR / "alembic" / "versions"
+DB_INIT_DIR = BACKEND_DIR.parent / "db" / "init"
+
+# Script name, migration file, header, and which of the migration's statements it carries
+SCRIPTS = [
+    (
+        "idea_tank_leaderboard_index.sql", "0005_idea_tank_feed_indexes.py",
+        "Leaderboard index for GET /ideas/leaderboard",
+        lambda statement: "IX_idea_tank_score_rank" in statement,
+    ),
+    (
+        "idea_tank_change_feed.sql", "0005_idea_tank_feed_indexes.py",
+        "Change feed support for GET /ideas/changes: the tombstone table and its indexes",
+        lambda statement: "IX_idea_tank_score_rank" not in statement,
+    ),
+    (
+        "project_submission_plain_text.sql", "0006_submission_plain_text.py",
+        "Plain-text companions of the *Html columns (then run backend/backfill_plain_text.py)",
+        lambda statement: "CREATE OR ALTER VIEW" not in statement,
+    ),
+    (
+        "project_submission_report.sql", "0006_submission_plain_text.py",
+        "Export view of dbo.ProjectSubmission (needs project_submission_plain_text.sql)",
+        lambda statement: "VIEW dbo.vProjectSubmissionExport" in statement,
+    ),
+    (
+        "project_submission_new_report.sql", "0006_submission_plain_text.py",
+        "Export view of dbo.ProjectSubmissionNew (needs project_submission_plain_text.sql)",
+        lambda statement: "VIEW dbo.vProjectSubmissionNewExport" in statement,
+    ),
+]
+
+
+class RecordingOp:
+    """Stands in for alembic.op and keeps the SQL that upgrade() would execute."""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement) -> None:
+        self.statements.append(str(statement).strip())
+
+
+def upgrade_statements(migration_file: str) -> list:
+    path = VERSIONS_DIR / migration_file
+    spec = importlib.util.spec_from_file_location(f"migration_{path.stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.op = RecordingOp()
+    module.upgrade()
+    return module.op.statements
+
+
+def render_scripts() -> dict:
+    statements = {}
+    scripts = {}
+    for name, migration_file, header, wanted in SCRIPTS:
+        if migration_file not in statements:
+            statements[migration_file] = upgrade_statements(migration_file)
+        body = "\nGO\n\n".join(s for s in statements[migration_file] if wanted(s))
+        scripts[name] = (
+            f"-- {header}\n"
+            f"-- Generated from backend/alembic/versions/{migration_file} by backend/generate_db_init.py;\n"
+            f"-- edit the migration and re-run the generator instead of changing this file.\n\n"
+            f"{body}\nGO\n"
+        )
+    return scripts
+
+
+def main(check: bool = False) -> int:
+    stale = []
+    for name, content in render_scripts().items():
+        path = DB_INIT_DIR / name
+        current = path.read_text(encoding="utf-8") if path.exists() else None
+        if current == content:
+            continue
+        stale.append(name)
+        if not check:
+            path.write_text(content, encoding="utf-8")
+            print(f"Wrote db/init/{name}")
+    if check and stale:
+        print("Out of date: " + ", ".join(stale))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(check="--check" in sys.argv[1:]))
@@ -0,0 +1,109 @@
+"""
+Test Fixtures
+Runs the API on a SQLite primary/replica pair (PRIMARY_DATABASE_URL / READ_DATABASE_URL) so
+route behaviour and the statements each route sends can be checked without SQL Server
+"""
+
+import os
+import tempfile
+
+_DATABASE_DIR = tempfile.mkdtemp(prefix="eventcategorize_tests_")
+# One file behind both engines: a replica that is never behind
+os.environ["PRIMARY_DATABASE_URL"] = f"sqlite:///{_DATABASE_DIR}/app.db"
+os.environ["READ_DATABASE_URL"] = os.environ["PRIMARY_DATABASE_URL"]
+# The OpenAI client is built at import time and refuses to start without a key; no test calls it
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import BigInteger, event
+from sqlalchemy.dialects.mssql import TINYINT
+from sqlalchemy.ext.compiler import compiles
+
+from app.db import database, models
+from app.main import app
+from app.services.auth_service import create_access_token
+
+
+@compiles(TINYINT, "sqlite")
+def _tinyint_on_sqlite(type_, compiler, **kw):
+    return "SMALLINT"
+
+
+@compiles(BigInteger, "sqlite")
+def _biginteger_on_sqlite(type_, compiler, **kw):
+    # SQLite only autoincrements INTEGER PRIMARY KEY columns
+    return "INTEGER"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    # Like IDENTITY, never hand out the id of a deleted row again (tombstones refer to them)
+    for table in database.Base.metadata.tables.values():
+        table.dialect_options["sqlite"]["autoincrement"] = True
+    database.Base.metadata.create_all(database.engine)
+    yield
+    database.engine.dispose()
+
+
+@pytest.fixture
+def client():
+    # Not entered as a context manager: startup (schema check, snapshot warm-up) stays off
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def admin_headers(schema):
+    """Bearer token of an admin user that exists in the database (get_current_user looks it up)."""
+    db = database.SessionLocal()
+    try:
+        db.add(models.User(
+            user_code="ADMIN", user_fname="Admin", user_lname="User",
+            user_login="admin", user_password="hashed", user_role="admin",
+        ))
+        db.commit()
+    finally:
+        db.close()
+    return {"Authorization": "Bearer " + create_access_token({"sub": "admin", "role": "admin"})}
+
+
+@pytest.fixture
+def db():
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def count_statements():
+    """count_statements(call) runs call() and returns (its result, statements sent to the primary)."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(database.engine, "before_cursor_execute", record)
+
+    def count(call):
+        statements.clear()
+        result = call()
+        return result, len(statements)
+
+    yield count
+    event.remove(database.engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def user_factory(db):
+    def create(user_code: str, user_login: str) -> models.User:
+        user = models.User(
+            user_code=user_code, user_fname="First", user_lname="Last",
+            user_login=user_login, user_password="hashed", user_role="user",
+        )
+        db.add(user)
+        db.commit()
+        return user
+
+    return create
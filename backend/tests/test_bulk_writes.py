@@ -0,0 +1,42 @@
+"""
+Bulk Writes
+bulk_insert and bulk_update send one statement per call; off SQL Server bulk_update is an
+executemany of a keyed UPDATE
+"""
+
+from app.db import models
+from app.db.bulk import bulk_insert, bulk_update
+
+IDEAS = models.IdeaTank.__table__
+
+
+def test_bulk_update_sets_each_row_by_key(db, count_statements):
+    inserted, statements = count_statements(lambda: bulk_insert(db, IDEAS, [
+        {"idea_code": f"BULK{number}", "idea_name": f"Bulk {number}", "idea_detail": "Detail"}
+        for number in range(3)
+    ]))
+    db.commit()
+    assert (inserted, statements) == (3, 1)
+    seqs = {
+        code: seq for code, seq in db.query(models.IdeaTank.idea_code, models.IdeaTank.idea_seq)
+        .filter(models.IdeaTank.idea_code.in_(["BULK0", "BULK1", "BULK2"]))
+    }
+
+    updated, statements = count_statements(lambda: bulk_update(db, IDEAS, "idea_seq", [
+        {"idea_seq": seqs["BULK0"], "idea_score": 61, "idea_keywords": "first"},
+        {"idea_seq": seqs["BULK2"], "idea_score": 83, "idea_keywords": None},
+    ]))
+    db.commit()
+
+    assert (updated, statements) == (2, 1)
+    rows = {
+        code: (score, keywords) for code, score, keywords in db.query(
+            models.IdeaTank.idea_code, models.IdeaTank.idea_score, models.IdeaTank.idea_keywords,
+        ).filter(models.IdeaTank.idea_seq.in_(seqs.values()))
+    }
+    assert rows == {"BULK0": (61, "first"), "BULK1": (None, None), "BULK2": (83, None)}
+
+
+def test_bulk_writes_skip_empty_batches(db, count_statements):
+    assert count_statements(lambda: bulk_insert(db, IDEAS, [])) == (0, 0)
+    assert count_statements(lambda: bulk_update(db, IDEAS, "idea_seq", [])) == (0, 0)
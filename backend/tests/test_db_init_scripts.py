@@ -0,0 +1,19 @@
+"""
+db/init Scripts
+The hand-run bootstrap scripts are rendered from the migrations and must not drift from them
+"""
+
+import generate_db_init
+
+
+def test_db_init_scripts_match_the_migrations():
+    assert generate_db_init.main(check=True) == 0
+
+
+def test_plain_text_columns_and_export_views_have_their_own_scripts():
+    scripts = generate_db_init.render_scripts()
+
+    assert "CREATE OR ALTER VIEW dbo.vProjectSubmissionExport" in scripts["project_submission_report.sql"]
+    assert "CREATE OR ALTER VIEW dbo.vProjectSubmissionNewExport" in scripts["project_submission_new_report.sql"]
+    assert "VIEW" not in scripts["project_submission_plain_text.sql"]
+    assert scripts["project_submission_plain_text.sql"].count("ADD ") == 8
@@ -0,0 +1,74 @@
+"""
+Dedup Index Freshness
+The MinHash index hashes the tank once, then follows edits and deletes incrementally
+"""
+
+from datetime import datetime, timedelta
+
+from app.db import models
+from app.services.dedup_service import IdeaDedupIndex, ImportDedupBatch, idea_signature
+
+DETAIL = "ระบบแจ้งเตือนการชำระเงินผ่านแอปพลิเคชันสำหรับลูกค้ารายย่อยทุกสาขา"
+
+
+def add_idea(db, name: str, detail: str, updated_at: datetime) -> models.IdeaTank:
+    idea = models.IdeaTank(idea_name=name, idea_detail=detail, update_datetime=updated_at)
+    db.add(idea)
+    db.commit()
+    return idea
+
+
+def test_ensure_fresh_rehashes_only_changed_rows(db, monkeypatch):
+    now = datetime.now()
+    first = add_idea(db, "Payment alert", DETAIL, now)
+    index = IdeaDedupIndex()
+    index.ensure_fresh(db)
+    assert first.idea_seq in [seq for seq, _ in index.find_duplicates("Payment alert", DETAIL)]
+
+    full_loads = []
+    monkeypatch.setattr(index, "_clear", lambda: full_loads.append(True))
+
+    # Another worker edits the idea and adds a near-duplicate
+    first.idea_detail = "เปลี่ยนเป็นระบบจองคิวรถรับส่งพนักงานล่วงหน้าผ่านเว็บไซต์"
+    first.update_datetime = now + timedelta(seconds=1)
+    second = add_idea(db, "Payment alert", DETAIL + " ใหม่", now + timedelta(seconds=2))
+    index.ensure_fresh(db)
+
+    matches = [seq for seq, _ in index.find_duplicates("Payment alert", DETAIL)]
+    assert second.idea_seq in matches
+    assert first.idea_seq not in matches
+
+    # Deleted ideas are dropped through the tombstone table
+    db.add(models.IdeaTankTombstone(idea_seq=second.idea_seq, idea_code=second.idea_code))
+    db.delete(second)
+    db.commit()
+    index.ensure_fresh(db)
+
+    assert second.idea_seq not in [seq for seq, _ in index.find_duplicates("Payment alert", DETAIL)]
+    assert full_loads == []
+
+
+def test_index_idea_keeps_the_index_fresh(db, count_statements):
+    index = IdeaDedupIndex()
+    index.ensure_fresh(db)
+    idea = add_idea(db, "Shuttle booking", DETAIL + " รถรับส่ง", datetime.now() + timedelta(minutes=1))
+
+    index.index_idea(idea.idea_seq, idea.idea_name, idea.idea_detail, idea.update_datetime)
+    _, statements = count_statements(lambda: index.ensure_fresh(db))
+
+    # Only the watermark query: the write was already applied locally
+    assert statements == 1
+
+
+def test_in_file_dedup_tracks_a_bounded_number_of_rows():
+    signature = idea_signature("Payment alert", DETAIL)
+    batch = ImportDedupBatch(IdeaDedupIndex(), max_in_file_rows=1)
+
+    assert batch.check(2, "Payment alert", signature) is None
+    assert batch.check(3, "Payment alert", signature)["matches_rows"] == [2]
+    # Row 3 was not tracked, so row 4 only matches the first row
+    assert batch.check(4, "Payment alert", signature)["matches_rows"] == [2]
+
+    untracked = ImportDedupBatch(IdeaDedupIndex(), max_in_file_rows=0)
+    assert untracked.check(2, "Payment alert", signature) is None
+    assert untracked.check(3, "Payment alert", signature) is None
@@ -0,0 +1,43 @@
+"""
+Export Artifact Cache
+Renders done elsewhere stream to the client while they are written, and are cached once complete
+"""
+
+import threading
+
+import pytest
+
+from app.services.export_cache import ExportArtifactCache
+
+
+def test_render_streaming_sends_bytes_before_the_render_finishes(tmp_path):
+    cache = ExportArtifactCache(str(tmp_path), max_files=5)
+    release = threading.Event()
+
+    def write(part_path):
+        with open(part_path, "wb") as part:
+            part.write(b"header\n")
+            part.flush()
+            assert release.wait(5)
+            part.write(b"rows\n")
+
+    chunks = cache.render_streaming("key", "csv", write)
+    assert next(chunks) == b"header\n"
+    release.set()
+    assert b"".join(chunks) == b"rows\n"
+    with open(cache.get("key", "csv"), "rb") as artifact:
+        assert artifact.read() == b"header\nrows\n"
+
+
+def test_render_streaming_raises_and_caches_nothing_when_the_render_fails(tmp_path):
+    cache = ExportArtifactCache(str(tmp_path), max_files=5)
+
+    def write(part_path):
+        with open(part_path, "wb") as part:
+            part.write(b"header\n")
+        raise TimeoutError("render took too long")
+
+    with pytest.raises(TimeoutError):
+        b"".join(cache.render_streaming("key", "csv", write))
+    assert cache.get("key", "csv") is None
+    assert list(tmp_path.iterdir()) == []
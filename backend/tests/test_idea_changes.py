@@ -0,0 +1,57 @@
+"""
+Idea Change Feed
+GET /ideas/changes pages by idea_seq and hands out a database-clock watermark with a safety margin
+"""
+
+from datetime import datetime, timedelta
+
+from app.db import models
+from app.services.idea_cache import SNAPSHOT_WATERMARK_OVERLAP
+
+
+def sync(client, headers, since=None, limit=2):
+    """Page through the feed like a client would; returns (upsert seqs, deleted seqs, first watermark)."""
+    params = {"limit": limit}
+    if since is not None:
+        params["since"] = since
+    upserts, deleted, watermark = [], [], None
+    while True:
+        response = client.get("/ideas/changes", headers=headers, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["upserts"]) <= limit
+        watermark = watermark or page["watermark"]
+        upserts += [idea["idea_seq"] for idea in page["upserts"]]
+        deleted += [tombstone["idea_seq"] for tombstone in page["deleted"]]
+        if page["next_after_seq"] is None:
+            return upserts, deleted, watermark
+        params["after_seq"] = page["next_after_seq"]
+
+
+def test_change_feed_pages_and_overlaps(client, db, admin_headers):
+    ideas = [models.IdeaTank(idea_name=f"Feed {number}", idea_detail="Detail") for number in range(5)]
+    db.add_all(ideas)
+    db.commit()
+    seqs = [idea.idea_seq for idea in ideas]
+
+    upserts, deleted, watermark = sync(client, admin_headers)
+    assert set(seqs) <= set(upserts)
+    assert upserts == sorted(upserts)
+    assert deleted == []
+    assert datetime.fromisoformat(watermark) <= datetime.now() - SNAPSHOT_WATERMARK_OVERLAP + timedelta(seconds=5)
+
+    # A row stamped a little behind the watermark (slow clock, late commit) is still sent
+    ideas[0].update_datetime = datetime.fromisoformat(watermark) + timedelta(seconds=1)
+    db.add(models.IdeaTankTombstone(idea_seq=ideas[1].idea_seq, idea_code=ideas[1].idea_code))
+    db.delete(ideas[1])
+    db.commit()
+
+    upserts, deleted, _ = sync(client, admin_headers, since=watermark)
+    assert seqs[0] in upserts
+    assert seqs[1] not in upserts
+    assert seqs[1] in deleted
+
+
+def test_change_feed_rejects_bad_limit(client, admin_headers):
+    response = client.get("/ideas/changes", headers=admin_headers, params={"limit": 0})
+    assert response.status_code == 400
@@ -0,0 +1,267 @@
+"""
+Idea Import
+The parse process hands over normalized rows and their MinHash signatures; the API process only writes
+"""
+
+import csv
+import json
+import threading
+
+import pytest
+
+from app.db import models
+from app.services import idea_import
+from app.services.idea_import import (
+    IDEA_IMPORT_COLUMNS,
+    IdeaImportError,
+    ImportProgress,
+    import_idea_chunks,
+    import_ideas_from_file,
+    iter_ndjson_chunks,
+    parse_chunk,
+    iter_spooled_chunks,
+    parse_upload_to_spool,
+    upsert_idea_chunks,
+)
+
+DETAIL = "แอปพลิเคชันจองห้องประชุมพร้อมระบบแจ้งเตือนอัตโนมัติสำหรับทุกสาขา"
+
+
+def write_upload(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as upload:
+        writer = csv.DictWriter(upload, fieldnames=IDEA_IMPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_spooled_chunks_carry_normalized_rows_and_signatures(tmp_path, db):
+    upload = tmp_path / "ideas.csv"
+    write_upload(upload, [
+        {"idea_code": "0012", "idea_name": "Room booking", "idea_detail": DETAIL},
+        {"idea_code": "0013", "idea_name": "Room booking", "idea_detail": DETAIL + "!"},
+        {"idea_code": "0014", "idea_name": "", "idea_detail": ""},
+    ])
+    spool = tmp_path / "ideas.pkl"
+    parse_upload_to_spool(str(upload), str(spool), with_signatures=True)
+
+    (chunk,) = list(iter_spooled_chunks(str(spool)))
+    assert chunk.records[0]["idea_code"] == "0012"
+    assert chunk.records[0]["idea_comment"] is None
+    assert chunk.signatures[0] is not None
+    assert chunk.signatures[2] is None
+
+    result = import_idea_chunks(db, iter_spooled_chunks(str(spool)), dedup_mode="report")
+    assert result["imported_count"] == 3
+    assert [duplicate["row"] for duplicate in result["duplicates"]] == [3]
+
+
+def test_spooled_chunks_skip_signatures_when_not_deduplicating(tmp_path):
+    upload = tmp_path / "ideas.csv"
+    write_upload(upload, [{"idea_code": "0015", "idea_name": "Room booking", "idea_detail": DETAIL}])
+    spool = tmp_path / "ideas.pkl"
+    parse_upload_to_spool(str(upload), str(spool))
+
+    (chunk,) = list(iter_spooled_chunks(str(spool)))
+    assert chunk.signatures is None
+
+
+def test_ndjson_lines_may_leave_out_optional_keys(tmp_path):
+    upload = tmp_path / "ideas.ndjson"
+    upload.write_text("\n".join(json.dumps(line) for line in [
+        {"idea_name": "Room booking", "idea_detail": DETAIL},
+        {"idea_name": "Shuttle", "idea_code": "0015"},
+    ]))
+
+    (chunk,) = list(iter_ndjson_chunks(str(upload)))
+    assert list(chunk.columns) == IDEA_IMPORT_COLUMNS
+    assert chunk["idea_code"].isna().tolist() == [True, False]
+    assert chunk["idea_code"].tolist()[1] == "0015"
+
+    upload.write_text(json.dumps({"idea_detail": DETAIL}))
+    with pytest.raises(IdeaImportError, match="idea_name"):
+        list(iter_ndjson_chunks(str(upload)))
+
+
+class InlinePool:
+    """Stands in for the CPU task pool: runs the task in this process and records it."""
+
+    def __init__(self):
+        self.calls = []
+
+    def run(self, func, *args, cancel_event=None):
+        self.calls.append(func.__name__)
+        return func(*args)
+
+
+@pytest.mark.parametrize("offload_min_bytes, expected_calls", [
+    (1024 * 1024, []),
+    (0, ["parse_upload_to_spool"]),
+])
+def test_only_large_uploads_are_parsed_in_the_pool(tmp_path, db, monkeypatch, offload_min_bytes, expected_calls):
+    pool = InlinePool()
+    monkeypatch.setattr(idea_import, "cpu_task_pool", pool)
+    monkeypatch.setattr(idea_import, "IMPORT_OFFLOAD_MIN_BYTES", offload_min_bytes)
+    upload = tmp_path / "ideas.csv"
+    write_upload(upload, [{"idea_code": "0016", "idea_name": "Canteen queue", "idea_detail": "Detail"}])
+
+    result = import_ideas_from_file(db, str(upload), dedup_mode="off")
+
+    assert result["imported_count"] == 1
+    assert pool.calls == expected_calls
+
+
+def test_chunks_are_written_while_the_parse_is_running(tmp_path, db, monkeypatch):
+    first, second = tmp_path / "first.csv", tmp_path / "second.csv"
+    write_upload(first, [{"idea_code": "0017", "idea_name": "Parking app", "idea_detail": "Detail"}])
+    write_upload(second, [{"idea_code": "0018", "idea_name": "Locker app", "idea_detail": "Detail"}])
+    first_written = threading.Event()
+
+    class TwoStepPool:
+        def run(self, func, path, spool_path, with_signatures, cancel_event=None):
+            # Spool one chunk, and only spool the next once the writer has taken the first
+            func(str(first), spool_path, with_signatures)
+            assert first_written.wait(5)
+            func(str(second), spool_path, with_signatures)
+
+    class Progress(ImportProgress):
+        def __init__(self):
+            self.parsed_counts = []
+
+        def inserted(self, count):
+            first_written.set()
+
+        def parsed(self, count):
+            self.parsed_counts.append(count)
+
+    monkeypatch.setattr(idea_import, "cpu_task_pool", TwoStepPool())
+    monkeypatch.setattr(idea_import, "IMPORT_OFFLOAD_MIN_BYTES", 0)
+    progress = Progress()
+
+    result = import_ideas_from_file(db, str(first), dedup_mode="off", progress=progress)
+
+    assert result["imported_count"] == 2
+    assert progress.parsed_counts == [1, 1]
+
+
+def test_parse_failure_is_raised_after_the_spooled_chunks(tmp_path, db, monkeypatch):
+    upload = tmp_path / "ideas.csv"
+    write_upload(upload, [{"idea_code": "0019", "idea_name": "Bike share", "idea_detail": "Detail"}])
+
+    class FailingPool:
+        def run(self, func, path, spool_path, with_signatures, cancel_event=None):
+            func(path, spool_path, with_signatures)
+            raise IdeaImportError("Broken row group")
+
+    monkeypatch.setattr(idea_import, "cpu_task_pool", FailingPool())
+    monkeypatch.setattr(idea_import, "IMPORT_OFFLOAD_MIN_BYTES", 0)
+    progress = ImportProgress()
+    inserted = []
+    progress.inserted = inserted.append
+
+    with pytest.raises(IdeaImportError, match="Broken row group"):
+        import_ideas_from_file(db, str(upload), dedup_mode="off", progress=progress)
+    assert inserted == [1]
+
+
+def test_row_numbers_and_codes_survive_blank_rows(tmp_path):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(IDEA_IMPORT_COLUMNS)
+    code, name = IDEA_IMPORT_COLUMNS.index("idea_code"), IDEA_IMPORT_COLUMNS.index("idea_name")
+    for values in [{code: 12, name: "Parking"}, {}, {name: "No code"}, {code: 14, name: "Locker"}]:
+        sheet.append([values.get(i) for i in range(len(IDEA_IMPORT_COLUMNS))])
+    xlsx = tmp_path / "ideas.xlsx"
+    workbook.save(xlsx)
+
+    csv_upload = tmp_path / "ideas.csv"
+    csv_upload.write_text(
+        ",".join(IDEA_IMPORT_COLUMNS) + "\n"
+        + "\n".join(",".join(row.get(col, "") for col in IDEA_IMPORT_COLUMNS) for row in [
+            {"idea_code": "12", "idea_name": "Parking"}, {}, {"idea_name": "No code"},
+            {"idea_code": "14", "idea_name": "Locker"},
+        ]) + "\n",
+        encoding="utf-8",
+    )
+
+    ndjson = tmp_path / "ideas.ndjson"
+    ndjson.write_text("\n".join([
+        json.dumps({"idea_code": 12, "idea_name": "Parking"}), "",
+        json.dumps({"idea_name": "No code"}), json.dumps({"idea_code": 14, "idea_name": "Locker"}),
+    ]))
+
+    # Spreadsheets count the header as row 1; NDJSON counts lines
+    expected = {
+        xlsx: [(2, "12"), (4, None), (5, "14")],
+        csv_upload: [(2, "12"), (4, None), (5, "14")],
+        ndjson: [(1, "12"), (3, None), (4, "14")],
+    }
+    for upload, rows in expected.items():
+        reader = idea_import.get_import_reader(str(upload))
+        parsed = [parse_chunk(chunk) for chunk in reader(str(upload))]
+        codes = [
+            (row_no, record["idea_code"])
+            for chunk in parsed for row_no, record in zip(chunk.row_numbers, chunk.records)
+        ]
+        assert codes == rows, upload.name
+
+
+def test_rejected_rows_report_the_source_row(tmp_path, db):
+    upload = tmp_path / "ideas.csv"
+    write_upload(upload, [
+        {"idea_code": "0020", "idea_name": "Fine", "idea_detail": "Detail"},
+        {},
+        {"idea_code": "0021", "idea_name": "x" * 501, "idea_detail": "Detail"},
+    ])
+
+    result = import_ideas_from_file(db, str(upload), dedup_mode="off")
+
+    assert result["imported_count"] == 1
+    assert result["errors"] == ["Row 4: idea_name exceeds 500 characters"]
+
+
+def parsed_chunks(path):
+    reader = idea_import.get_import_reader(str(path))
+    return [parse_chunk(chunk) for chunk in reader(str(path))]
+
+
+def test_upsert_stages_the_last_row_of_each_code(tmp_path):
+    upload = tmp_path / "ideas.csv"
+    write_upload(upload, [
+        {"idea_code": "0030", "idea_name": "First", "idea_detail": "Detail"},
+        {"idea_name": "No code", "idea_detail": "Detail"},
+        {"idea_code": "0030", "idea_name": "Second", "idea_detail": "Detail"},
+        {"idea_code": "0031", "idea_name": "x" * 501, "idea_detail": "Detail"},
+        {"idea_code": "0032", "idea_name": "Other", "idea_detail": "Detail"},
+    ])
+    (chunk,) = parsed_chunks(upload)
+    errors = []
+
+    staged = idea_import._stage_upsert_chunk(chunk, errors, ImportProgress())
+
+    assert {code: (row_no, record["idea_name"]) for code, (row_no, record) in staged.items()} == {
+        "0030": (4, "Second"), "0032": (6, "Other"),
+    }
+    assert errors == ["Row 3: idea_code is required for upsert", "Row 5: idea_name exceeds 500 characters"]
+
+
+def test_failed_upsert_chunk_is_rolled_back_and_reported(tmp_path, db):
+    # SQLite has no MERGE, so every chunk takes the failure path
+    upload = tmp_path / "ideas.csv"
+    write_upload(upload, [
+        {"idea_code": "0033", "idea_name": "Kiosk", "idea_detail": "Detail"},
+        {"idea_name": "No code", "idea_detail": "Detail"},
+        {"idea_code": "0034", "idea_name": "Locker", "idea_detail": "Detail"},
+    ])
+    progress = ImportProgress()
+    rejected = []
+    progress.rejected = lambda row_no, record, reason: rejected.append(row_no)
+
+    result = upsert_idea_chunks(db, iter(parsed_chunks(upload)), progress=progress)
+
+    assert result["imported_count"] == 0
+    assert result["errors"][0] == "Row 3: idea_code is required for upsert"
+    assert result["errors"][1].startswith("Rows 2-4: ")
+    assert rejected == [3, 2, 4]
+    assert not db.query(models.IdeaTank).filter(models.IdeaTank.idea_code.in_(["0033", "0034"])).count()
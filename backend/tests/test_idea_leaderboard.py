@@ -0,0 +1,59 @@
+"""
+Idea Leaderboard
+GET /ideas/leaderboard ranks scored ideas by idea_score DESC, idea_seq ASC and pages by rank
+"""
+
+from app.db import models
+
+
+def add_scored(db, category, scores):
+    ideas = [
+        models.IdeaTank(
+            idea_name=f"Ranked {score}", idea_detail="Detail", category_idea_type1=category, idea_score=score,
+        )
+        for score in scores
+    ]
+    db.add_all(ideas)
+    db.commit()
+    return [idea.idea_seq for idea in ideas]
+
+
+def test_leaderboard_breaks_ties_by_idea_seq_and_pages_by_rank(client, db, admin_headers):
+    seqs = add_scored(db, "Leaderboard", [70, 95, 70, None, 88])
+    params = {"category_idea_type1": "Leaderboard", "limit": 2}
+
+    ranked, pages = [], 0
+    while True:
+        response = client.get("/ideas/leaderboard", headers=admin_headers, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        ranked += [(item["rank"], item["idea_seq"]) for item in page["items"]]
+        pages += 1
+        if page["next_after_rank"] is None:
+            break
+        params["after_rank"] = page["next_after_rank"]
+
+    # Unscored ideas are left out; the two 70s keep insertion order
+    assert ranked == [(1, seqs[1]), (2, seqs[4]), (3, seqs[0]), (4, seqs[2])]
+    assert pages == 2
+
+
+def test_leaderboard_per_category(client, db, admin_headers):
+    first = add_scored(db, "Per category A", [10, 30, 20])
+    second = add_scored(db, "Per category B", [50])
+
+    response = client.get("/ideas/leaderboard", headers=admin_headers, params={"per_category": True, "limit": 2})
+
+    assert response.status_code == 200
+    page = response.json()
+    assert page["next_after_rank"] is None
+    by_category = {}
+    for item in page["items"]:
+        by_category.setdefault(item["category_idea_type1"], []).append(item["idea_seq"])
+    assert by_category["Per category A"] == [first[1], first[2]]
+    assert by_category["Per category B"] == second
+
+
+def test_leaderboard_rejects_bad_limit(client, admin_headers):
+    response = client.get("/ideas/leaderboard", headers=admin_headers, params={"limit": 501})
+    assert response.status_code == 400
@@ -0,0 +1,108 @@
+"""
+Idea Snapshot
+Incremental refreshes pick up changed rows and tombstones, fall back to a full reload when the row
+count disagrees, and list_json filters exactly like _filter_ideas in the routes
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from app.api.routes import _filter_ideas
+from app.db import models
+from app.services.idea_cache import IdeaSnapshot
+
+
+class RecordingSnapshot(IdeaSnapshot):
+    def __init__(self):
+        super().__init__(refresh_seconds=3600)
+        self.loads = []
+
+    def _load(self, db, since):
+        self.loads.append("full" if since is None else "incremental")
+        super()._load(db, since)
+
+
+def add_ideas(db, *names):
+    ideas = [models.IdeaTank(idea_name=name, idea_detail="Detail", idea_code=name[:10]) for name in names]
+    db.add_all(ideas)
+    db.commit()
+    return ideas
+
+
+def test_refresh_rereads_changed_rows_and_drops_tombstoned_ones(db):
+    kept, deleted = add_ideas(db, "SnapKeep", "SnapDrop")
+    snapshot = RecordingSnapshot()
+    snapshot.ensure_fresh(db)
+    assert snapshot.get_json(deleted.idea_seq) is not None
+
+    kept.idea_name = "SnapKeep renamed"
+    kept.update_datetime = datetime.now()
+    db.add(models.IdeaTankTombstone(idea_seq=deleted.idea_seq, idea_code=deleted.idea_code))
+    db.delete(deleted)
+    db.commit()
+
+    # Not due yet and not dirty: nothing is re-read
+    snapshot.ensure_fresh(db)
+    assert snapshot.loads == ["full"]
+
+    snapshot.mark_dirty()
+    snapshot.ensure_fresh(db)
+
+    assert snapshot.loads == ["full", "incremental"]
+    assert json.loads(snapshot.get_json(kept.idea_seq))["idea_name"] == "SnapKeep renamed"
+    assert json.loads(snapshot.get_json_by_code("SnapKeep"))["idea_seq"] == kept.idea_seq
+    assert snapshot.get_json(deleted.idea_seq) is None
+    assert snapshot.get_json_by_code("SnapDrop") is None
+
+
+def test_refresh_reloads_everything_when_the_row_count_disagrees(db):
+    (vanished,) = add_ideas(db, "SnapGone")
+    snapshot = RecordingSnapshot()
+    snapshot.ensure_fresh(db)
+
+    # Deleted without a tombstone, e.g. straight in SQL
+    assert not db.query(models.IdeaTankTombstone).filter_by(idea_seq=vanished.idea_seq).count()
+    db.delete(vanished)
+    db.commit()
+    snapshot.mark_dirty()
+    snapshot.ensure_fresh(db)
+
+    assert snapshot.loads == ["full", "incremental", "full"]
+    assert snapshot.get_json(vanished.idea_seq) is None
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"keyword": "ROOM"},
+    {"keyword": "snapcode"},
+    {"min_score": 50},
+    {"max_score": 50},
+    {"min_score": 40, "max_score": 80},
+    {"category_idea_type1": "Snap category"},
+    {"idea_status_md": "Snap status"},
+    {"keyword": "room", "category_idea_type1": "Snap category", "min_score": 10},
+])
+def test_list_json_filters_like_filter_ideas(db, filters):
+    db.add_all([
+        models.IdeaTank(idea_name="Room booking", idea_detail="Detail", idea_score=80,
+                        category_idea_type1="Snap category", idea_status_md="Snap status"),
+        models.IdeaTank(idea_name="Parking", idea_detail="Meeting room nearby", idea_score=40,
+                        category_idea_type1="Snap category"),
+        models.IdeaTank(idea_name="Shuttle", idea_detail="Detail", idea_keywords="room, bus",
+                        idea_status_md="Snap status"),
+        models.IdeaTank(idea_name="Canteen", idea_detail="Detail", idea_code="SNAPCODE1", idea_score=50),
+    ])
+    db.commit()
+    snapshot = IdeaSnapshot(refresh_seconds=3600)
+    snapshot.ensure_fresh(db)
+
+    expected = [
+        seq for (seq,) in
+        _filter_ideas(db.query(models.IdeaTank.idea_seq), **filters).order_by(models.IdeaTank.idea_seq)
+    ]
+    listed = [idea["idea_seq"] for idea in json.loads(snapshot.list_json(**filters))]
+
+    assert listed == expected
+    assert expected
@@ -0,0 +1,33 @@
+"""
+Import Jobs
+A job reports itself finished only after its error file is complete
+"""
+
+from app.services import import_jobs
+from app.services.import_jobs import JOB_COMPLETED, JOB_RUNNING, ImportJob, ImportJobManager
+
+
+def test_job_finishes_after_error_file_is_closed(monkeypatch, tmp_path):
+    def fake_import(db, path, dedup_mode, mode, progress, cancel_event):
+        progress.rejected(2, {"idea_name": "Bad row"}, "idea_name is required")
+        return {"imported_count": 0}
+
+    monkeypatch.setattr(import_jobs, "import_ideas_from_file", fake_import)
+    upload = tmp_path / "ideas.csv"
+    upload.write_text("idea_name\n")
+    job = ImportJob("ideas.csv", dedup_mode="off", mode="insert")
+    seen_when_closing = []
+    close_error_file = job.close_error_file
+
+    def close_and_record():
+        seen_when_closing.append((job.status, job.to_dict()["has_error_file"]))
+        close_error_file()
+
+    monkeypatch.setattr(job, "close_error_file", close_and_record)
+    ImportJobManager(max_workers=1, retention_seconds=60)._run(job, str(upload))
+
+    assert seen_when_closing == [(JOB_RUNNING, False)]
+    assert job.status == JOB_COMPLETED
+    assert job.to_dict()["has_error_file"]
+    with open(job.error_file_path, encoding="utf-8-sig") as error_file:
+        assert "idea_name is required" in error_file.read()
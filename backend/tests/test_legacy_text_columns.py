@@ -0,0 +1,32 @@
+"""
+Legacy text Columns
+The NVARCHAR types the swap migrations create agree with the models
+"""
+
+from sqlalchemy import NVARCHAR
+
+from app.db import models
+from app.db.legacy_text_columns import LEGACY_TEXT_COLUMNS, add_shadow_column_sql, swap_column_sql
+
+
+def test_models_match_the_swapped_column_types():
+    tables = {f"dbo.{table.name}": table for table in models.Base.metadata.tables.values()}
+    for table_name, legacy in LEGACY_TEXT_COLUMNS.items():
+        for column in legacy.columns:
+            column_type = tables[table_name].c[column].type
+            assert isinstance(column_type, NVARCHAR)
+            assert column_type.length == legacy.lengths.get(column), f"{table_name}.{column}"
+
+
+def test_short_columns_get_a_bounded_type():
+    idea_tank = LEGACY_TEXT_COLUMNS["dbo.idea_tank"]
+
+    assert "ADD idea_status__nvarchar NVARCHAR(100) NULL" in add_shadow_column_sql(
+        "dbo.idea_tank", "idea_status", idea_tank.column_type("idea_status")
+    )
+    assert "ADD idea_detail__nvarchar NVARCHAR(MAX) NULL" in add_shadow_column_sql(
+        "dbo.idea_tank", "idea_detail", idea_tank.column_type("idea_detail")
+    )
+    assert "ALTER COLUMN set_value NVARCHAR(MAX) NOT NULL" in swap_column_sql(
+        "dbo.tb_setting", "set_value", True, LEGACY_TEXT_COLUMNS["dbo.tb_setting"].column_type("set_value")
+    )
@@ -0,0 +1,43 @@
+"""
+Read Your Writes
+Anonymous writers are told apart by a cookie, not by the (shared) client address
+"""
+
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.db.database import ReadYourWrites, read_your_writes
+from app.main import app
+from app.services.auth_service import get_password_hash
+
+
+def as_request(client: TestClient) -> Request:
+    """The next request this client would send, as the app sees it."""
+    cookies = "; ".join(f"{name}={value}" for name, value in client.cookies.items())
+    headers = [(b"cookie", cookies.encode())] if cookies else []
+    return Request({"type": "http", "headers": headers, "client": ("testclient", 50000)})
+
+
+def test_anonymous_write_sticks_only_to_its_writer():
+    writer, other = TestClient(app), TestClient(app)
+
+    response = writer.post("/ideas", json={"idea_name": "Sticky", "idea_detail": "Detail"})
+
+    assert response.status_code == 201
+    assert ReadYourWrites.cookie_name in writer.cookies
+    assert read_your_writes.wrote_recently(as_request(writer))
+    # Same address as the writer, but no cookie: stays on the replica
+    assert not read_your_writes.wrote_recently(as_request(other))
+
+
+def test_logging_in_does_not_count_as_a_write(db, user_factory):
+    user = user_factory("RYW-LOGIN", "ryw_login")
+    user.user_password = get_password_hash("secret")
+    db.commit()
+    client = TestClient(app)
+
+    response = client.post("/auth/login", json={"user_login": "ryw_login", "user_password": "secret"})
+
+    assert response.status_code == 200
+    assert ReadYourWrites.cookie_name not in client.cookies
+    assert not read_your_writes.wrote_recently(as_request(client))
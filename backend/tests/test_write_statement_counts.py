@@ -0,0 +1,111 @@
+"""
+Write Statement Counts
+Upper bounds on the statements each write route sends to the primary. Written rows come back
+through INSERT/UPDATE ... RETURNING (OUTPUT on SQL Server), so no route refreshes or re-queries
+after its write. On SQL Server the member rows of a submission go in one multi-row INSERT; SQLite
+runs that INSERT once per member, so the bounds here count one statement per member.
+"""
+
+import pytest
+
+from app.api import routes
+
+
+def member(number: int, leader: bool = False) -> dict:
+    return {"EmpCode": f"E{number:03d}", "FullNameTh": f"Member {number}", "IsTeamLeader": leader}
+
+
+TEAM_MEMBERS = [member(1, leader=True), member(2), member(3)]
+
+SUBMISSION_STEP1 = {"TeamName": "Team", "SubmissionTypeCode": "TEAM", "Members": TEAM_MEMBERS}
+SUBMISSION_COMPLETE = {
+    "ChallengeNo": 1,
+    "InnovationTypeNo": 1,
+    "IdeaSourceCoPs": True,
+    "TargetCustomerHtml": "<p>Customers</p>",
+    "IdeaConceptHtml": "<p>Concept</p>",
+    "ExpectedBenefitHtml": "<p>Benefit</p>",
+}
+
+SUBMISSION_NEW_STEP1 = {
+    "CreativeIdeaName": "Idea", "SubmissionTypeCode": "INDIVIDUAL", "Members": [member(9, leader=True)],
+}
+SUBMISSION_NEW_COMPLETE = {
+    "ChallengeNo": 1,
+    "ChallengeCategoryNo": 1,
+    "StrategicObjectiveSO1": True,
+    "IdeaSourceCoPs": True,
+    "TargetCustomerTypeNo": 1,
+    "TargetCustomerProblemHtml": "<p>Problem</p>",
+    "InnovationTypeNo": 1,
+    "IdeaConceptHtml": "<p>Concept</p>",
+    "DigitalInnovationNo": 1,
+    "NoveltyLevelNo": 1,
+    "InnovationValueFinancial": True,
+    "FinancialValueRevenue": True,
+}
+
+
+def test_create_answer(client, count_statements, monkeypatch):
+    monkeypatch.setattr(routes, "classify_category", lambda text: "Category")
+    monkeypatch.setattr(routes, "extract_keywords", lambda text: "keyword")
+
+    response, statements = count_statements(lambda: client.post(
+        "/answers", json={"question_id": "Q1", "answer_title": "Title", "answer_text": "Answer"},
+    ))
+
+    assert response.status_code == 201
+    assert response.json()["category"] == "Category"
+    assert statements <= 1
+
+
+def test_create_idea(client, count_statements):
+    response, statements = count_statements(lambda: client.post(
+        "/ideas", json={"idea_name": "Idea", "idea_detail": "Detail"},
+    ))
+
+    assert response.status_code == 201
+    assert response.json()["idea_seq"]
+    assert statements <= 1
+
+
+@pytest.mark.parametrize("prefix, step1, complete, max_create, max_step1", [
+    # INSERT submission + one INSERT per member; step1 adds the UPDATE and the member DELETE
+    ("/project-submissions", SUBMISSION_STEP1, SUBMISSION_COMPLETE, 4, 5),
+    ("/project-submissions-new", SUBMISSION_NEW_STEP1, SUBMISSION_NEW_COMPLETE, 2, 3),
+])
+def test_submission_flow(client, count_statements, prefix, step1, complete, max_create, max_step1):
+    response, statements = count_statements(lambda: client.post(prefix, json=step1))
+    assert response.status_code in (200, 201)
+    assert len(response.json()["members"]) == len(step1["Members"])
+    assert statements <= max_create
+    project_id = response.json()["ProjectId"]
+
+    response, statements = count_statements(lambda: client.put(f"{prefix}/{project_id}/step1", json=step1))
+    assert response.status_code == 200
+    assert statements <= max_step1
+
+    # UPDATE ... RETURNING + the member SELECT
+    response, statements = count_statements(lambda: client.put(f"{prefix}/{project_id}/step2", json=complete))
+    assert response.status_code == 200
+    assert response.json()["IdeaConceptHtml"] == "<p>Concept</p>"
+    assert statements <= 2
+
+    response, statements = count_statements(lambda: client.post(f"{prefix}/{project_id}/submit", json=complete))
+    assert response.status_code == 200
+    assert response.json()["StatusCode"] == "SUBMITTED"
+    assert len(response.json()["members"]) == len(step1["Members"])
+    assert statements <= 2
+
+
+def test_update_user(client, count_statements, admin_headers, user_factory):
+    user_factory("U001", "first.user")
+
+    response, statements = count_statements(lambda: client.put("/users/U001", headers=admin_headers, json={
+        "user_code": "U001", "user_fname": "New", "user_lname": "Name", "user_login": "renamed.user",
+    }))
+
+    assert response.status_code == 200
+    assert response.json()["user_login"] == "renamed.user"
+    # Conflict/existence SELECT + UPDATE ... RETURNING
+    assert statements <= 2
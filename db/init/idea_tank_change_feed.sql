@@ -0,0 +1,32 @@
+-- Change feed support for GET /ideas/changes: the tombstone table and its indexes
+-- Generated from backend/alembic/versions/0005_idea_tank_feed_indexes.py by backend/generate_db_init.py;
+-- edit the migration and re-run the generator instead of changing this file.
+
+IF OBJECT_ID('dbo.idea_tank_tombstone', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.idea_tank_tombstone (
+        tombstone_id BIGINT IDENTITY(1,1) NOT NULL
+            CONSTRAINT PK_idea_tank_tombstone PRIMARY KEY CLUSTERED,
+        idea_seq INT NOT NULL,
+        idea_code VARCHAR(10) NULL,
+        deleted_datetime DATETIME2(6) NOT NULL
+            CONSTRAINT DF_idea_tank_tombstone_deleted_datetime DEFAULT (GETDATE())
+    );
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes WHERE name = 'IX_idea_tank_update_datetime' AND object_id = OBJECT_ID('dbo.idea_tank')
+)
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_idea_tank_update_datetime ON dbo.idea_tank (update_datetime) ;
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes WHERE name = 'IX_idea_tank_tombstone_deleted_datetime' AND object_id = OBJECT_ID('dbo.idea_tank_tombstone')
+)
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_idea_tank_tombstone_deleted_datetime ON dbo.idea_tank_tombstone (deleted_datetime) ;
+END
+GO
@@ -0,0 +1,11 @@
+-- Leaderboard index for GET /ideas/leaderboard
+-- Generated from backend/alembic/versions/0005_idea_tank_feed_indexes.py by backend/generate_db_init.py;
+-- edit the migration and re-run the generator instead of changing this file.
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes WHERE name = 'IX_idea_tank_score_rank' AND object_id = OBJECT_ID('dbo.idea_tank')
+)
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_idea_tank_score_rank ON dbo.idea_tank (idea_score DESC, idea_seq ASC) INCLUDE (idea_code, category_idea_type1, idea_name) WHERE idea_score IS NOT NULL;
+END
+GO
@@ -1,9 +1,10 @@
-IF OBJECT_ID('dbo.vProjectSubmissionNewExport', 'V') IS NOT NULL
-    DROP VIEW dbo.vProjectSubmissionNewExport;
-GO
+-- Export view of dbo.ProjectSubmissionNew (needs project_submission_plain_text.sql)
+-- Generated from backend/alembic/versions/0006_submission_plain_text.py by backend/generate_db_init.py;
+-- edit the migration and re-run the generator instead of changing this file.
 
-CREATE VIEW dbo.vProjectSubmissionNewExport
+CREATE OR ALTER VIEW dbo.vProjectSubmissionNewExport
 AS
+-- The *Html columns carry the precomputed plain text
 SELECT
     p.ProjectId,
     p.EventYear,
@@ -48,12 +49,12 @@ SELECT
 
     p.TargetCustomerTypeNo,
     p.TargetCustomerTypeText,
-    p.TargetCustomerProblemHtml,
+    p.TargetCustomerProblemPlainText AS TargetCustomerProblemHtml,
 
     p.InnovationTypeNo,
     p.InnovationTypeText,
 
-    p.IdeaConceptHtml,
+    p.IdeaConceptPlainText AS IdeaConceptHtml,
 
     p.DigitalInnovationNo,
     p.DigitalInnovationText,
@@ -64,44 +65,44 @@ SELECT
     p.InnovationValueFinancial,
     p.FinancialValueRevenue,
     p.FinancialValueCostSaving,
-    p.FinancialValueDetailHtml,
+    p.FinancialValueDetailPlainText AS FinancialValueDetailHtml,
 
     p.InnovationValueNonFinancial,
     p.NonFinancialValueCustomerSatisfaction,
     p.NonFinancialValueWorkEfficiency,
     p.NonFinancialValueCustomerQuality,
     p.NonFinancialValueEnvironment,
-    p.NonFinancialValueDetailHtml,
-
-    MAX(CASE WHEN m.MemberSeq = 1 THEN m.EmpCode END) AS Member1EmpCode,
-    MAX(CASE WHEN m.MemberSeq = 1 THEN m.FullNameTh END) AS Member1FullNameTh,
-    MAX(CASE WHEN m.MemberSeq = 1 THEN m.PositionName END) AS Member1PositionName,
-    MAX(CASE WHEN m.MemberSeq = 1 THEN m.OrgName END) AS Member1OrgName,
-    MAX(CASE WHEN m.MemberSeq = 1 THEN m.MobileNo END) AS Member1MobileNo,
-
-    MAX(CASE WHEN m.MemberSeq = 2 THEN m.EmpCode END) AS Member2EmpCode,
-    MAX(CASE WHEN m.MemberSeq = 2 THEN m.FullNameTh END) AS Member2FullNameTh,
-    MAX(CASE WHEN m.MemberSeq = 2 THEN m.PositionName END) AS Member2PositionName,
-    MAX(CASE WHEN m.MemberSeq = 2 THEN m.OrgName END) AS Member2OrgName,
-    MAX(CASE WHEN m.MemberSeq = 2 THEN m.MobileNo END) AS Member2MobileNo,
-
-    MAX(CASE WHEN m.MemberSeq = 3 THEN m.EmpCode END) AS Member3EmpCode,
-    MAX(CASE WHEN m.MemberSeq = 3 THEN m.FullNameTh END) AS Member3FullNameTh,
-    MAX(CASE WHEN m.MemberSeq = 3 THEN m.PositionName END) AS Member3PositionName,
-    MAX(CASE WHEN m.MemberSeq = 3 THEN m.OrgName END) AS Member3OrgName,
-    MAX(CASE WHEN m.MemberSeq = 3 THEN m.MobileNo END) AS Member3MobileNo,
-
-    MAX(CASE WHEN m.MemberSeq = 4 THEN m.EmpCode END) AS Member4EmpCode,
-    MAX(CASE WHEN m.MemberSeq = 4 THEN m.FullNameTh END) AS Member4FullNameTh,
-    MAX(CASE WHEN m.MemberSeq = 4 THEN m.PositionName END) AS Member4PositionName,
-    MAX(CASE WHEN m.MemberSeq = 4 THEN m.OrgName END) AS Member4OrgName,
-    MAX(CASE WHEN m.MemberSeq = 4 THEN m.MobileNo END) AS Member4MobileNo,
-
-    MAX(CASE WHEN m.MemberSeq = 5 THEN m.EmpCode END) AS Member5EmpCode,
-    MAX(CASE WHEN m.MemberSeq = 5 THEN m.FullNameTh END) AS Member5FullNameTh,
-    MAX(CASE WHEN m.MemberSeq = 5 THEN m.PositionName END) AS Member5PositionName,
-    MAX(CASE WHEN m.MemberSeq = 5 THEN m.OrgName END) AS Member5OrgName,
-    MAX(CASE WHEN m.MemberSeq = 5 THEN m.MobileNo END) AS Member5MobileNo,
+    p.NonFinancialValueDetailPlainText AS NonFinancialValueDetailHtml,
+
+    m.Member1EmpCode,
+    m.Member1FullNameTh,
+    m.Member1PositionName,
+    m.Member1OrgName,
+    m.Member1MobileNo,
+
+    m.Member2EmpCode,
+    m.Member2FullNameTh,
+    m.Member2PositionName,
+    m.Member2OrgName,
+    m.Member2MobileNo,
+
+    m.Member3EmpCode,
+    m.Member3FullNameTh,
+    m.Member3PositionName,
+    m.Member3OrgName,
+    m.Member3MobileNo,
+
+    m.Member4EmpCode,
+    m.Member4FullNameTh,
+    m.Member4PositionName,
+    m.Member4OrgName,
+    m.Member4MobileNo,
+
+    m.Member5EmpCode,
+    m.Member5FullNameTh,
+    m.Member5PositionName,
+    m.Member5OrgName,
+    m.Member5MobileNo,
 
     p.StatusCode,
     p.SubmittedAt,
@@ -110,69 +111,42 @@ SELECT
     p.UpdatedByEmpCode,
     p.UpdatedAt
 FROM dbo.ProjectSubmissionNew p
-LEFT JOIN dbo.ProjectSubmissionNewMember m
-    ON p.ProjectId = m.ProjectId
-GROUP BY
-    p.ProjectId,
-    p.EventYear,
-    p.SubmissionTypeCode,
-    p.SubmissionTypeNameTh,
-    p.TeamName,
-    p.CreativeIdeaName,
-    p.ChallengeNo,
-    p.ChallengeText,
-    p.ChallengeCategoryNo,
-    p.ChallengeCategoryText,
-    p.StrategicObjectiveSO1,
-    p.StrategicObjectiveSO2,
-    p.StrategicObjectiveSO3,
-    p.StrategicObjectiveSO4,
-    p.StrategicObjectiveSO5,
-    p.StrategicObjectiveSO6,
-    p.IdeaSourceCoPs,
-    p.IdeaSourceCoPsDetail,
-    p.IdeaSourceLR,
-    p.IdeaSourceLRDetail,
-    p.IdeaSourceResearch,
-    p.IdeaSourceResearchDetail,
-    p.IdeaSourceExperience,
-    p.IdeaSourceExperienceDetail,
-    p.IdeaSourceStudyVisit,
-    p.IdeaSourceStudyVisitDetail,
-    p.IdeaSourceKnowledgeExchange,
-    p.IdeaSourceKnowledgeExchangeDetail,
-    p.IdeaSourceInnovationDatabase,
-    p.IdeaSourceInnovationDatabaseDetail,
-    p.IdeaSourceMarketStudy,
-    p.IdeaSourceMarketStudyDetail,
-    p.IdeaSourceVOS,
-    p.IdeaSourceVOSDetail,
-    p.IdeaSourceOther,
-    p.IdeaSourceOtherDetail,
-    p.TargetCustomerTypeNo,
-    p.TargetCustomerTypeText,
-    p.TargetCustomerProblemHtml,
-    p.InnovationTypeNo,
-    p.InnovationTypeText,
-    p.IdeaConceptHtml,
-    p.DigitalInnovationNo,
-    p.DigitalInnovationText,
-    p.NoveltyLevelNo,
-    p.NoveltyLevelText,
-    p.InnovationValueFinancial,
-    p.FinancialValueRevenue,
-    p.FinancialValueCostSaving,
-    p.FinancialValueDetailHtml,
-    p.InnovationValueNonFinancial,
-    p.NonFinancialValueCustomerSatisfaction,
-    p.NonFinancialValueWorkEfficiency,
-    p.NonFinancialValueCustomerQuality,
-    p.NonFinancialValueEnvironment,
-    p.NonFinancialValueDetailHtml,
-    p.StatusCode,
-    p.SubmittedAt,
-    p.CreatedByEmpCode,
-    p.CreatedAt,
-    p.UpdatedByEmpCode,
-    p.UpdatedAt;
+-- Pivot members on their own table so the submission columns (including the HTML LOBs) never
+-- pass through a GROUP BY, and filters on p.* are applied before the join
+LEFT JOIN (
+    SELECT
+        ProjectId,
+        MAX(CASE WHEN MemberSeq = 1 THEN EmpCode END) AS Member1EmpCode,
+        MAX(CASE WHEN MemberSeq = 1 THEN FullNameTh END) AS Member1FullNameTh,
+        MAX(CASE WHEN MemberSeq = 1 THEN PositionName END) AS Member1PositionName,
+        MAX(CASE WHEN MemberSeq = 1 THEN OrgName END) AS Member1OrgName,
+        MAX(CASE WHEN MemberSeq = 1 THEN MobileNo END) AS Member1MobileNo,
+
+        MAX(CASE WHEN MemberSeq = 2 THEN EmpCode END) AS Member2EmpCode,
+        MAX(CASE WHEN MemberSeq = 2 THEN FullNameTh END) AS Member2FullNameTh,
+        MAX(CASE WHEN MemberSeq = 2 THEN PositionName END) AS Member2PositionName,
+        MAX(CASE WHEN MemberSeq = 2 THEN OrgName END) AS Member2OrgName,
+        MAX(CASE WHEN MemberSeq = 2 THEN MobileNo END) AS Member2MobileNo,
+
+        MAX(CASE WHEN MemberSeq = 3 THEN EmpCode END) AS Member3EmpCode,
+        MAX(CASE WHEN MemberSeq = 3 THEN FullNameTh END) AS Member3FullNameTh,
+        MAX(CASE WHEN MemberSeq = 3 THEN PositionName END) AS Member3PositionName,
+        MAX(CASE WHEN MemberSeq = 3 THEN OrgName END) AS Member3OrgName,
+        MAX(CASE WHEN MemberSeq = 3 THEN MobileNo END) AS Member3MobileNo,
+
+        MAX(CASE WHEN MemberSeq = 4 THEN EmpCode END) AS Member4EmpCode,
+        MAX(CASE WHEN MemberSeq = 4 THEN FullNameTh END) AS Member4FullNameTh,
+        MAX(CASE WHEN MemberSeq = 4 THEN PositionName END) AS Member4PositionName,
+        MAX(CASE WHEN MemberSeq = 4 THEN OrgName END) AS Member4OrgName,
+        MAX(CASE WHEN MemberSeq = 4 THEN MobileNo END) AS Member4MobileNo,
+
+        MAX(CASE WHEN MemberSeq = 5 THEN EmpCode END) AS Member5EmpCode,
+        MAX(CASE WHEN MemberSeq = 5 THEN FullNameTh END) AS Member5FullNameTh,
+        MAX(CASE WHEN MemberSeq = 5 THEN PositionName END) AS Member5PositionName,
+        MAX(CASE WHEN MemberSeq = 5 THEN OrgName END) AS Member5OrgName,
+        MAX(CASE WHEN MemberSeq = 5 THEN MobileNo END) AS Member5MobileNo
+    FROM dbo.ProjectSubmissionNewMember
+    GROUP BY ProjectId
+) m
+    ON p.ProjectId = m.ProjectId;
 GO
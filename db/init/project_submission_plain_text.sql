@@ -0,0 +1,51 @@
+-- Plain-text companions of the *Html columns (then run backend/backfill_plain_text.py)
+-- Generated from backend/alembic/versions/0006_submission_plain_text.py by backend/generate_db_init.py;
+-- edit the migration and re-run the generator instead of changing this file.
+
+IF COL_LENGTH('dbo.ProjectSubmission', 'TargetCustomerPlainText') IS NULL
+BEGIN
+    ALTER TABLE dbo.ProjectSubmission ADD TargetCustomerPlainText NVARCHAR(MAX) NULL;
+END
+GO
+
+IF COL_LENGTH('dbo.ProjectSubmission', 'IdeaConceptPlainText') IS NULL
+BEGIN
+    ALTER TABLE dbo.ProjectSubmission ADD IdeaConceptPlainText NVARCHAR(MAX) NULL;
+END
+GO
+
+IF COL_LENGTH('dbo.ProjectSubmission', 'ExpectedBenefitPlainText') IS NULL
+BEGIN
+    ALTER TABLE dbo.ProjectSubmission ADD ExpectedBenefitPlainText NVARCHAR(MAX) NULL;
+END
+GO
+
+IF COL_LENGTH('dbo.ProjectSubmission', 'HackathonMotivationPlainText') IS NULL
+BEGIN
+    ALTER TABLE dbo.ProjectSubmission ADD HackathonMotivationPlainText NVARCHAR(MAX) NULL;
+END
+GO
+
+IF COL_LENGTH('dbo.ProjectSubmissionNew', 'TargetCustomerProblemPlainText') IS NULL
+BEGIN
+    ALTER TABLE dbo.ProjectSubmissionNew ADD TargetCustomerProblemPlainText NVARCHAR(MAX) NULL;
+END
+GO
+
+IF COL_LENGTH('dbo.ProjectSubmissionNew', 'IdeaConceptPlainText') IS NULL
+BEGIN
+    ALTER TABLE dbo.ProjectSubmissionNew ADD IdeaConceptPlainText NVARCHAR(MAX) NULL;
+END
+GO
+
+IF COL_LENGTH('dbo.ProjectSubmissionNew', 'FinancialValueDetailPlainText') IS NULL
+BEGIN
+    ALTER TABLE dbo.ProjectSubmissionNew ADD FinancialValueDetailPlainText NVARCHAR(MAX) NULL;
+END
+GO
+
+IF COL_LENGTH('dbo.ProjectSubmissionNew', 'NonFinancialValueDetailPlainText') IS NULL
+BEGIN
+    ALTER TABLE dbo.ProjectSubmissionNew ADD NonFinancialValueDetailPlainText NVARCHAR(MAX) NULL;
+END
+GO
@@ -1,9 +1,10 @@
-IF OBJECT_ID('dbo.vProjectSubmissionExport', 'V') IS NOT NULL
-    DROP VIEW dbo.vProjectSubmissionExport;
-GO
+-- Export view of dbo.ProjectSubmission (needs project_submission_plain_text.sql)
+-- Generated from backend/alembic/versions/0006_submission_plain_text.py by backend/generate_db_init.py;
+-- edit the migration and re-run the generator instead of changing this file.
 
-CREATE VIEW dbo.vProjectSubmissionExport
+CREATE OR ALTER VIEW dbo.vProjectSubmissionExport
 AS
+-- The *Html columns carry the precomputed plain text
 SELECT
     p.ProjectId,
     p.EventYear,
@@ -35,13 +36,13 @@ SELECT
     p.IdeaSourceOther,
     p.IdeaSourceOtherDetail,
 
-    p.TargetCustomerHtml,
+    p.TargetCustomerPlainText AS TargetCustomerHtml,
 
     p.InnovationTypeNo,
     p.InnovationTypeText,
 
-    p.IdeaConceptHtml,
-    p.ExpectedBenefitHtml,
+    p.IdeaConceptPlainText AS IdeaConceptHtml,
+    p.ExpectedBenefitPlainText AS ExpectedBenefitHtml,
 
     p.GenCapProjectManagement,
     p.GenCapCommunications,
@@ -60,7 +61,7 @@ SELECT
     p.DigitalCapOther,
     p.DigitalCapOtherDetail,
 
-    p.HackathonMotivationHtml,
+    p.HackathonMotivationPlainText AS HackathonMotivationHtml,
 
     MAX(CASE WHEN m.MemberSeq = 1 THEN m.EmpCode END) AS Member1EmpCode,
     MAX(CASE WHEN m.MemberSeq = 1 THEN m.FullNameTh END) AS Member1FullNameTh,
@@ -129,11 +130,11 @@ GROUP BY
     p.IdeaSourceVOSDetail,
     p.IdeaSourceOther,
     p.IdeaSourceOtherDetail,
-    p.TargetCustomerHtml,
+    p.TargetCustomerPlainText,
     p.InnovationTypeNo,
     p.InnovationTypeText,
-    p.IdeaConceptHtml,
-    p.ExpectedBenefitHtml,
+    p.IdeaConceptPlainText,
+    p.ExpectedBenefitPlainText,
     p.GenCapProjectManagement,
     p.GenCapCommunications,
     p.GenCapMarketing,
@@ -149,11 +150,11 @@ GROUP BY
     p.DigitalCapSoftwareTooling,
     p.DigitalCapOther,
     p.DigitalCapOtherDetail,
-    p.HackathonMotivationHtml,
+    p.HackathonMotivationPlainText,
     p.StatusCode,
     p.SubmittedAt,
     p.CreatedByEmpCode,
     p.CreatedAt,
     p.UpdatedByEmpCode,
     p.UpdatedAt;
-GO
\ No newline at end of file
+GO